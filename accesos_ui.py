@@ -1,11 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
+from tareas import ejecutor_de
+from lista_virtual import ListaVirtual, ProveedorPaginado
 
 class AccesosUI:
     def __init__(self, parent, db):
         self.parent = parent
         self.db = db
+        self.tareas = ejecutor_de(parent)
         self.setup_ui()
     
     def setup_ui(self):
@@ -57,36 +60,25 @@ class AccesosUI:
         self.stats_label = ttk.Label(stats_frame, text="", font=('Arial', 9))
         self.stats_label.pack(padx=10, pady=5)
         
-        # Lista de accesos recientes
-        accesos_frame = ttk.LabelFrame(self.frame, text="Accesos Recientes (Últimos 20)")
+        # Historial de accesos, del más reciente al más antiguo, leído por páginas
+        accesos_frame = ttk.LabelFrame(self.frame, text="Historial de Accesos")
         accesos_frame.pack(fill=tk.BOTH, expand=True, pady=10)
         
-        # Treeview para accesos
         columns = ('cedula', 'nombre', 'tipo', 'fecha')
-        self.tree = ttk.Treeview(accesos_frame, columns=columns, show='headings', height=15)
-        
-        # Configurar columnas
-        self.tree.heading('cedula', text='Cédula')
-        self.tree.heading('nombre', text='Nombre Completo')
-        self.tree.heading('tipo', text='Tipo')
-        self.tree.heading('fecha', text='Fecha y Hora')
-        
-        self.tree.column('cedula', width=100, anchor=tk.CENTER)
-        self.tree.column('nombre', width=200, anchor=tk.W)
-        self.tree.column('tipo', width=80, anchor=tk.CENTER)
-        self.tree.column('fecha', width=150, anchor=tk.CENTER)
-        
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(accesos_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        proveedor = ProveedorPaginado(self.db.contar_accesos, self.db.pagina_accesos,
+                                      self.db.clave_acceso_en, clave=lambda a: (a[3], a[0]))
+        self.lista_accesos = ListaVirtual(
+            accesos_frame, columns, proveedor, formatear=self.formatear_acceso,
+            encabezados={'cedula': 'Cédula', 'nombre': 'Nombre Completo', 'tipo': 'Tipo', 'fecha': 'Fecha y Hora'},
+            anchos={'cedula': 100, 'nombre': 200, 'tipo': 80, 'fecha': 150}, height=15)
+        self.lista_accesos.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.lista_accesos.tree
+        self.tree.column('nombre', anchor=tk.W)
         
         # Configurar estilos
         self.configurar_estilos()
         
-        # Actualizar datos iniciales
-        self.actualizar_lista_accesos()
+        # Actualizar datos iniciales (la lista virtual se carga sola)
         self.actualizar_estadisticas()
     
     def configurar_estilos(self):
@@ -105,18 +97,20 @@ class AccesosUI:
             messagebox.showwarning("Advertencia", "Por favor ingrese una cédula")
             return
         
-        # Verificar cliente primero
-        cliente = self.db.get_cliente_by_cedula(cedula)
-        if not cliente:
-            messagebox.showerror("Error", f"Cliente con cédula {cedula} no encontrado")
+        # Validar y registrar en un solo paso
+        success, mensaje, datos = self.db.registrar_acceso_validado(cedula, tipo_movimiento)
+        if datos is None:
+            if mensaje == "Cliente no encontrado":
+                mensaje = f"Cliente con cédula {cedula} no encontrado"
+            messagebox.showerror("Error", mensaje)
             return
         
         # Mostrar información del cliente
-        nombre_completo = f"{cliente[1]} {cliente[2]}"
-        self.info_label.config(text=f"Cliente: {nombre_completo}", foreground='black')
-        
-        # Registrar acceso
-        success, mensaje = self.db.registrar_acceso(cedula, tipo_movimiento)
+        nombre_completo = datos['nombre_completo']
+        texto_info = f"Cliente: {nombre_completo}"
+        if datos['fecha_vencimiento']:
+            texto_info += f" | Vence: {datos['fecha_vencimiento']}"
+        self.info_label.config(text=texto_info, foreground='black')
         
         if success:
             messagebox.showinfo("Éxito", f"{mensaje}\nCliente: {nombre_completo}")
@@ -126,35 +120,50 @@ class AccesosUI:
         else:
             messagebox.showerror("Error", mensaje)
         
+        escritor = self.db.escritor_accesos
+        if success and escritor is not None:
+            # El acceso se confirma con el próximo lote; refrescar después
+            self.frame.after(int(escritor.intervalo * 1000) + 50, self.refrescar_datos)
+        else:
+            self.refrescar_datos()
+    
+    def refrescar(self):
+        """Al volver a la pantalla (ver Pantallas): datos al día y el cursor en la cédula"""
+        self.refrescar_datos()
+        self.entry_cedula.focus()
+    
+    def refrescar_datos(self):
+        if not self.frame.winfo_exists():
+            return
         self.actualizar_lista_accesos()
         self.actualizar_estadisticas()
     
     def actualizar_lista_accesos(self):
-        # Limpiar treeview
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Obtener accesos recientes
-        accesos = self.db.get_accesos_recientes(20)
-        
-        # Agregar a la lista
-        for acceso in accesos:
-            nombre_completo = f"{acceso[4]} {acceso[5]}"
-            fecha_formateada = acceso[3]
-            
-            self.tree.insert('', 0, values=(
-                acceso[1],  # cedula
-                nombre_completo,
-                acceso[2],  # tipo
-                fecha_formateada
-            ))
+        # Vuelve a contar y a leer el tramo visible (en segundo plano)
+        self.lista_accesos.recargar()
+    
+    def formatear_acceso(self, acceso):
+        nombre_completo = f"{acceso[4]} {acceso[5]}"
+        fecha_formateada = acceso[3]
+        
+        return (
+            acceso[1],  # cedula
+            nombre_completo,
+            acceso[2],  # tipo
+            fecha_formateada
+        )
     
     def actualizar_estadisticas(self):
+        self.tareas.ejecutar('accesos.estadisticas', self.db.get_estadisticas_accesos,
+                             al_terminar=self.mostrar_estadisticas,
+                             al_fallar=lambda e: print(f"Error actualizando estadísticas: {e}"))
+    
+    def mostrar_estadisticas(self, stats):
         try:
-            stats = self.db.get_estadisticas_accesos()
             texto = f"✅ Entradas hoy: {stats['accesos_hoy']} | "
             texto += f"📅 Entradas esta semana: {stats['accesos_semana']} | "
-            texto += f"🕐 Hora pico: {stats['hora_pico']}:00"
+            texto += f"🕐 Hora pico: {stats['hora_pico']}:00 | "
+            texto += f"⚡ Caché: {self.db.cache_miembros.estadisticas()['tasa_aciertos']:.0f}% aciertos"
             self.stats_label.config(text=texto)
         except Exception as e:
             print(f"Error actualizando estadísticas: {e}")
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""Mide pasadas de torniquete por segundo: ruta anterior contra registrar_acceso_validado.
+
+Uso: python benchmarks/bench_accesos.py [pasadas]   (por defecto 2000)
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database import Database
+
+CLIENTES = 5000
+
+
+def registrar_acceso_anterior(db, cedula, tipo_movimiento="Entrada"):
+    """Ruta previa: AccesosUI + Database hacían 3 consultas, strptime e INSERT"""
+    if not db.get_cliente_by_cedula(cedula):  # verificación repetida en AccesosUI
+        return False
+    if not db.get_cliente_by_cedula(cedula):
+        return False
+    pago_activo = db.get_pago_activo(cedula)
+    if not pago_activo:
+        return False
+    if datetime.strptime(pago_activo[5], '%Y-%m-%d').date() < datetime.now().date():
+        return False
+    db.conn.execute(
+        "INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora) VALUES (?, ?, ?)",
+        (cedula, tipo_movimiento, datetime.now()))
+    db.conn.commit()
+    return True
+
+
+def poblar(db):
+    hoy = datetime.now().date()
+    cursor = db.conn.cursor()
+    cursor.executemany(
+        "INSERT INTO clientes (cedula, nombre, apellido, fecha_registro) VALUES (?, ?, ?, ?)",
+        ((str(10000 + i), f"Nombre{i}", f"Apellido{i}", hoy) for i in range(CLIENTES)))
+    cursor.executemany(
+        "INSERT INTO pagos (cedula_cliente, monto, duracion_meses, fecha_pago, fecha_vencimiento, "
+        "metodo_pago, activo) VALUES (?, 50.0, 1, ?, ?, 'Efectivo', 1)",
+        ((str(10000 + i), hoy, hoy + timedelta(days=30)) for i in range(CLIENTES)))
+    cursor.execute(
+        "INSERT INTO estado_membresia (cedula_cliente, fecha_vencimiento, id_pago) "
+        "SELECT cedula_cliente, fecha_vencimiento, id FROM pagos WHERE activo = 1")
+    db.conn.commit()
+
+
+def medir(nombre, funcion, cedulas):
+    inicio = time.perf_counter()
+    for cedula in cedulas:
+        funcion(cedula)
+    duracion = time.perf_counter() - inicio
+    print(f"{nombre:<28}{len(cedulas) / duracion:>10.0f} pasadas/s")
+
+
+def main():
+    pasadas = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    cedulas = [str(10000 + random.randrange(CLIENTES)) for _ in range(pasadas)]
+    with tempfile.TemporaryDirectory() as directorio:
+        db = Database(os.path.join(directorio, 'bench.db'))
+        poblar(db)
+        medir("anterior (3 consultas)", lambda c: registrar_acceso_anterior(db, c), cedulas)
+        medir("registrar_acceso_validado", lambda c: db.registrar_acceso_validado(c), cedulas)
+        db.conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Arranque de la aplicación: tiempo hasta el menú principal y módulos pesados cargados.
+
+Con `python -X importtime` mide lo que tarda `import main` (mediana de
+varias corridas en procesos nuevos) y lista los módulos que más pesan. Si
+hay pantalla, también mide hasta que el menú principal queda dibujado, con
+una base de datos vacía en un directorio temporal.
+
+Termina con código 1 si el arranque supera el límite en ms o si alguno de
+MODULOS_PESADOS se carga antes del menú: así se puede correr en CI.
+
+Uso: python benchmarks/bench_arranque.py [limite_ms]   (por defecto 400)
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+MODULOS_PESADOS = ('pandas', 'matplotlib', 'PIL', 'openpyxl', 'numpy')
+CORRIDAS = 5
+
+HASTA_MENU = """
+import time
+inicio = time.perf_counter()
+import tkinter as tk
+import main
+root = tk.Tk()
+app = main.GimnasioApp(root)
+root.update()
+print((time.perf_counter() - inicio) * 1000)
+app.db.cerrar()
+root.destroy()
+"""
+
+
+def importtime():
+    """(ms de `import main`, [(módulo, ms)] de lo que importa directamente, módulos cargados)"""
+    salida = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'], cwd=RAIZ,
+                            capture_output=True, text=True, check=True).stderr
+    cargados, directos = set(), []
+    for linea in salida.splitlines():
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+        _, acumulado, nombre = linea[len('import time:'):].split('|')
+        # Dos espacios de sangría por nivel; los importados se listan antes que quien los importa
+        nivel = (len(nombre) - len(nombre.lstrip(' ')) - 1) // 2
+        nombre = nombre.strip()
+        ms = int(acumulado) / 1000
+        cargados.add(nombre.split('.')[0])
+        if nivel == 1:
+            directos.append((nombre, ms))
+        elif nivel == 0:
+            if nombre == 'main':
+                return ms, directos, cargados
+            directos = []
+    raise RuntimeError("importtime no informó el import de main")
+
+
+def hasta_menu():
+    """ms desde el arranque del intérprete hasta el menú dibujado, o None sin pantalla"""
+    with tempfile.TemporaryDirectory() as directorio:
+        resultado = subprocess.run([sys.executable, '-c', HASTA_MENU], cwd=directorio, capture_output=True,
+                                   text=True, env=dict(os.environ, PYTHONPATH=os.path.abspath(RAIZ)))
+    if resultado.returncode != 0:
+        return None
+    return float(resultado.stdout.strip().splitlines()[-1])
+
+
+def main():
+    limite = float(sys.argv[1]) if len(sys.argv) > 1 else 400
+    corridas = [importtime() for _ in range(CORRIDAS)]
+    import_main = statistics.median(total for total, _, _ in corridas)
+    _, directos, cargados = corridas[-1]
+
+    print(f"import main: {import_main:.0f} ms (mediana de {CORRIDAS})")
+    print("lo que más tarda de lo que importa main:")
+    for nombre, ms in sorted(directos, key=lambda item: -item[1])[:8]:
+        print(f"  {nombre:<30}{ms:>8.1f} ms")
+
+    menu = hasta_menu()
+    print(f"hasta el menú: {menu:.0f} ms" if menu is not None else "hasta el menú: sin pantalla, no se mide")
+
+    pesados = [nombre for nombre in MODULOS_PESADOS if nombre in cargados]
+    fallas = []
+    if pesados:
+        fallas.append(f"se cargan al arrancar: {', '.join(pesados)}")
+    arranque = menu if menu is not None else import_main
+    if arranque > limite:
+        fallas.append(f"arranque de {arranque:.0f} ms supera el límite de {limite:.0f} ms")
+    for falla in fallas:
+        print(f"FALLA: {falla}")
+    sys.exit(1 if fallas else 0)
+
+
+if __name__ == '__main__':
+    main()
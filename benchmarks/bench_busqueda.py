@@ -0,0 +1,59 @@
+"""Latencia de la búsqueda de clientes al teclear: LIKE '%...%' contra el índice FTS5.
+
+Uso: python benchmarks/bench_busqueda.py [clientes]   (por defecto 100.000)
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database import Database
+
+NOMBRES = ['María', 'José', 'Ana', 'Luis', 'Carmen', 'Jorge', 'Lucía', 'Andrés', 'Sofía', 'Pedro']
+APELLIDOS = ['Rodríguez', 'González', 'Pérez', 'Martínez', 'Gómez', 'Díaz', 'Hernández', 'Núñez']
+
+
+def poblar(db, clientes):
+    db.conn.executemany(
+        "INSERT INTO clientes (cedula, nombre, apellido, telefono, fecha_registro) VALUES (?, ?, ?, ?, ?)",
+        ((str(100000 + i), f"{NOMBRES[i % len(NOMBRES)]}{i % 997}",
+          f"{APELLIDOS[i % len(APELLIDOS)]}{i % 991}", f"0414{i:07d}", date.today())
+         for i in range(clientes)))
+    db.conn.commit()
+    db.conn.execute("ANALYZE")
+
+
+def teclear(db, texto):
+    """Una búsqueda por cada prefijo, como si el usuario escribiera letra a letra"""
+    tiempos = []
+    for i in range(1, len(texto) + 1):
+        inicio = time.perf_counter()
+        db.buscar_clientes({'texto': texto[:i]})
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tiempos
+
+
+def main():
+    clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as directorio:
+        db = Database(os.path.join(directorio, 'bench.db'))
+        print(f"Generando {clientes:,} clientes...")
+        poblar(db, clientes)
+
+        print(f"{'ruta':<8}{'mediana ms':>12}{'peor ms':>12}")
+        resultados = {}
+        for nombre, fts in (('LIKE', False), ('FTS5', True)):
+            db.busqueda_fts = fts
+            tiempos = teclear(db, 'rodriguez12') + teclear(db, '0414000')
+            resultados[nombre] = statistics.median(tiempos)
+            print(f"{nombre:<8}{resultados[nombre]:>12.2f}{max(tiempos):>12.2f}")
+        print(f"mejora (mediana): {resultados['LIKE'] / resultados['FTS5']:.1f}x")
+        db.cerrar()
+
+
+if __name__ == '__main__':
+    main()
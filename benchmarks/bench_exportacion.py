@@ -0,0 +1,83 @@
+"""Exportación de accesos: DataFrame completo contra escritura por lotes (CSV y XLSX).
+
+Mide filas por segundo y el pico de memoria de Python (tracemalloc) de cada ruta.
+
+Uso: python benchmarks/bench_exportacion.py [accesos] [--sin-xlsx]   (por defecto 1.000.000)
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pandas as pd
+
+from database import Database
+from exportacion import ENCABEZADOS_ACCESOS, exportar_filas
+
+CLIENTES = 5_000
+
+
+def poblar(db, accesos):
+    inicio = datetime.now() - timedelta(days=365)
+    cursor = db.conn.cursor()
+    cursor.executemany(
+        "INSERT INTO clientes (cedula, nombre, apellido, fecha_registro) VALUES (?, ?, ?, ?)",
+        ((str(10000 + i), f"Nombre{i}", f"Apellido{i}", inicio.date()) for i in range(CLIENTES)))
+    paso = 365 * 86400 / accesos
+    cursor.executemany(
+        "INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora) VALUES (?, ?, ?)",
+        ((str(10000 + i % CLIENTES), 'Entrada' if i % 2 == 0 else 'Salida',
+          (inicio + timedelta(seconds=i * paso)).strftime('%Y-%m-%d %H:%M:%S')) for i in range(accesos)))
+    db.conn.commit()
+
+
+def anterior(db, ruta):
+    """Ruta previa: todas las filas en una lista y un DataFrame antes de escribir"""
+    filas = list(db.iterar_accesos_con_cliente())
+    df = pd.DataFrame(filas, columns=ENCABEZADOS_ACCESOS)
+    if ruta.endswith('.csv'):
+        df.to_csv(ruta, index=False, sep=';', encoding='utf-8-sig')
+    else:
+        df.to_excel(ruta, index=False)
+    return len(df)
+
+
+def por_lotes(db, ruta):
+    return exportar_filas(ruta, ENCABEZADOS_ACCESOS, db.iterar_accesos_con_cliente())
+
+
+def medir(db, nombre, funcion, ruta):
+    inicio = time.perf_counter()
+    filas = funcion(db, ruta)
+    duracion = time.perf_counter() - inicio
+    # Segunda pasada solo para la memoria: tracemalloc hace más lenta la primera
+    tracemalloc.start()
+    funcion(db, ruta)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{nombre:<24}{filas:>10,}{duracion:>10.1f}{filas / duracion:>14,.0f}{pico / 2**20:>12.1f}")
+
+
+def main():
+    argumentos = [a for a in sys.argv[1:] if not a.startswith('--')]
+    accesos = int(argumentos[0]) if argumentos else 1_000_000
+    formatos = ['csv'] if '--sin-xlsx' in sys.argv else ['csv', 'xlsx']
+    with tempfile.TemporaryDirectory() as directorio:
+        db = Database(os.path.join(directorio, 'bench.db'))
+        print(f"Generando {accesos:,} accesos...")
+        poblar(db, accesos)
+
+        print(f"{'ruta':<24}{'filas':>10}{'s':>10}{'filas/s':>14}{'pico MB':>12}")
+        for formato in formatos:
+            ruta = os.path.join(directorio, f'accesos.{formato}')
+            medir(db, f"DataFrame ({formato})", anterior, ruta)
+            medir(db, f"por lotes ({formato})", por_lotes, ruta)
+        db.cerrar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Compara filtros de fecha con funciones sobre la columna contra rangos indexables.
+
+Uso: python benchmarks/bench_fechas.py [filas_accesos]   (por defecto 5.000.000)
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database import Database, rango_fechas, rango_mes
+
+CONSULTAS = [
+    (
+        "accesos de hoy",
+        "SELECT COUNT(*) FROM accesos WHERE DATE(fecha_hora) = ? AND tipo_movimiento = 'Entrada'",
+        "SELECT COUNT(*) FROM accesos WHERE fecha_hora >= ? AND fecha_hora < ? AND tipo_movimiento = 'Entrada'",
+    ),
+    (
+        "accesos de una semana",
+        "SELECT COUNT(*) FROM accesos WHERE DATE(fecha_hora) BETWEEN ? AND ?",
+        "SELECT COUNT(*) FROM accesos WHERE fecha_hora >= ? AND fecha_hora < ?",
+    ),
+    (
+        "ingresos del mes",
+        "SELECT SUM(monto) FROM pagos WHERE strftime('%Y-%m', fecha_pago) = ?",
+        "SELECT SUM(monto) FROM pagos WHERE fecha_pago >= ? AND fecha_pago < ?",
+    ),
+]
+
+
+def poblar(db, filas_accesos, clientes=5000):
+    """Genera clientes, un pago mensual por cliente y accesos repartidos en 2 años"""
+    inicio = datetime.now() - timedelta(days=730)
+    segundos = 730 * 24 * 3600
+    cursor = db.conn.cursor()
+    cursor.executemany(
+        "INSERT INTO clientes (cedula, nombre, apellido, fecha_registro) VALUES (?, ?, ?, ?)",
+        ((str(10000 + i), f"Nombre{i}", f"Apellido{i}", inicio.date()) for i in range(clientes)))
+    cursor.executemany(
+        "INSERT INTO pagos (cedula_cliente, monto, duracion_meses, fecha_pago, fecha_vencimiento, "
+        "metodo_pago, activo) VALUES (?, 50.0, 1, ?, ?, 'Efectivo', 0)",
+        ((str(10000 + i % clientes), (inicio + timedelta(days=i % 730)).date(),
+          (inicio + timedelta(days=i % 730 + 30)).date()) for i in range(clientes * 24)))
+    cursor.executemany(
+        "INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora) VALUES (?, ?, ?)",
+        ((str(10000 + random.randrange(clientes)), random.choice(('Entrada', 'Salida')),
+          inicio + timedelta(seconds=random.randrange(segundos))) for _ in range(filas_accesos)))
+    db.conn.commit()
+    cursor.execute("ANALYZE")
+
+
+def medir(db, sql, params, repeticiones=5):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        db.conn.execute(sql, params).fetchall()
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    with tempfile.TemporaryDirectory() as directorio:
+        db = Database(os.path.join(directorio, 'bench.db'))
+        print(f"Generando {filas:,} accesos...")
+        poblar(db, filas)
+
+        hoy = datetime.now().date()
+        hace_semana = hoy - timedelta(days=6)
+        parametros = [
+            ((hoy.isoformat(),), rango_fechas(hoy)),
+            ((hace_semana.isoformat(), hoy.isoformat()), rango_fechas(hace_semana, hoy)),
+            ((hoy.strftime('%Y-%m'),), rango_mes(hoy.year, hoy.month)),
+        ]
+
+        print(f"{'consulta':<24}{'función':>12}{'rango':>12}{'mejora':>10}")
+        for (nombre, sql_funcion, sql_rango), (p_funcion, p_rango) in zip(CONSULTAS, parametros):
+            t_funcion = medir(db, sql_funcion, p_funcion)
+            t_rango = medir(db, sql_rango, p_rango)
+            print(f"{nombre:<24}{t_funcion * 1000:>10.1f}ms{t_rango * 1000:>10.1f}ms"
+                  f"{t_funcion / max(t_rango, 1e-9):>9.0f}x")
+        db.conn.close()
+
+
+if __name__ == '__main__':
+    main()
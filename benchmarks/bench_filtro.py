@@ -0,0 +1,35 @@
+"""Tiempo de la búsqueda rápida de la lista general con el índice en memoria.
+
+Uso: python benchmarks/bench_filtro.py [clientes]   (por defecto 50.000)
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from busqueda_incremental import IndiceColumnar
+
+NOMBRES = ['María', 'José', 'Ana', 'Luis', 'Carmen', 'Jorge', 'Lucía', 'Andrés', 'Sofía', 'Pedro']
+APELLIDOS = ['Rodríguez', 'González', 'Pérez', 'Martínez', 'Gómez', 'Díaz', 'Hernández', 'Núñez']
+
+
+def main():
+    clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    filas = [(str(100000 + i), f"{NOMBRES[i % len(NOMBRES)]}", f"{APELLIDOS[i % len(APELLIDOS)]}{i % 991}",
+              f"0414{i:07d}", '', f"Calle {i % 300}", None, '2025-01-01') for i in range(clientes)]
+
+    inicio = time.perf_counter()
+    indice = IndiceColumnar(filas, columnas_busqueda=(0, 1, 2, 3, 4, 5))
+    print(f"índice de {clientes:,} filas: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    print(f"{'término':<12}{'filas':>10}{'ms':>10}")
+    texto = 'rodriguez12'
+    for i in range(1, len(texto) + 1):
+        inicio = time.perf_counter()
+        posiciones = indice.filtrar(texto[:i])
+        print(f"{texto[:i]:<12}{len(posiciones):>10,}{(time.perf_counter() - inicio) * 1000:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Refresco de los gráficos del dashboard: borrar y volver a crear contra actualizar datos.
+
+Dibuja sobre canvas Agg (sin ventana) los tres gráficos de ReportesUI con
+datos distintos en cada refresco y mide cuánto tarda el refresco 1, la
+mediana de los últimos 10 y cuántos ejes tiene la figura de tendencia al
+final. "anterior" es el código de antes de graficos.py, con el twinx
+quitado en cada vuelta; "sin quitar twinx" es la versión original, que
+sumaba un eje por refresco.
+
+Uso: python benchmarks/bench_graficos.py [refrescos]   (por defecto 100)
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from graficos import GraficoBarras, GraficoDobleEje, GraficoTorta
+
+MESES = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun']
+
+
+def figuras():
+    figs = [Figure(figsize=(6, 4), dpi=80), Figure(figsize=(6, 4), dpi=80), Figure(figsize=(10, 6), dpi=80)]
+    return [(fig, FigureCanvasAgg(fig)) for fig in figs]
+
+
+def datos(i):
+    azar = random.Random(i)
+    return ([azar.uniform(1000, 9000) for _ in MESES],
+            [azar.randint(100, 400), azar.randint(0, 100), 0],
+            [azar.randint(100, 400) for _ in MESES], [azar.uniform(1000, 9000) for _ in MESES])
+
+
+class Anterior:
+    """Los tres gráficos como los dibujaba ReportesUI: clear, artistas nuevos, tight_layout y draw"""
+
+    def __init__(self, quitar_twinx=True):
+        (self.fig_i, self.canvas_i), (self.fig_e, self.canvas_e), (self.fig_t, self.canvas_t) = figuras()
+        self.ax_i = self.fig_i.add_subplot(111)
+        self.ax_e = self.fig_e.add_subplot(111)
+        self.ax_t = self.fig_t.add_subplot(111)
+        self.quitar_twinx = quitar_twinx
+
+    def refrescar(self, ingresos, estado, clientes, ingresos_tendencia):
+        self.ax_i.clear()
+        barras = self.ax_i.bar(MESES, ingresos, color='#3498db', alpha=0.7)
+        self.ax_i.set_title('Ingresos Mensuales', fontweight='bold')
+        self.ax_i.set_ylabel('Ingresos ($)')
+        for barra in barras:
+            altura = barra.get_height()
+            self.ax_i.text(barra.get_x() + barra.get_width() / 2., altura, f'${altura:,.0f}',
+                           ha='center', va='bottom')
+        self.ax_i.grid(True, alpha=0.3)
+        self.fig_i.tight_layout()
+        self.canvas_i.draw()
+
+        self.ax_e.clear()
+        filas = [(e, v, c) for e, v, c in zip(['Activos', 'Vencidos', 'Sin Pago'], estado,
+                                              ['#27ae60', '#e74c3c', '#95a5a6']) if v > 0]
+        etiquetas, valores, colores = zip(*filas)
+        _, _, porcentajes = self.ax_e.pie(valores, labels=etiquetas, colors=colores, autopct='%1.1f%%',
+                                          startangle=90)
+        self.ax_e.set_title('Estado de Clientes', fontweight='bold')
+        for texto in porcentajes:
+            texto.set_color('white')
+            texto.set_fontweight('bold')
+        self.fig_e.tight_layout()
+        self.canvas_e.draw()
+
+        self.ax_t.clear()
+        if self.quitar_twinx:
+            for eje in self.fig_t.axes:
+                if eje is not self.ax_t:
+                    eje.remove()
+        ax2 = self.ax_t.twinx()
+        linea1 = self.ax_t.plot(MESES, clientes, 'o-', color='#3498db', linewidth=2, markersize=8,
+                                label='Clientes Activos')
+        self.ax_t.set_ylabel('Clientes Activos', color='#3498db')
+        self.ax_t.tick_params(axis='y', labelcolor='#3498db')
+        linea2 = ax2.plot(MESES, ingresos_tendencia, 's-', color='#e74c3c', linewidth=2, markersize=6,
+                          label='Ingresos ($)')
+        ax2.set_ylabel('Ingresos ($)', color='#e74c3c')
+        ax2.tick_params(axis='y', labelcolor='#e74c3c')
+        lineas = linea1 + linea2
+        self.ax_t.legend(lineas, [linea.get_label() for linea in lineas], loc='upper left')
+        self.ax_t.set_title('Tendencia: Clientes vs Ingresos', fontweight='bold')
+        self.ax_t.grid(True, alpha=0.3)
+        self.fig_t.tight_layout()
+        self.canvas_t.draw()
+
+
+class Incremental:
+    def __init__(self):
+        (fig_i, canvas_i), (fig_e, canvas_e), (self.fig_t, canvas_t) = figuras()
+        self.ingresos = GraficoBarras(fig_i, canvas_i, 'Ingresos Mensuales', 'Ingresos ($)', '#3498db')
+        self.estado = GraficoTorta(fig_e, canvas_e, 'Estado de Clientes', ['Activos', 'Vencidos', 'Sin Pago'],
+                                   ['#27ae60', '#e74c3c', '#95a5a6'])
+        self.tendencia = GraficoDobleEje(self.fig_t, canvas_t, 'Tendencia: Clientes vs Ingresos',
+                                         ('Clientes Activos', '#3498db', 'o', 8), ('Ingresos ($)', '#e74c3c', 's', 6))
+
+    def refrescar(self, ingresos, estado, clientes, ingresos_tendencia):
+        # En Agg draw_idle dibuja en el momento; en Tk, en la próxima vuelta del loop
+        self.ingresos.actualizar(MESES, ingresos)
+        self.estado.actualizar(estado)
+        self.tendencia.actualizar(MESES, clientes, ingresos_tendencia)
+
+
+def medir(graficos, refrescos):
+    tiempos = []
+    for i in range(refrescos):
+        inicio = time.perf_counter()
+        graficos.refrescar(*datos(i))
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def main():
+    refrescos = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print(f"{'gráficos':<20}{'1er ms':>10}{'últimos 10 ms':>15}{'ejes tendencia':>16}")
+    for nombre, graficos in (('sin quitar twinx', Anterior(quitar_twinx=False)), ('anterior', Anterior()),
+                             ('incremental', Incremental())):
+        tiempos = medir(graficos, refrescos)
+        ejes = len(graficos.fig_t.axes)
+        print(f"{nombre:<20}{tiempos[0] * 1000:>10.1f}{statistics.median(tiempos[-10:]) * 1000:>15.1f}{ejes:>16}")
+
+
+if __name__ == '__main__':
+    main()
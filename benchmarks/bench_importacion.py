@@ -0,0 +1,70 @@
+"""Carga masiva de clientes: una inserción por fila contra el lote en una transacción.
+
+Uso: python benchmarks/bench_importacion.py [filas]   (por defecto 20.000)
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database import Database
+from importacion import importar_clientes
+
+
+def archivo(filas):
+    """DataFrame como el de pd.read_excel, con un 1% de duplicados y filas incompletas"""
+    return pd.DataFrame({
+        'cedula': [float(100000 + i - (i % 100 == 1)) for i in range(filas)],
+        'nombre': ['' if i % 100 == 2 else f"Nombre{i}" for i in range(filas)],
+        'apellido': [f"Apellido{i % 997}" for i in range(filas)],
+        'telefono': [f"0414{i:07d}" for i in range(filas)],
+    })
+
+
+def cargar_anterior(db, df):
+    """Ruta previa de GimnasioApp.carga_masiva_excel: iterrows + insert_cliente por fila"""
+    registrados = 0
+    for _, row in df.iterrows():
+        cedula = str(row['cedula']).strip()
+        if not cedula or not str(row['nombre']).strip() or not str(row['apellido']).strip():
+            continue
+        if db.insert_cliente(cedula, str(row['nombre']).strip(), str(row['apellido']).strip(),
+                             str(row.get('telefono', '')).strip(), '', '', ""):
+            registrados += 1
+    return registrados
+
+
+def cargar_lote(db, df):
+    return importar_clientes(db, df)['insertados']
+
+
+def medir(nombre, funcion, df):
+    with tempfile.TemporaryDirectory() as directorio:
+        db = Database(os.path.join(directorio, 'bench.db'))
+        inicio = time.perf_counter()
+        # insert_cliente imprime una línea por cliente
+        with contextlib.redirect_stdout(io.StringIO()):
+            insertados = funcion(db, df)
+        duracion = time.perf_counter() - inicio
+        db.cerrar()
+    print(f"{nombre:<24}{insertados:>12,}{duracion:>10.2f}")
+    return duracion
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    df = archivo(filas)
+    print(f"{'ruta':<24}{'insertados':>12}{'s':>10}")
+    t_anterior = medir("insert_cliente por fila", cargar_anterior, df)
+    t_lote = medir("lote (una transacción)", cargar_lote, df)
+    print(f"mejora: {t_anterior / t_lote:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
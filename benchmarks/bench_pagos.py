@@ -0,0 +1,74 @@
+"""Compara la carga del historial completo de pagos: N+1 consultas contra una sola unida.
+
+Uso: python benchmarks/bench_pagos.py [clientes] [pagos]   (por defecto 10.000 y 100.000)
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database import Database
+
+
+def poblar(db, clientes, pagos):
+    inicio = date.today() - timedelta(days=730)
+    cursor = db.conn.cursor()
+    cursor.executemany(
+        "INSERT INTO clientes (cedula, nombre, apellido, fecha_registro) VALUES (?, ?, ?, ?)",
+        ((str(10000 + i), f"Nombre{i}", f"Apellido{i}", inicio) for i in range(clientes)))
+    cursor.executemany(
+        "INSERT INTO pagos (cedula_cliente, monto, duracion_meses, fecha_pago, fecha_vencimiento, "
+        "metodo_pago, activo) VALUES (?, 50.0, 1, ?, ?, 'Efectivo', 0)",
+        ((str(10000 + i % clientes), inicio + timedelta(days=i % 730),
+          inicio + timedelta(days=i % 730 + 30)) for i in range(pagos)))
+    db.conn.commit()
+    cursor.execute("ANALYZE")
+
+
+def cargar_anterior(db):
+    """Ruta previa de PagosUI.cargar_todos_pagos: una consulta por cliente"""
+    filas = []
+    for cliente in db.get_all_clientes():
+        nombre_cliente = f"{cliente[1]} {cliente[2]}"
+        for pago in db.get_pagos_by_cliente(cliente[0]):
+            filas.append((pago[0], cliente[0], nombre_cliente, pago[2]))
+    return filas
+
+
+def cargar_unida(db):
+    return [(p[0], p[1], f"{p[2]} {p[3]}", p[4]) for p in db.iterar_pagos_con_cliente()]
+
+
+def medir(db, nombre, funcion):
+    consultas = []
+    db.lectura().set_trace_callback(consultas.append)
+    inicio = time.perf_counter()
+    try:
+        filas = funcion(db)
+    finally:
+        duracion = time.perf_counter() - inicio
+        db.lectura().set_trace_callback(None)
+    print(f"{nombre:<22}{len(consultas):>10,}{len(filas):>10,}{duracion * 1000:>12.1f}")
+    return duracion
+
+
+def main():
+    clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    pagos = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    with tempfile.TemporaryDirectory() as directorio:
+        db = Database(os.path.join(directorio, 'bench.db'))
+        print(f"Generando {clientes:,} clientes y {pagos:,} pagos...")
+        poblar(db, clientes, pagos)
+
+        print(f"{'ruta':<22}{'consultas':>10}{'filas':>10}{'ms':>12}")
+        t_anterior = medir(db, "N+1 por cliente", cargar_anterior)
+        t_unida = medir(db, "una consulta unida", cargar_unida)
+        print(f"mejora: {t_anterior / t_unida:.1f}x")
+        db.cerrar()
+
+
+if __name__ == '__main__':
+    main()
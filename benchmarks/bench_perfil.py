@@ -0,0 +1,91 @@
+"""Carga mixta lectura/escritura: perfil por defecto de SQLite contra PERFIL_CONEXION.
+
+Un hilo registra accesos (un commit por pasada, como el torniquete) mientras
+otro recalcula las estadísticas del dashboard con su propia conexión.
+
+Uso: python benchmarks/bench_perfil.py [segundos]   (por defecto 5)
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database import PERFIL_CONEXION, Database
+
+PERFIL_SQLITE = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'cache_size_kb': 2000,
+    'mmap_size_mb': 0,
+    'temp_store': 'DEFAULT',
+    'foreign_keys': False,
+    'busy_timeout_ms': 5000
+}
+
+
+def poblar(db, clientes=2000, accesos=200_000):
+    hoy = datetime.now()
+    cursor = db.conn.cursor()
+    cursor.executemany(
+        "INSERT INTO clientes (cedula, nombre, apellido, fecha_registro) VALUES (?, ?, ?, ?)",
+        ((str(10000 + i), f"Nombre{i}", f"Apellido{i}", hoy.date()) for i in range(clientes)))
+    cursor.executemany(
+        "INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora) VALUES (?, 'Entrada', ?)",
+        ((str(10000 + i % clientes), hoy - timedelta(minutes=i)) for i in range(accesos)))
+    db.conn.commit()
+
+
+def ejecutar(perfil, segundos):
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'bench.db')
+        escritor = Database(ruta, perfil=perfil)
+        poblar(escritor)
+        lector = Database(ruta, perfil=perfil)
+
+        fin = time.perf_counter() + segundos
+        escrituras, lecturas, latencias = [0], [0], []
+
+        def escribir():
+            i = 0
+            while time.perf_counter() < fin:
+                inicio = time.perf_counter()
+                escritor.conn.execute(
+                    "INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora) VALUES (?, 'Entrada', ?)",
+                    (str(10000 + i % 2000), datetime.now()))
+                escritor.conn.commit()
+                latencias.append(time.perf_counter() - inicio)
+                escrituras[0] += 1
+                i += 1
+
+        def leer():
+            while time.perf_counter() < fin:
+                lector.get_estadisticas_accesos()
+                lecturas[0] += 1
+
+        hilos = [threading.Thread(target=escribir), threading.Thread(target=leer)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        latencias.sort()
+        p99 = latencias[int(len(latencias) * 0.99)] if latencias else 0
+        escritor.cerrar()
+        lector.cerrar()
+        return escrituras[0] / segundos, lecturas[0] / segundos, p99
+
+
+def main():
+    segundos = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'perfil':<14}{'escrituras/s':>14}{'lecturas/s':>12}{'p99 escritura':>16}")
+    for nombre, perfil in (("sqlite", PERFIL_SQLITE), ("optimizado", PERFIL_CONEXION)):
+        escrituras, lecturas, p99 = ejecutar(perfil, segundos)
+        print(f"{nombre:<14}{escrituras:>14.0f}{lecturas:>12.1f}{p99 * 1000:>14.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Reportes de ReportesUI sobre años de datos: primera lectura y lectura desde la caché.
+
+Incluye la instantánea de estadísticas del dashboard (Database.estadisticas).
+
+Uso: python benchmarks/bench_reportes.py [accesos] [pagos]   (por defecto 1.000.000 y 100.000)
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_resumenes import DIAS, poblar
+from database import Database, FUENTES_REPORTES
+
+REPETICIONES = 20
+
+
+def medir(funcion):
+    tiempos = []
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+
+def main():
+    accesos = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    pagos = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    with tempfile.TemporaryDirectory() as directorio:
+        db = Database(os.path.join(directorio, 'bench.db'))
+        print(f"Generando {accesos:,} accesos y {pagos:,} pagos en {DIAS} días...")
+        poblar(db, accesos, pagos)
+        hoy = date.today()
+        desde = date(hoy.year - 1, 1, 1)
+
+        print(f"Período {desde} a {hoy}")
+        print(f"{'reporte':<18}{'filas':>7}{'sin caché ms':>14}{'con caché ms':>14}")
+        for nombre in FUENTES_REPORTES:
+            def sin_cache():
+                db.cache_reportes.limpiar()
+                return db.reporte(nombre, desde, hoy)
+            filas = len(sin_cache())
+            frio = medir(sin_cache)
+            caliente = medir(lambda: db.reporte(nombre, desde, hoy))
+            print(f"{nombre:<18}{filas:>7}{frio:>14.2f}{caliente:>14.4f}")
+        frio = medir(lambda: db.estadisticas(max_edad=0))
+        caliente = medir(db.estadisticas)
+        print(f"{'estadisticas':<18}{1:>7}{frio:>14.2f}{caliente:>14.4f}")
+        db.cerrar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Estadísticas sobre el historial completo contra los resúmenes diarios.
+
+Compara las consultas anteriores de get_estadisticas_accesos,
+get_estadisticas_completas y get_ingresos_por_mes (GROUP BY / COUNT sobre
+accesos y pagos) con las actuales, y mide lo que cuestan los triggers al
+escribir accesos.
+
+Uso: python benchmarks/bench_resumenes.py [accesos] [pagos]   (por defecto 1.000.000 y 100.000)
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database import Database, rango_fechas, rango_mes
+
+CLIENTES = 5_000
+DIAS = 730
+REPETICIONES = 5
+
+
+def filas_accesos(cantidad, desplazamiento=0):
+    inicio = datetime.now() - timedelta(days=DIAS)
+    paso = DIAS * 86400 / cantidad
+    for i in range(cantidad):
+        yield (str(10000 + (i + desplazamiento) % CLIENTES), 'Entrada' if i % 2 == 0 else 'Salida',
+               inicio + timedelta(seconds=i * paso))
+
+
+def poblar(db, accesos, pagos):
+    inicio = date.today() - timedelta(days=DIAS)
+    cursor = db.conn.cursor()
+    cursor.executemany(
+        "INSERT INTO clientes (cedula, nombre, apellido, fecha_registro) VALUES (?, ?, ?, ?)",
+        ((str(10000 + i), f"Nombre{i}", f"Apellido{i}", inicio) for i in range(CLIENTES)))
+    cursor.executemany(
+        "INSERT INTO pagos (cedula_cliente, monto, duracion_meses, fecha_pago, fecha_vencimiento, "
+        "metodo_pago, activo) VALUES (?, 50.0, 1, ?, ?, ?, 0)",
+        ((str(10000 + i % CLIENTES), inicio + timedelta(days=i % DIAS),
+          inicio + timedelta(days=i % DIAS + 30), ('Efectivo', 'Tarjeta', 'Transferencia')[i % 3])
+         for i in range(pagos)))
+    cursor.executemany("INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora) VALUES (?, ?, ?)",
+                       filas_accesos(accesos))
+    db.conn.commit()
+    cursor.execute("ANALYZE")
+
+
+def estadisticas_anteriores(db):
+    """Consultas previas sobre las tablas de eventos"""
+    cursor = db.lectura().cursor()
+    hoy = date.today()
+    inicio_semana = hoy + timedelta(days=(6 - hoy.weekday()) % 7 - 7)
+    mes_anterior = hoy.replace(day=1) - timedelta(days=1)
+    for rango in (rango_mes(hoy.year, hoy.month), rango_mes(mes_anterior.year, mes_anterior.month)):
+        cursor.execute("SELECT SUM(monto) FROM pagos WHERE fecha_pago >= ? AND fecha_pago < ?", rango)
+        cursor.fetchone()
+    cursor.execute("SELECT COUNT(*) FROM accesos WHERE fecha_hora >= ? AND fecha_hora < ? "
+                   "AND tipo_movimiento = 'Entrada'", rango_fechas(hoy))
+    cursor.fetchone()
+    cursor.execute("SELECT COUNT(*) FROM accesos WHERE fecha_hora >= ? AND tipo_movimiento = 'Entrada'",
+                   (inicio_semana.isoformat(),))
+    cursor.fetchone()
+    cursor.execute("SELECT strftime('%H', fecha_hora) as hora, COUNT(*) as cantidad FROM accesos "
+                   "WHERE tipo_movimiento = 'Entrada' GROUP BY hora ORDER BY cantidad DESC LIMIT 1")
+    cursor.fetchone()
+    cursor.execute("SELECT strftime('%m', fecha_pago) as mes, SUM(monto), COUNT(*) FROM pagos "
+                   "WHERE fecha_pago >= ? AND fecha_pago < ? GROUP BY mes ORDER BY mes",
+                   rango_fechas(date(hoy.year, 1, 1), date(hoy.year, 12, 31)))
+    cursor.fetchall()
+
+
+def estadisticas_actuales(db):
+    db.get_estadisticas_completas()
+    db.get_estadisticas_accesos()
+    db.get_ingresos_por_mes()
+
+
+def medir_lectura(db, funcion):
+    tiempos = []
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        funcion(db)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def medir_escritura(db, cantidad):
+    """Accesos por segundo insertados en lotes de 50, como EscritorAccesos"""
+    filas = list(filas_accesos(cantidad, desplazamiento=1))
+    inicio = time.perf_counter()
+    for i in range(0, cantidad, 50):
+        db.conn.executemany("INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora) "
+                            "VALUES (?, ?, ?)", filas[i:i + 50])
+        db.conn.commit()
+    return cantidad / (time.perf_counter() - inicio)
+
+
+def main():
+    accesos = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    pagos = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    with tempfile.TemporaryDirectory() as directorio:
+        db = Database(os.path.join(directorio, 'bench.db'))
+        print(f"Generando {accesos:,} accesos y {pagos:,} pagos en {DIAS} días...")
+        poblar(db, accesos, pagos)
+
+        t_anterior = medir_lectura(db, estadisticas_anteriores)
+        t_actual = medir_lectura(db, estadisticas_actuales)
+        print(f"{'estadísticas':<28}{'ms (mediana)':>14}")
+        print(f"{'sobre accesos y pagos':<28}{t_anterior * 1000:>14.1f}")
+        print(f"{'sobre resúmenes diarios':<28}{t_actual * 1000:>14.1f}")
+        print(f"mejora: {t_anterior / t_actual:.0f}x")
+
+        con_triggers = medir_escritura(db, 20_000)
+        triggers = db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                                   "AND tbl_name = 'accesos'").fetchall()
+        for (nombre,) in triggers:
+            db.conn.execute(f"DROP TRIGGER {nombre}")
+        sin_triggers = medir_escritura(db, 20_000)
+        print(f"escritura de accesos: {con_triggers:,.0f}/s con resúmenes, {sin_triggers:,.0f}/s sin ellos")
+        db.cerrar()
+
+
+if __name__ == '__main__':
+    main()
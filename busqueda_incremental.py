@@ -0,0 +1,204 @@
+import re
+import unicodedata
+
+PALABRA = re.compile(r'[^\W_]+')
+# Marcas diacríticas combinantes (U+0300-U+036F) que quedan al descomponer
+TILDES = re.compile('[\u0300-\u036f]+')
+
+
+def normalizar(texto):
+    """Minúsculas y sin tildes, como el tokenizador unicode61 de clientes_fts"""
+    if texto.isascii():
+        return texto.lower()
+    return TILDES.sub('', unicodedata.normalize('NFKD', texto.lower()))
+
+
+def minusculas_ascii(texto):
+    """LIKE de SQLite solo ignora mayúsculas en ASCII"""
+    return ''.join(c.lower() if c.isascii() else c for c in texto)
+
+
+class BusquedaIncremental:
+    """Recuerda el último resultado de db.buscar_clientes({'texto': ...}).
+
+    Si el término nuevo solo alarga el anterior (más letras o más palabras),
+    sus resultados son un subconjunto de los que ya están en memoria y se
+    obtienen filtrándolos con la misma regla que usa la base de datos:
+    prefijos de palabra con FTS5, subcadena con LIKE.
+    """
+
+    def __init__(self, columnas=(0, 1, 2, 3), por_prefijo=True):
+        self.columnas = columnas
+        self.por_prefijo = por_prefijo
+        self.olvidar()
+
+    def olvidar(self):
+        self.termino = None
+        self.resultados = None
+
+    def recordar(self, termino, resultados):
+        self.termino = termino
+        self.resultados = resultados
+
+    def puede_acotar(self, termino):
+        if self.resultados is None or not self.termino or not self.termino.strip():
+            return False
+        if not self.por_prefijo:
+            return minusculas_ascii(self.termino) in minusculas_ascii(termino)
+        anteriores = [normalizar(p) for p in self.termino.split()]
+        nuevas = [normalizar(p) for p in termino.split()]
+        if len(nuevas) < len(anteriores):
+            return False
+        # Palabras con signos son frases para FTS5; esas van a la base de datos
+        if not all(PALABRA.fullmatch(p) for p in nuevas):
+            return False
+        return all(nueva.startswith(anterior) for anterior, nueva in zip(anteriores, nuevas))
+
+    def texto_de(self, fila):
+        return ' '.join(str(fila[i] or '') for i in self.columnas)
+
+    def acotar(self, termino):
+        """Filtra los resultados recordados; solo vale si puede_acotar(termino)"""
+        if not self.por_prefijo:
+            buscado = minusculas_ascii(termino)
+            return [fila for fila in self.resultados
+                    if any(buscado in minusculas_ascii(str(fila[i] or '')) for i in self.columnas)]
+        palabras = [normalizar(p) for p in termino.split()]
+        acotados = []
+        for fila in self.resultados:
+            tokens = PALABRA.findall(normalizar(self.texto_de(fila)))
+            if all(any(t.startswith(p) for t in tokens) for p in palabras):
+                acotados.append(fila)
+        return acotados
+
+
+class IndiceColumnar:
+    """Copia en memoria de un listado, guardada por columnas, para filtrar al teclear.
+
+    Cada fila tiene una clave de búsqueda precalculada (sus columnas unidas y
+    normalizadas); filtrar es buscar una subcadena en esas claves, sin tocar
+    la base de datos ni el Treeview.
+    """
+
+    SEPARADOR = '\x1f'
+
+    def __init__(self, filas, columnas_busqueda=None):
+        self.total = len(filas)
+        self.columnas = list(zip(*filas))
+        buscables = self.columnas
+        if columnas_busqueda and self.columnas:
+            buscables = [self.columnas[i] for i in columnas_busqueda]
+        self.claves = [normalizar(self.SEPARADOR.join(str(v) for v in valores if v is not None))
+                       for valores in zip(*buscables)]
+        self.termino = None
+        self.posiciones = None
+
+    def __len__(self):
+        return self.total
+
+    def fila(self, posicion):
+        return tuple(columna[posicion] for columna in self.columnas)
+
+    def filtrar(self, termino):
+        """Posiciones de las filas que contienen el término (sin tildes ni mayúsculas).
+
+        Si el término alarga el anterior solo se revisan las posiciones que
+        ya coincidían.
+        """
+        buscado = normalizar(termino.strip())
+        if not buscado:
+            posiciones = range(self.total)
+        elif self.termino and self.termino in buscado:
+            claves = self.claves
+            posiciones = [p for p in self.posiciones if buscado in claves[p]]
+        else:
+            posiciones = [p for p, clave in enumerate(self.claves) if buscado in clave]
+        self.termino, self.posiciones = buscado, posiciones
+        return posiciones
+
+
+class ProveedorFiltrado:
+    """Contrato de ProveedorLista sobre las posiciones filtradas de un IndiceColumnar"""
+
+    def __init__(self, indice, posiciones):
+        self.indice = indice
+        self.posiciones = posiciones
+
+    def contar(self):
+        return len(self.posiciones)
+
+    def clave(self, fila):
+        return None
+
+    def leer_pagina(self, numero, tamaño, ancla=None):
+        # Las filas solo se arman para la página pedida
+        return [self.indice.fila(p) for p in self.posiciones[numero * tamaño:(numero + 1) * tamaño]]
+
+
+class FiltroRapido:
+    """Búsqueda rápida de una ListaVirtual con un IndiceColumnar.
+
+    La primera tecla arma el índice en segundo plano con cargar(); las teclas
+    que llegan mientras tanto solo actualizan el término, que se aplica al
+    terminar. Con el texto vacío la lista vuelve al proveedor completo().
+    """
+
+    def __init__(self, lista, tareas, clave, cargar, completo, columnas_busqueda=None):
+        self.lista = lista
+        self.tareas = tareas
+        self.clave = clave
+        self.cargar = cargar
+        self.completo = completo
+        self.columnas_busqueda = columnas_busqueda
+        self.indice = None
+        self.cargando = False
+        self.pedido = ''
+        self.aplicado = None
+
+    def filtrando(self):
+        return isinstance(self.lista.ventana.proveedor, ProveedorFiltrado)
+
+    def filtrar(self, termino):
+        self.pedido = termino
+        if not termino.strip():
+            self.aplicado = None
+            if self.filtrando():
+                self.lista.recargar(self.completo())
+            return
+        if self.indice is None:
+            if not self.cargando:
+                self.cargando = True
+                self.tareas.ejecutar(self.clave, self.armar_indice,
+                                     al_terminar=self.indice_listo, al_fallar=self.indice_fallido)
+            return
+        if termino == self.aplicado:
+            return  # teclas que no cambian el texto
+        self.aplicado = termino
+        # La lista virtual solo vuelve a pintar las filas visibles del filtrado
+        self.lista.recargar(ProveedorFiltrado(self.indice, self.indice.filtrar(termino)))
+
+    def armar_indice(self):
+        return IndiceColumnar(self.cargar(), self.columnas_busqueda)
+
+    def indice_listo(self, indice):
+        self.cargando = False
+        self.indice = indice
+        self.aplicado = None
+        self.filtrar(self.pedido)
+
+    def indice_fallido(self, error):
+        self.cargando = False
+        print(f"Error cargando índice de búsqueda rápida: {error}")
+
+    def recargar(self, termino):
+        """Descarta la copia en memoria y vuelve a mostrar la lista con datos al día"""
+        self.tareas.cancelar(self.clave)
+        self.indice = None
+        self.cargando = False
+        self.aplicado = None
+        if termino.strip():
+            self.filtrar(termino)
+        elif self.filtrando():
+            self.lista.recargar(self.completo())
+        else:
+            self.lista.recargar()  # conserva la posición
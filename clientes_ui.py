@@ -1,16 +1,29 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
+from collections import deque
 import os
-from PIL import Image, ImageTk
-import pandas as pd
+import time
+from tareas import ejecutor_de
+from lista_virtual import ListaVirtual, ProveedorLista, ProveedorPaginado
+from busqueda_incremental import BusquedaIncremental, FiltroRapido
+from exportacion import ENCABEZADOS_CLIENTES, exportar_con_avance
 
 class ClientesUI:
+    # Pausa de tecleo antes de buscar
+    ESPERA_BUSQUEDA_MS = 200
+
     def __init__(self, parent, db):
         self.parent = parent
         self.db = db
         self.cliente_actual = None
         self.foto_path_actual = None
+        self.tareas = ejecutor_de(parent)
+        self.incremental = BusquedaIncremental(por_prefijo=db.busqueda_fts)
+        self.busqueda_programada = None
+        self.termino_pedido = None
+        self.ultima_tecla = None
+        self.latencias = deque(maxlen=20)
         self.setup_ui()
 
     # En tu clientes_ui.py existente, busca el método registrar_cliente y reemplázalo con:
@@ -150,6 +163,7 @@ class ClientesUI:
         # Limpiar el frame principal
         for widget in self.parent.winfo_children():
             widget.destroy()
+        self.tareas.cancelar('clientes.indice')
         
         # Título
         ttk.Label(self.parent, text="LISTA GENERAL DE CLIENTES", 
@@ -179,11 +193,8 @@ class ClientesUI:
         table_frame = ttk.Frame(self.parent)
         table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
-        # Crear Treeview
+        # Lista virtual: solo las filas visibles existen en el Treeview
         columns = ('Cédula', 'Nombre', 'Apellido', 'Teléfono', 'Email', 'Estado')
-        self.tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
-        
-        # Configurar columnas
         column_widths = {
             'Cédula': 100,
             'Nombre': 150,
@@ -192,18 +203,16 @@ class ClientesUI:
             'Email': 200,
             'Estado': 80
         }
-        
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=column_widths[col], anchor='center')
-        
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        
-        # Empaquetar
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # El contador se crea más abajo; lista_virtual cuenta en segundo plano
+        self.lista = ListaVirtual(table_frame, columns, self.proveedor_clientes(),
+                                  formatear=self.formatear_fila_lista, anchos=column_widths,
+                                  al_contar=self.mostrar_total,
+                                  height=15)
+        self.lista.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.lista.tree
+        # Se busca en las mismas columnas que muestra la tabla
+        self.filtro = FiltroRapido(self.lista, self.tareas, 'clientes.indice', self.db.get_all_clientes,
+                                   self.proveedor_clientes, columnas_busqueda=(0, 1, 2, 3, 4, 5))
         
         # Frame de acciones para cliente seleccionado
         actions_frame = ttk.Frame(self.parent)
@@ -230,88 +239,55 @@ class ClientesUI:
         ttk.Button(self.parent, text="← Volver al Menú", 
                 command=self.crear_interfaz_principal).pack(pady=10)
         
-        # Cargar datos
-        self.actualizar_lista()
-        
         # Configurar doble click para ver detalles
         self.tree.bind('<Double-1>', lambda e: self.ver_detalles_cliente())
 
+    def proveedor_clientes(self):
+        """Listado completo de clientes paginado por (nombre, apellido, cédula)"""
+        return ProveedorPaginado(self.db.contar_clientes, self.db.pagina_clientes,
+                                 self.db.clave_cliente_en, clave=lambda c: (c[1], c[2], c[0]))
+
     def actualizar_lista(self):
         """Actualiza la lista de clientes desde la base de datos"""
-        try:
-            # Limpiar tabla
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # Obtener clientes de la base de datos
-            clientes = self.db.get_all_clientes()
-            
-            # Insertar clientes en la tabla
-            for cliente in clientes:
-                # Asumiendo que la estructura es: (cedula, nombre, apellido, telefono, email, estado)
-                estado = "Activo"  # Puedes ajustar esto según tu lógica de negocio
-                if len(cliente) > 5 and cliente[5]:  # Si hay campo de estado
-                    estado = cliente[5]
-                
-                self.tree.insert('', tk.END, values=(
-                    cliente[0],  # cédula
-                    cliente[1],  # nombre
-                    cliente[2],  # apellido
-                    cliente[3] if len(cliente) > 3 else '',  # teléfono
-                    cliente[4] if len(cliente) > 4 else '',  # email
-                    estado
-                ))
-            
-            # Actualizar contador
-            self.contador_label.config(text=f"Total de clientes: {len(clientes)}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo cargar la lista de clientes: {str(e)}")
+        # El índice de la búsqueda rápida es una copia; se vuelve a armar al filtrar
+        self.filtro.recargar(self.busqueda_rapida_entry.get())
+
+    def mostrar_total(self, total):
+        if self.filtro.filtrando():
+            texto = f"Mostrando {total} de {len(self.filtro.indice)} clientes"
+        else:
+            texto = f"Total de clientes: {total}"
+        self.contador_label.config(text=texto)
+
+    def formatear_fila_lista(self, cliente):
+        # Asumiendo que la estructura es: (cedula, nombre, apellido, telefono, email, estado)
+        estado = "Activo"  # Puedes ajustar esto según tu lógica de negocio
+        if len(cliente) > 5 and cliente[5]:  # Si hay campo de estado
+            estado = cliente[5]
+        
+        return (
+            cliente[0],  # cédula
+            cliente[1],  # nombre
+            cliente[2],  # apellido
+            cliente[3] if len(cliente) > 3 else '',  # teléfono
+            cliente[4] if len(cliente) > 4 else '',  # email
+            estado
+        )
 
     def filtrar_lista(self, event=None):
         """Filtra la lista según el texto de búsqueda"""
-        search_term = self.busqueda_rapida_entry.get().lower()
-        
-        # Mostrar todos los items primero
-        for item in self.tree.get_children():
-            self.tree.item(item, tags=())
-        
-        if search_term:
-            # Ocultar items que no coincidan
-            for item in self.tree.get_children():
-                values = [str(value).lower() for value in self.tree.item(item)['values']]
-                if not any(search_term in value for value in values):
-                    self.tree.item(item, tags=('hidden',))
-            
-            self.tree.configure(displaycolumns='#all')
-        
-        # Configurar tag para ocultar
-        self.tree.tag_configure('hidden', display='')
+        self.filtro.filtrar(self.busqueda_rapida_entry.get())
 
     def exportar_excel(self):
-        """Exporta la lista de clientes a Excel"""
-        try:
-            clientes = self.db.get_all_clientes()
-            if not clientes:
-                messagebox.showinfo("Info", "No hay clientes para exportar.")
-                return
-            
-            # Crear DataFrame
-            df = pd.DataFrame(clientes, columns=['Cédula', 'Nombre', 'Apellido', 'Teléfono', 'Email', 'Estado'])
-            
-            # Guardar archivo
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
-                title="Guardar lista de clientes como"
-            )
-            
-            if file_path:
-                df.to_excel(file_path, index=False)
-                messagebox.showinfo("Éxito", f"Lista exportada correctamente a:\n{file_path}")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo exportar la lista: {str(e)}")
+        """Exporta la lista de clientes a Excel o CSV, leyéndola por lotes"""
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx"), ("CSV", "*.csv"), ("All files", "*.*")],
+            title="Guardar lista de clientes como"
+        )
+        if file_path:
+            exportar_con_avance(self.parent, file_path, ENCABEZADOS_CLIENTES, self.db.iterar_clientes(),
+                                titulo="Exportando clientes", hoja="Clientes")
 
     def ver_detalles_cliente(self):
         """Muestra los detalles del cliente seleccionado"""
@@ -445,10 +421,9 @@ class ClientesUI:
         right_frame = ttk.Frame(main_frame)
         right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5, 0))
         
+        # La lista virtual se carga sola al crearse
         self.setup_lista_clientes(left_frame)
         self.setup_formulario_cliente(right_frame)
-        
-        self.cargar_clientes()
     
     def setup_lista_clientes(self, parent):
         """Configura la lista de clientes"""
@@ -461,6 +436,9 @@ class ClientesUI:
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=20)
         search_entry.pack(side=tk.LEFT, padx=5)
         search_entry.bind('<KeyRelease>', self.buscar_clientes)
+        # F12 muestra la latencia de cada búsqueda (depuración)
+        search_entry.bind('<F12>', self.alternar_latencias)
+        self.latencia_label = ttk.Label(search_frame, foreground='gray', font=('Consolas', 8))
         
         # Botones
         btn_frame = ttk.Frame(parent)
@@ -475,23 +453,13 @@ class ClientesUI:
         list_frame = ttk.LabelFrame(parent, text="Clientes")
         list_frame.pack(fill=tk.BOTH, expand=True)
         
-        columns = ('cedula', 'nombre', 'apellido', 'telefono')
-        self.tree = ttk.Treeview(list_frame, columns=columns, show='headings', height=15)
-        
-        self.tree.heading('cedula', text='Cédula')
-        self.tree.heading('nombre', text='Nombre')
-        self.tree.heading('apellido', text='Apellido')
-        self.tree.heading('telefono', text='Teléfono')
-        
-        self.tree.column('cedula', width=100)
-        self.tree.column('nombre', width=120)
-        self.tree.column('apellido', width=120)
-        self.tree.column('telefono', width=100)
-        
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        columns = ('Cédula', 'Nombre', 'Apellido', 'Teléfono')
+        self.lista_panel = ListaVirtual(list_frame, columns, self.proveedor_clientes(),
+                                        formatear=lambda c: (c[0], c[1], c[2], c[3]),
+                                        anchos={'Cédula': 100, 'Nombre': 120, 'Apellido': 120, 'Teléfono': 100},
+                                        height=15)
+        self.lista_panel.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.lista_panel.tree
         
         self.tree.bind('<<TreeviewSelect>>', self.on_cliente_select)
     
@@ -556,39 +524,78 @@ class ClientesUI:
         self.btn_guardar.config(state='normal')
         self.btn_editar.config(state='disabled')
     
+    def refrescar(self):
+        """Al volver a la pantalla (ver Pantallas): la lista o la búsqueda con datos al día"""
+        if self.search_var.get().strip():
+            # Los resultados recordados pueden haber quedado viejos
+            self.incremental.olvidar()
+            self.termino_pedido = None
+            self.ejecutar_busqueda()
+        else:
+            self.cargar_clientes()
+    
     def cargar_clientes(self):
         """Carga la lista de clientes"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        try:
-            clientes = self.db.get_all_clientes()
-            for cliente in clientes:
-                self.tree.insert('', 'end', values=(
-                    cliente[0], cliente[1], cliente[2], cliente[3]
-                ))
-        except Exception as e:
-            print(f"Error cargando clientes: {e}")
+        # Una búsqueda pendiente no debe reemplazar el listado completo
+        self.tareas.cancelar('clientes.panel')
+        self.incremental.olvidar()
+        self.termino_pedido = None
+        if isinstance(self.lista_panel.ventana.proveedor, ProveedorPaginado):
+            self.lista_panel.recargar()  # conserva la posición
+        else:
+            self.lista_panel.recargar(self.proveedor_clientes())
     
     def buscar_clientes(self, event=None):
-        """Busca clientes"""
-        try:
-            criterio = self.search_var.get()
-            clientes = self.db.buscar_clientes({
-                'cedula': criterio,
-                'nombre': criterio,
-                'apellido': criterio
-            }, "Todos")
-            
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            for cliente in clientes:
-                self.tree.insert('', 'end', values=(
-                    cliente[0], cliente[1], cliente[2], cliente[3]
-                ))
-        except Exception as e:
-            print(f"Error buscando: {e}")
+        """Programa la búsqueda para cuando se deje de teclear"""
+        self.ultima_tecla = time.perf_counter()
+        if self.busqueda_programada is not None:
+            self.parent.after_cancel(self.busqueda_programada)
+        self.busqueda_programada = self.parent.after(self.ESPERA_BUSQUEDA_MS, self.ejecutar_busqueda)
+    
+    def ejecutar_busqueda(self):
+        """Busca el término actual, acotando el resultado anterior cuando se puede"""
+        self.busqueda_programada = None
+        criterio = self.search_var.get()
+        if not criterio.strip():
+            if self.termino_pedido is not None:
+                self.cargar_clientes()
+            return
+        if criterio == self.termino_pedido:
+            return  # teclas que no cambian el texto (flechas, Shift...)
+        self.termino_pedido = criterio
+        tecla = self.ultima_tecla
+        if self.incremental.puede_acotar(criterio):
+            funcion, args, origen = self.incremental.acotar, (criterio,), 'acotada'
+        else:
+            funcion, args, origen = self.db.buscar_clientes, ({'texto': criterio}, "Todos"), 'consulta'
+        # La misma clave descarta la respuesta de cualquier término anterior
+        self.tareas.ejecutar('clientes.panel', funcion, *args,
+                             al_terminar=lambda clientes: self.mostrar_busqueda(criterio, clientes, tecla, origen),
+                             al_fallar=lambda e: print(f"Error buscando: {e}"))
+    
+    def mostrar_busqueda(self, criterio, clientes, tecla, origen):
+        if criterio != self.search_var.get():
+            # El usuario siguió escribiendo; si vuelve a este mismo texto hay que buscarlo de nuevo
+            self.termino_pedido = None
+            return
+        self.incremental.recordar(criterio, clientes)
+        # Los resultados de búsqueda ya están en memoria; la lista solo pinta lo visible
+        self.lista_panel.recargar(ProveedorLista(clientes))
+        if tecla is not None:
+            self.registrar_latencia(criterio, (time.perf_counter() - tecla) * 1000, len(clientes), origen)
+    
+    def registrar_latencia(self, criterio, ms, filas, origen):
+        """Tiempo desde la última tecla (incluye la espera) hasta mostrar el resultado"""
+        self.latencias.append(ms)
+        promedio = sum(self.latencias) / len(self.latencias)
+        self.latencia_label.config(
+            text=f"'{criterio}': {ms:.0f} ms ({origen}, {filas} filas) · prom. {promedio:.0f} ms")
+    
+    def alternar_latencias(self, event=None):
+        if self.latencia_label.winfo_ismapped():
+            self.latencia_label.pack_forget()
+        else:
+            self.latencia_label.pack(side=tk.LEFT, padx=5)
     
     def on_cliente_select(self, event):
         """Cuando se selecciona un cliente"""
@@ -633,6 +640,8 @@ class ClientesUI:
     
     def mostrar_foto(self, ruta_foto):
         """Muestra la foto del cliente"""
+        # PIL se importa con la primera foto, no al abrir la pantalla
+        from PIL import Image, ImageTk
         try:
             if os.path.exists(ruta_foto):
                 image = Image.open(ruta_foto)
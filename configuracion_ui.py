@@ -2,14 +2,15 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import json
 import os
-import shutil
-import sqlite3
 from datetime import datetime
+from database import PERFIL_CONEXION
+from tareas import ejecutor_de
 
 class ConfiguracionUI:
     def __init__(self, parent, db):
         self.parent = parent
         self.db = db
+        self.tareas = ejecutor_de(parent)
         self.config_file = 'config/config.json'
         self.config_data = self.cargar_configuracion()
         self.setup_ui()
@@ -38,7 +39,8 @@ class ConfiguracionUI:
                 'notificaciones_sonido': True,
                 'modo_kiosco': False,
                 'tiempo_inactividad': 300
-            }
+            },
+            'base_datos': dict(PERFIL_CONEXION)
         }
         
         try:
@@ -312,20 +314,10 @@ class ConfiguracionUI:
                 size = os.path.getsize('data/gimnasio.db')
                 ttk.Label(info_frame, text=f"Tamaño BD: {size/1024/1024:.2f} MB").pack(padx=5, pady=2)
             
-            # Número de tablas
-            cursor = self.db.conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tablas = cursor.fetchall()
-            ttk.Label(info_frame, text=f"Tablas en BD: {len(tablas)}").pack(padx=5, pady=2)
-            
-            # Número de registros
-            cursor.execute("SELECT COUNT(*) FROM clientes")
-            clientes = cursor.fetchone()[0]
-            ttk.Label(info_frame, text=f"Clientes registrados: {clientes}").pack(padx=5, pady=2)
-            
-            cursor.execute("SELECT COUNT(*) FROM pagos")
-            pagos = cursor.fetchone()[0]
-            ttk.Label(info_frame, text=f"Pagos registrados: {pagos}").pack(padx=5, pady=2)
+            # Conteos en segundo plano: con muchos registros tardan
+            self.info_frame = info_frame
+            self.info_labels = []
+            self.cargar_info_sistema()
             
         except Exception as e:
             print(f"Error obteniendo información del sistema: {e}")
@@ -344,6 +336,37 @@ class ConfiguracionUI:
         style = ttk.Style()
         style.configure("Danger.TButton", background='#e74c3c', foreground='white')
     
+    def refrescar(self):
+        """Al volver a la pantalla (ver Pantallas): solo los conteos cambian"""
+        self.cargar_info_sistema()
+    
+    def cargar_info_sistema(self):
+        self.tareas.ejecutar('configuracion.info', self.leer_info_sistema,
+                             al_terminar=lambda info: self.mostrar_info_sistema(*info),
+                             al_fallar=lambda e: print(f"Error obteniendo información del sistema: {e}"))
+    
+    def leer_info_sistema(self):
+        cursor = self.db.lectura().cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        tablas = cursor.fetchall()
+        cursor.execute("SELECT COUNT(*) FROM clientes")
+        clientes = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM pagos")
+        pagos = cursor.fetchone()[0]
+        return len(tablas), clientes, pagos
+    
+    def mostrar_info_sistema(self, tablas, clientes, pagos):
+        textos = [f"Tablas en BD: {tablas}", f"Clientes registrados: {clientes}",
+                  f"Pagos registrados: {pagos}"]
+        # Las etiquetas se crean la primera vez; al refrescar solo cambia el texto
+        if not self.info_labels:
+            for _ in textos:
+                label = ttk.Label(self.info_frame)
+                label.pack(padx=5, pady=2)
+                self.info_labels.append(label)
+        for label, texto in zip(self.info_labels, textos):
+            label.config(text=texto)
+    
     def guardar_config_gimnasio(self):
         """Guarda la configuración del gimnasio"""
         try:
@@ -458,16 +481,18 @@ class ConfiguracionUI:
     
     def crear_backup_manual(self):
         """Crea un backup manual"""
-        try:
-            if self.db.crear_backup():
-                # Actualizar última fecha de backup
-                self.config_data['backup']['ultimo_backup'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                self.guardar_configuracion()
-                messagebox.showinfo("Éxito", "Backup creado correctamente")
-            else:
-                messagebox.showerror("Error", "No se pudo crear el backup")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error creando backup: {e}")
+        self.tareas.ejecutar('configuracion.backup', self.db.crear_backup,
+                             al_terminar=self.backup_terminado,
+                             al_fallar=lambda e: messagebox.showerror("Error", f"Error creando backup: {e}"))
+    
+    def backup_terminado(self, exito):
+        if exito:
+            # Actualizar última fecha de backup
+            self.config_data['backup']['ultimo_backup'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self.guardar_configuracion()
+            messagebox.showinfo("Éxito", "Backup creado correctamente")
+        else:
+            messagebox.showerror("Error", "No se pudo crear el backup")
     
     def restaurar_backup(self):
         """Restaura un backup"""
@@ -477,19 +502,17 @@ class ConfiguracionUI:
         )
         
         if file_path:
-            try:
-                # Cerrar conexión actual
-                self.db.conn.close()
-                
-                # Copiar backup sobre la base de datos actual
-                shutil.copy2(file_path, 'data/gimnasio.db')
-                
-                # Reconectar
-                self.db.conn = sqlite3.connect('data/gimnasio.db', check_same_thread=False)
-                
-                messagebox.showinfo("Éxito", "Backup restaurado correctamente")
-            except Exception as e:
-                messagebox.showerror("Error", f"No se pudo restaurar el backup: {e}")
+            self.tareas.ejecutar('configuracion.restaurar', self.db.restaurar_backup, file_path,
+                                 al_terminar=self.restauracion_terminada,
+                                 al_fallar=lambda e: messagebox.showerror(
+                                     "Error", f"No se pudo restaurar el backup: {e}"))
+    
+    def restauracion_terminada(self, exito):
+        if not exito:
+            messagebox.showerror("Error", "No se pudo restaurar el backup")
+            return
+        
+        messagebox.showinfo("Éxito", "Backup restaurado correctamente")
     
     def guardar_config_accesos(self):
         """Guarda la configuración de accesos"""
@@ -520,17 +543,23 @@ class ConfiguracionUI:
     
     def optimizar_bd(self):
         """Optimiza la base de datos"""
-        try:
+        self.tareas.ejecutar('configuracion.optimizar', self.ejecutar_vacuum,
+                             al_terminar=lambda _: messagebox.showinfo(
+                                 "Éxito", "Base de datos optimizada correctamente"),
+                             al_fallar=lambda e: messagebox.showerror("Error", f"No se pudo optimizar: {e}"))
+    
+    def ejecutar_vacuum(self):
+        with self.db.lock_escritura:
             cursor = self.db.conn.cursor()
             cursor.execute("VACUUM")
             self.db.conn.commit()
-            messagebox.showinfo("Éxito", "Base de datos optimizada correctamente")
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo optimizar: {e}")
     
     def regenerar_estadisticas(self):
-        """Regenera las estadísticas del sistema"""
-        messagebox.showinfo("Éxito", "Estadísticas regeneradas correctamente")
+        """Recalcula los resúmenes diarios de accesos e ingresos desde el historial"""
+        self.tareas.ejecutar('configuracion.resumenes', self.db.reconstruir_resumenes,
+                             al_terminar=lambda _: messagebox.showinfo(
+                                 "Éxito", "Estadísticas regeneradas correctamente"),
+                             al_fallar=lambda e: messagebox.showerror("Error", f"No se pudieron regenerar: {e}"))
     
     def eliminar_datos_prueba(self):
         """Elimina datos de prueba (peligroso)"""
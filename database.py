@@ -1,18 +1,620 @@
 import sqlite3
+import json
 import os
-import shutil
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
 
-class Database:
+# Mantiene clientes_fts al insertar; escribir_lote_clientes lo suspende durante un lote
+TRIGGER_FTS_INSERT = """
+        CREATE TRIGGER IF NOT EXISTS clientes_fts_insert AFTER INSERT ON clientes BEGIN
+            INSERT INTO clientes_fts (rowid, cedula, nombre, apellido, telefono)
+            VALUES (new.rowid, new.cedula, new.nombre, new.apellido, new.telefono);
+        END
+        """
+
+# Columnas de clientes que una sincronización masiva puede sobrescribir
+CAMPOS_ACTUALIZABLES = {'nombre', 'apellido', 'telefono', 'telefono_emergencia', 'direccion'}
+
+# Resúmenes diarios de accesos (por hora y movimiento) e ingresos (por método).
+# Los triggers de la migración 5 los mantienen al escribir; estas sentencias
+# los recalculan desde cero (carga inicial y Database.reconstruir_resumenes).
+RECONSTRUIR_RESUMENES = [
+    "DELETE FROM resumen_accesos_hora",
+    """
+    INSERT INTO resumen_accesos_hora (dia, hora, tipo_movimiento, cantidad)
+    SELECT substr(fecha_hora, 1, 10), CAST(substr(fecha_hora, 12, 2) AS INTEGER),
+           IFNULL(tipo_movimiento, ''), COUNT(*)
+    FROM accesos
+    WHERE fecha_hora IS NOT NULL
+    GROUP BY 1, 2, 3
+    """,
+    "DELETE FROM resumen_ingresos_dia",
+    """
+    INSERT INTO resumen_ingresos_dia (dia, metodo_pago, total, cantidad)
+    SELECT substr(fecha_pago, 1, 10), IFNULL(metodo_pago, ''), SUM(IFNULL(monto, 0)), COUNT(*)
+    FROM pagos
+    WHERE fecha_pago IS NOT NULL
+    GROUP BY 1, 2
+    """,
+]
+
+# Migraciones de esquema versionadas. La posición en la lista es la versión
+# (PRAGMA user_version); nunca modificar una migración ya publicada, solo
+# agregar nuevas al final.
+MIGRACIONES = [
+    # 1: índices secundarios para pagos, accesos y listados de clientes
+    [
+        "CREATE INDEX IF NOT EXISTS idx_pagos_cliente_activo "
+        "ON pagos (cedula_cliente, activo, fecha_vencimiento)",
+        "CREATE INDEX IF NOT EXISTS idx_pagos_cliente_fecha "
+        "ON pagos (cedula_cliente, fecha_pago)",
+        "CREATE INDEX IF NOT EXISTS idx_pagos_vencimiento_activo "
+        "ON pagos (fecha_vencimiento) WHERE activo = 1",
+        "CREATE INDEX IF NOT EXISTS idx_pagos_fecha_pago ON pagos (fecha_pago)",
+        "CREATE INDEX IF NOT EXISTS idx_accesos_fecha_hora ON accesos (fecha_hora)",
+        "CREATE INDEX IF NOT EXISTS idx_accesos_cliente_fecha "
+        "ON accesos (cedula_cliente, fecha_hora)",
+        "CREATE INDEX IF NOT EXISTS idx_clientes_nombre ON clientes (nombre, apellido)",
+    ],
+    # 2: estado de membresía materializado (una fila por cliente con pago)
+    [
+        """
+        CREATE TABLE IF NOT EXISTS estado_membresia (
+            cedula_cliente TEXT PRIMARY KEY,
+            fecha_vencimiento DATE NOT NULL,
+            id_pago INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_estado_membresia_vencimiento "
+        "ON estado_membresia (fecha_vencimiento)",
+        """
+        INSERT OR REPLACE INTO estado_membresia (cedula_cliente, fecha_vencimiento, id_pago)
+        SELECT cedula_cliente, fecha_vencimiento, MAX(id)
+        FROM pagos
+        WHERE activo = 1
+        GROUP BY cedula_cliente
+        """,
+    ],
+    # 3: orden total de clientes para paginar por clave (nombre, apellido, cedula)
+    [
+        "CREATE INDEX IF NOT EXISTS idx_clientes_orden ON clientes (nombre, apellido, cedula)",
+        "DROP INDEX IF EXISTS idx_clientes_nombre",
+    ],
+    # 4: índice de texto completo para buscar clientes por prefijo y sin tildes
+    [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS clientes_fts USING fts5(
+            cedula, nombre, apellido, telefono,
+            content='clientes', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+        )
+        """,
+        TRIGGER_FTS_INSERT,
+        """
+        CREATE TRIGGER IF NOT EXISTS clientes_fts_delete AFTER DELETE ON clientes BEGIN
+            INSERT INTO clientes_fts (clientes_fts, rowid, cedula, nombre, apellido, telefono)
+            VALUES ('delete', old.rowid, old.cedula, old.nombre, old.apellido, old.telefono);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS clientes_fts_update AFTER UPDATE ON clientes BEGIN
+            INSERT INTO clientes_fts (clientes_fts, rowid, cedula, nombre, apellido, telefono)
+            VALUES ('delete', old.rowid, old.cedula, old.nombre, old.apellido, old.telefono);
+            INSERT INTO clientes_fts (rowid, cedula, nombre, apellido, telefono)
+            VALUES (new.rowid, new.cedula, new.nombre, new.apellido, new.telefono);
+        END
+        """,
+        "INSERT INTO clientes_fts (clientes_fts) VALUES ('rebuild')",
+    ],
+    # 5: resúmenes diarios para estadísticas en O(días) en vez de O(eventos).
+    # Restar con un old.fecha NULL no coincide con ninguna fila (dia = NULL).
+    [
+        """
+        CREATE TABLE IF NOT EXISTS resumen_accesos_hora (
+            dia TEXT NOT NULL,
+            hora INTEGER NOT NULL,
+            tipo_movimiento TEXT NOT NULL,
+            cantidad INTEGER NOT NULL,
+            PRIMARY KEY (dia, hora, tipo_movimiento)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS resumen_ingresos_dia (
+            dia TEXT NOT NULL,
+            metodo_pago TEXT NOT NULL,
+            total REAL NOT NULL,
+            cantidad INTEGER NOT NULL,
+            PRIMARY KEY (dia, metodo_pago)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS resumen_accesos_insert AFTER INSERT ON accesos
+        WHEN new.fecha_hora IS NOT NULL BEGIN
+            INSERT INTO resumen_accesos_hora (dia, hora, tipo_movimiento, cantidad)
+            VALUES (substr(new.fecha_hora, 1, 10), CAST(substr(new.fecha_hora, 12, 2) AS INTEGER),
+                    IFNULL(new.tipo_movimiento, ''), 1)
+            ON CONFLICT (dia, hora, tipo_movimiento) DO UPDATE SET cantidad = cantidad + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS resumen_accesos_delete AFTER DELETE ON accesos BEGIN
+            UPDATE resumen_accesos_hora SET cantidad = cantidad - 1
+            WHERE dia = substr(old.fecha_hora, 1, 10)
+              AND hora = CAST(substr(old.fecha_hora, 12, 2) AS INTEGER)
+              AND tipo_movimiento = IFNULL(old.tipo_movimiento, '');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS resumen_accesos_update
+        AFTER UPDATE OF fecha_hora, tipo_movimiento ON accesos BEGIN
+            UPDATE resumen_accesos_hora SET cantidad = cantidad - 1
+            WHERE dia = substr(old.fecha_hora, 1, 10)
+              AND hora = CAST(substr(old.fecha_hora, 12, 2) AS INTEGER)
+              AND tipo_movimiento = IFNULL(old.tipo_movimiento, '');
+            INSERT INTO resumen_accesos_hora (dia, hora, tipo_movimiento, cantidad)
+            SELECT substr(new.fecha_hora, 1, 10), CAST(substr(new.fecha_hora, 12, 2) AS INTEGER),
+                   IFNULL(new.tipo_movimiento, ''), 1
+            WHERE new.fecha_hora IS NOT NULL
+            ON CONFLICT (dia, hora, tipo_movimiento) DO UPDATE SET cantidad = cantidad + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS resumen_ingresos_insert AFTER INSERT ON pagos
+        WHEN new.fecha_pago IS NOT NULL BEGIN
+            INSERT INTO resumen_ingresos_dia (dia, metodo_pago, total, cantidad)
+            VALUES (substr(new.fecha_pago, 1, 10), IFNULL(new.metodo_pago, ''), IFNULL(new.monto, 0), 1)
+            ON CONFLICT (dia, metodo_pago) DO UPDATE SET
+                total = total + excluded.total, cantidad = cantidad + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS resumen_ingresos_delete AFTER DELETE ON pagos BEGIN
+            UPDATE resumen_ingresos_dia SET total = total - IFNULL(old.monto, 0), cantidad = cantidad - 1
+            WHERE dia = substr(old.fecha_pago, 1, 10) AND metodo_pago = IFNULL(old.metodo_pago, '');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS resumen_ingresos_update
+        AFTER UPDATE OF monto, fecha_pago, metodo_pago ON pagos BEGIN
+            UPDATE resumen_ingresos_dia SET total = total - IFNULL(old.monto, 0), cantidad = cantidad - 1
+            WHERE dia = substr(old.fecha_pago, 1, 10) AND metodo_pago = IFNULL(old.metodo_pago, '');
+            INSERT INTO resumen_ingresos_dia (dia, metodo_pago, total, cantidad)
+            SELECT substr(new.fecha_pago, 1, 10), IFNULL(new.metodo_pago, ''), IFNULL(new.monto, 0), 1
+            WHERE new.fecha_pago IS NOT NULL
+            ON CONFLICT (dia, metodo_pago) DO UPDATE SET
+                total = total + excluded.total, cantidad = cantidad + 1;
+        END
+        """,
+        *RECONSTRUIR_RESUMENES,
+    ],
+    # 6: índices para los reportes por período (altas por mes, vigentes al cierre)
+    [
+        "CREATE INDEX IF NOT EXISTS idx_clientes_fecha_registro ON clientes (fecha_registro)",
+        "CREATE INDEX IF NOT EXISTS idx_pagos_duracion ON pagos (duracion_meses)",
+        "CREATE INDEX IF NOT EXISTS idx_pagos_vigencia ON pagos (fecha_pago, fecha_vencimiento, cedula_cliente)",
+    ],
+]
+
+# Tablas de las que sale cada reporte de Database.reporte (para invalidar su caché)
+FUENTES_REPORTES = {
+    'pagos_mensuales': ('pagos', 'clientes'),
+    'accesos_diarios': ('accesos',),
+    'ingresos_metodo': ('pagos',),
+    'tendencia': ('pagos',),
+}
+# Tablas cuyos cambios publica Database.cambios
+TABLAS_VIGILADAS = ('clientes', 'pagos', 'accesos')
+# Tablas de las que sale la instantánea de Database.estadisticas
+FUENTES_ESTADISTICAS = TABLAS_VIGILADAS
+# Segundos que Database.estadisticas reutiliza una instantánea sin escrituras de por medio
+ESTADISTICAS_MAX_EDAD = 30
+
+# Perfil de conexión; se puede ajustar en la sección "base_datos" de config/config.json
+PERFIL_CONEXION = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size_kb': 20000,
+    'mmap_size_mb': 256,
+    'temp_store': 'MEMORY',
+    'foreign_keys': True,
+    'busy_timeout_ms': 5000
+}
+
+VALORES_PRAGMA = {
+    'journal_mode': {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'},
+    'synchronous': {'OFF', 'NORMAL', 'FULL', 'EXTRA'},
+    'temp_store': {'DEFAULT', 'FILE', 'MEMORY'}
+}
+
+def consulta_fts(texto, columna=None):
+    """Convierte lo que escribe el usuario en una consulta FTS5 de prefijos.
+    
+    Cada palabra se cita (las comillas internas se duplican) y se marca como
+    prefijo, así "mar gon" encuentra "María González". Devuelve None si no
+    queda ninguna palabra.
+    """
+    palabras = ['"{}"*'.format(p.replace('"', '""')) for p in texto.split()]
+    if not palabras:
+        return None
+    consulta = " AND ".join(palabras)
+    if columna:
+        consulta = f"{{{columna}}} : ({consulta})"
+    return consulta
+
+def cargar_perfil_conexion(ruta_config='config/config.json'):
+    """Combina PERFIL_CONEXION con la sección "base_datos" del archivo de configuración"""
+    perfil = dict(PERFIL_CONEXION)
+    try:
+        if os.path.exists(ruta_config):
+            with open(ruta_config, 'r', encoding='utf-8') as f:
+                perfil.update(json.load(f).get('base_datos', {}))
+    except (OSError, ValueError) as e:
+        print(f"Error leyendo perfil de conexión: {e}")
+    return perfil
+
+def aplicar_perfil_conexion(conn, perfil, solo_lectura=False):
+    """Aplica los PRAGMA del perfil a una conexión recién abierta"""
+    # Los PRAGMA no aceptan parámetros: solo se interpolan valores validados
+    for clave, permitidos in VALORES_PRAGMA.items():
+        if solo_lectura and clave == 'journal_mode':
+            # El modo de journal es del archivo; lo fija la conexión de escritura
+            continue
+        valor = str(perfil.get(clave, PERFIL_CONEXION[clave])).upper()
+        if valor not in permitidos:
+            print(f"Valor inválido para {clave}: {valor}; se usa {PERFIL_CONEXION[clave]}")
+            valor = PERFIL_CONEXION[clave]
+        conn.execute(f"PRAGMA {clave} = {valor}")
+    
+    conn.execute(f"PRAGMA cache_size = {-int(perfil.get('cache_size_kb', 2000))}")
+    conn.execute(f"PRAGMA mmap_size = {int(perfil.get('mmap_size_mb', 0)) * 1024 * 1024}")
+    conn.execute(f"PRAGMA busy_timeout = {int(perfil.get('busy_timeout_ms', 5000))}")
+    conn.execute(f"PRAGMA foreign_keys = {'ON' if perfil.get('foreign_keys') else 'OFF'}")
+    if solo_lectura:
+        conn.execute("PRAGMA query_only = ON")
+
+def a_fecha(valor):
+    """Convierte 'YYYY-MM-DD...', date o datetime en date"""
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return date.fromisoformat(str(valor)[:10])
+
+def rango_fechas(inicio, fin=None):
+    """Límites [inicio, fin + 1 día) como texto ISO para filtros indexables.
+    
+    Las fechas se guardan como texto ('YYYY-MM-DD' o 'YYYY-MM-DD HH:MM:SS'),
+    así que comparar la columna directamente contra estos límites usa los
+    índices, a diferencia de DATE(columna) o strftime(columna).
+    """
+    inicio = a_fecha(inicio)
+    fin = a_fecha(fin) if fin is not None else inicio
+    return inicio.isoformat(), (fin + timedelta(days=1)).isoformat()
+
+def filtro_fechas(columna, desde=None, hasta=None):
+    """WHERE opcional sobre una columna de fecha con los límites de rango_fechas"""
+    condiciones, parametros = [], []
+    if desde is not None:
+        condiciones.append(f"{columna} >= ?")
+        parametros.append(a_fecha(desde).isoformat())
+    if hasta is not None:
+        condiciones.append(f"{columna} < ?")
+        parametros.append(rango_fechas(hasta)[1])
+    return ("WHERE " + " AND ".join(condiciones) if condiciones else ""), parametros
+
+def leer_por_lotes(cursor, tamaño_lote=1000):
+    """Filas de una consulta ya ejecutada, pedidas de a tamaño_lote con fetchmany"""
+    while True:
+        filas = cursor.fetchmany(tamaño_lote)
+        if not filas:
+            break
+        yield from filas
+
+def rango_mes(año, mes):
+    """Límites [primer día del mes, primer día del mes siguiente)"""
+    inicio = date(año, mes, 1)
+    siguiente = date(año + 1, 1, 1) if mes == 12 else date(año, mes + 1, 1)
+    return inicio.isoformat(), siguiente.isoformat()
+
+def meses_entre(desde, hasta):
+    """(mes 'YYYY-MM', inicio, fin) de cada mes de [desde, hasta], recortados a esas fechas"""
+    desde, hasta = a_fecha(desde), a_fecha(hasta)
+    limite = rango_fechas(hasta)[1]
+    meses = []
+    año, mes = desde.year, desde.month
+    while (año, mes) <= (hasta.year, hasta.month):
+        inicio, fin = rango_mes(año, mes)
+        meses.append((inicio[:7], max(inicio, desde.isoformat()), min(fin, limite)))
+        año, mes = (año + 1, 1) if mes == 12 else (año, mes + 1)
+    return meses
+
+class CacheMiembros:
+    """Caché LRU en memoria de nombre y vencimiento por cédula.
+    
+    La usa el control de accesos para validar pasadas repetidas sin leer
+    SQLite. Database la invalida en cada escritura que cambia esos datos.
+    Una lectura que empezó antes de una invalidación no se guarda.
+    """
+    
+    def __init__(self, capacidad=2000):
+        self.capacidad = capacidad
+        self.datos = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.generacion = 0
+        self.lock = threading.Lock()
+    
+    def version(self):
+        """Generación actual; se pasa a guardar() para descartar datos viejos"""
+        with self.lock:
+            return self.generacion
+    
+    def obtener(self, cedula):
+        """Devuelve (nombre_completo, fecha_vencimiento) o None si no está"""
+        with self.lock:
+            valor = self.datos.get(cedula)
+            if valor is None:
+                self.fallos += 1
+                return None
+            self.datos.move_to_end(cedula)
+            self.aciertos += 1
+            return valor
+    
+    def guardar(self, cedula, nombre_completo, fecha_vencimiento, version=None):
+        with self.lock:
+            if version is not None and version != self.generacion:
+                return
+            self.datos[cedula] = (nombre_completo, fecha_vencimiento)
+            self.datos.move_to_end(cedula)
+            if len(self.datos) > self.capacidad:
+                self.datos.popitem(last=False)
+    
+    def invalidar(self, cedula):
+        with self.lock:
+            self.generacion += 1
+            self.datos.pop(cedula, None)
+    
+    def limpiar(self):
+        with self.lock:
+            self.generacion += 1
+            self.datos.clear()
+    
+    def estadisticas(self):
+        """Contadores de aciertos y fallos para revisar la tasa en horas pico"""
+        with self.lock:
+            total = self.aciertos + self.fallos
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tamaño': len(self.datos),
+                'tasa_aciertos': (self.aciertos / total * 100) if total > 0 else 0
+            }
+
+class CacheReportes:
+    """Resultados de Database.reporte por (reporte, desde, hasta).
+    
+    Cada reporte declara las tablas de las que sale; Database llama a
+    invalidar(tabla) en cada escritura y se descartan los reportes que la
+    usan. Un cálculo que empezó antes de una invalidación no se guarda.
+    También guarda la instantánea de Database.estadisticas.
+    """
+    
     def __init__(self):
+        self.datos = {}
+        self.versiones = {}
+        self.lock = threading.Lock()
+    
+    def version(self, fuentes):
+        with self.lock:
+            return tuple(self.versiones.get(fuente, 0) for fuente in fuentes)
+    
+    def obtener(self, clave, max_edad=None):
+        """(fuentes, filas) guardadas, o None; con max_edad, None si son más viejas"""
+        with self.lock:
+            guardado = self.datos.get(clave)
+            if guardado is None:
+                return None
+            if max_edad is not None and time.monotonic() - guardado[2] > max_edad:
+                return None
+            return guardado
+    
+    def guardar(self, clave, fuentes, version, filas):
+        with self.lock:
+            if tuple(self.versiones.get(fuente, 0) for fuente in fuentes) == version:
+                self.datos[clave] = (fuentes, filas, time.monotonic())
+    
+    def invalidar(self, *tablas):
+        with self.lock:
+            for tabla in tablas:
+                self.versiones[tabla] = self.versiones.get(tabla, 0) + 1
+            self.datos = {clave: valor for clave, valor in self.datos.items()
+                          if not set(valor[0]) & set(tablas)}
+    
+    def limpiar(self):
+        self.invalidar(*{fuente for fuentes in FUENTES_REPORTES.values() for fuente in fuentes})
+
+def es_transitorio(error):
+    """BUSY/LOCKED: otra conexión tiene la base; vale la pena reintentar"""
+    codigo = getattr(error, 'sqlite_errorcode', None)
+    if codigo is not None:
+        return codigo & 0xff in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    return 'locked' in str(error) or 'busy' in str(error)
+
+class EscritorAccesos:
+    """Agrupa los INSERT de accesos y los confirma en una sola transacción.
+    
+    Un hilo propio escribe la cola con executemany por la conexión de
+    escritura de Database cuando llega a max_eventos o cuando pasan
+    `intervalo` segundos desde el primer evento pendiente. cerrar() escribe
+    lo que quede antes de salir.
+    
+    Si la base está ocupada el lote se reintenta con esperas crecientes (hasta
+    ESPERA_MAXIMA); si un evento viola una restricción (una cédula borrada
+    después de validarla) se descarta solo ese y se escribe el resto.
+    """
+    
+    ESPERA_MAXIMA = 5.0
+    INSERTAR = "INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora) VALUES (?, ?, ?)"
+    
+    def __init__(self, db, max_eventos=50, intervalo=0.25):
+        self.db = db
+        self.max_eventos = max_eventos
+        self.intervalo = intervalo
+        self.pendientes = []
+        self.activo = True
+        self.vaciar_ya = False
+        self.escribiendo = False
+        self.total_escritos = 0
+        self.total_descartados = 0
+        self.espera_reintento = 0
+        self.condicion = threading.Condition()
+        self.hilo = threading.Thread(target=self.ejecutar, name="EscritorAccesos", daemon=True)
+        self.hilo.start()
+    
+    def encolar(self, cedula_cliente, tipo_movimiento, fecha_hora):
+        with self.condicion:
+            if not self.activo:
+                raise RuntimeError("El escritor de accesos está cerrado")
+            self.pendientes.append((cedula_cliente, tipo_movimiento, fecha_hora))
+            # Despertar al hilo para iniciar el temporizador o escribir el lote lleno
+            if len(self.pendientes) == 1 or len(self.pendientes) >= self.max_eventos:
+                self.condicion.notify_all()
+    
+    def ejecutar(self):
+        while True:
+            with self.condicion:
+                while self.activo and not self.vaciar_ya and not self.pendientes:
+                    self.condicion.wait()
+                if self.activo and not self.vaciar_ya and len(self.pendientes) < self.max_eventos:
+                    self.condicion.wait(self.intervalo)
+                lote, self.pendientes = self.pendientes, []
+                self.vaciar_ya = False
+                self.escribiendo = bool(lote)
+                activo = self.activo
+            
+            if lote:
+                self.escribir_lote(lote)
+            
+            with self.condicion:
+                self.escribiendo = False
+                self.condicion.notify_all()
+                if not activo and not self.pendientes:
+                    break
+                if self.espera_reintento:
+                    # Base ocupada: esperar antes de volver a intentar (cerrar() no espera)
+                    self.condicion.wait_for(lambda: not self.activo, self.espera_reintento)
+    
+    def escribir_lote(self, lote):
+        conn = self.db.conn
+        try:
+            with self.db.lock_escritura:
+                try:
+                    conn.executemany(self.INSERTAR, lote)
+                    escritos = len(lote)
+                except sqlite3.IntegrityError:
+                    # Deshacer lo que alcanzó a entrar y escribir de a uno, salteando los inválidos
+                    conn.rollback()
+                    escritos = self.escribir_de_a_uno(conn, lote)
+                conn.commit()
+            self.db.cache_reportes.invalidar('accesos')
+            self.total_escritos += escritos
+            self.espera_reintento = 0
+        except sqlite3.Error as e:
+            with self.db.lock_escritura:
+                conn.rollback()
+            with self.condicion:
+                if self.activo and es_transitorio(e):
+                    # Reintentar sin perder el orden, cada vez esperando más
+                    self.pendientes[:0] = lote
+                    self.espera_reintento = min(max(self.espera_reintento * 2, self.intervalo),
+                                                self.ESPERA_MAXIMA)
+                    print(f"Base ocupada escribiendo {len(lote)} accesos, reintento en "
+                          f"{self.espera_reintento:.2f} s: {e}")
+                    return
+            self.total_descartados += len(lote)
+            self.espera_reintento = 0
+            print(f"Error escribiendo lote de {len(lote)} accesos, se descarta: {e}")
+    
+    def escribir_de_a_uno(self, conn, lote):
+        escritos = 0
+        for evento in lote:
+            try:
+                conn.execute(self.INSERTAR, evento)
+                escritos += 1
+            except sqlite3.IntegrityError as e:
+                self.total_descartados += 1
+                print(f"Acceso descartado {evento}: {e}")
+        return escritos
+    
+    def esperar_vaciado(self, timeout=5):
+        """Fuerza la escritura de lo pendiente y espera a que termine"""
+        with self.condicion:
+            self.vaciar_ya = True
+            self.condicion.notify_all()
+            return self.condicion.wait_for(
+                lambda: not self.pendientes and not self.escribiendo, timeout)
+    
+    def cerrar(self, timeout=10):
+        with self.condicion:
+            self.activo = False
+            self.condicion.notify_all()
+        self.hilo.join(timeout)
+
+class Database:
+    def __init__(self, ruta_db='data/gimnasio.db', perfil=None):
+        self.ruta_db = ruta_db
+        self.perfil = perfil or cargar_perfil_conexion()
         try:
-            os.makedirs('data', exist_ok=True)
+            os.makedirs(os.path.dirname(ruta_db) or '.', exist_ok=True)
         except OSError as e:
             print(f"Error creating directory: {e}")
         
-        self.conn = sqlite3.connect('data/gimnasio.db', check_same_thread=False)
+        # Una sola conexión de escritura, serializada con lock_escritura; las
+        # lecturas usan una conexión de solo lectura por hilo (ver lectura())
+        self.conn = sqlite3.connect(ruta_db, check_same_thread=False)
+        aplicar_perfil_conexion(self.conn, self.perfil)
+        self.lock_escritura = threading.RLock()
+        self.locales = threading.local()
+        self.conexiones_lectura = []
+        self.lock_lecturas = threading.Lock()
+        self.cache_miembros = CacheMiembros()
+        self.cache_reportes = CacheReportes()
+        self.escritor_accesos = None
         self.create_tables()
         self.actualizar_registros_existentes()
+        self.aplicar_migraciones()
+        # Cambia cuando otra conexión (otra instancia del programa) escribe en el archivo
+        self.data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    def iniciar_escritor_accesos(self, max_eventos=50, intervalo=0.25):
+        """Activa la escritura agrupada de accesos (ver EscritorAccesos)"""
+        if self.escritor_accesos is None:
+            self.escritor_accesos = EscritorAccesos(self, max_eventos, intervalo)
+        return self.escritor_accesos
+    
+    def lectura(self):
+        """Conexión de solo lectura del hilo actual; se abre en el primer uso"""
+        conn = getattr(self.locales, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.ruta_db, check_same_thread=False)
+            aplicar_perfil_conexion(conn, self.perfil, solo_lectura=True)
+            self.locales.conn = conn
+            with self.lock_lecturas:
+                self.conexiones_lectura.append(conn)
+        return conn
+    
+    def cerrar(self):
+        """Escribe los accesos pendientes y cierra todas las conexiones"""
+        if self.escritor_accesos is not None:
+            self.escritor_accesos.cerrar()
+            self.escritor_accesos = None
+        with self.lock_lecturas:
+            for conn in self.conexiones_lectura:
+                conn.close()
+            self.conexiones_lectura.clear()
+        self.conn.close()
     
     def create_tables(self):
         cursor = self.conn.cursor()
@@ -79,6 +681,35 @@ class Database:
         except Exception as e:
             print(f"Error al agregar columna activo: {e}")
     
+    def aplicar_migraciones(self):
+        """Aplica las migraciones pendientes según PRAGMA user_version"""
+        cursor = self.conn.cursor()
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        
+        for numero, sentencias in enumerate(MIGRACIONES[version:], start=version + 1):
+            try:
+                # BEGIN explícito: sqlite3 no abre transacción para DDL
+                cursor.execute("BEGIN")
+                for sql in sentencias:
+                    cursor.execute(sql)
+                # PRAGMA no admite parámetros; numero siempre es un entero
+                cursor.execute(f"PRAGMA user_version = {numero}")
+                self.conn.commit()
+                print(f"Migración {numero} aplicada")
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                print(f"Error aplicando migración {numero}: {e}")
+                break
+        
+        if version < len(MIGRACIONES):
+            # Refrescar estadísticas para que el planificador use los índices nuevos
+            cursor.execute("ANALYZE")
+            self.conn.commit()
+        
+        # Sin FTS5 compilado en SQLite la búsqueda vuelve a LIKE
+        self.busqueda_fts = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'clientes_fts'").fetchone() is not None
+    
     def actualizar_registros_existentes(self):
         """Actualiza los registros existentes"""
         try:
@@ -92,82 +723,199 @@ class Database:
     
     def insert_cliente(self, cedula, nombre, apellido, telefono="", telefono_emergencia="", direccion="", foto_path=""):
         """Inserta un nuevo cliente (MÉTODO AÑADIDO)"""
-        try:
-            cursor = self.conn.cursor()
-            fecha_registro = datetime.now().date()
-            cursor.execute('''
-                INSERT INTO clientes 
-                (cedula, nombre, apellido, telefono, telefono_emergencia, direccion, foto_path, fecha_registro)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (cedula, nombre, apellido, telefono, telefono_emergencia, direccion, foto_path, fecha_registro))
-            self.conn.commit()
-            print(f"Cliente {nombre} {apellido} insertado correctamente.")
-            return True
-        except sqlite3.IntegrityError:
-            print(f"Error: Cliente con cédula {cedula} ya existe.")
-            return False
-        except Exception as e:
-            print(f"Error insertando cliente: {e}")
-            return False
+        with self.lock_escritura:
+            try:
+                cursor = self.conn.cursor()
+                fecha_registro = datetime.now().date()
+                cursor.execute('''
+                    INSERT INTO clientes 
+                    (cedula, nombre, apellido, telefono, telefono_emergencia, direccion, foto_path, fecha_registro)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (cedula, nombre, apellido, telefono, telefono_emergencia, direccion, foto_path, fecha_registro))
+                self.conn.commit()
+                self.cache_reportes.invalidar('clientes')
+                print(f"Cliente {nombre} {apellido} insertado correctamente.")
+                return True
+            except sqlite3.IntegrityError:
+                self.conn.rollback()
+                print(f"Error: Cliente con cédula {cedula} ya existe.")
+                return False
+            except Exception as e:
+                print(f"Error insertando cliente: {e}")
+                return False
             
     def get_cliente_by_cedula(self, cedula):
         """Obtiene un cliente por su cédula (MÉTODO AÑADIDO)"""
         try:
-            cursor = self.conn.cursor()
+            cursor = self.lectura().cursor()
             cursor.execute('SELECT * FROM clientes WHERE cedula = ?', (cedula,))
             return cursor.fetchone()
         except Exception as e:
             print(f"Error obteniendo cliente: {e}")
             return None
 
+    def cedulas_existentes(self):
+        """Conjunto con todas las cédulas registradas (para validar cargas masivas)"""
+        cursor = self.lectura().execute('SELECT cedula FROM clientes')
+        return {fila[0] for fila in cursor}
+
+    def cedulas_registradas(self, cedulas, tamaño_lote=500):
+        """Cuáles de las cédulas dadas ya están registradas (consultas por lotes)"""
+        return {fila[0] for fila in self.clientes_por_cedula(cedulas, tamaño_lote)}
+
+    def clientes_por_cedula(self, cedulas, tamaño_lote=500):
+        """(cedula, nombre, apellido, telefono, telefono_emergencia, direccion) de las cédulas dadas"""
+        cedulas = list(cedulas)
+        filas = []
+        cursor = self.lectura().cursor()
+        for inicio in range(0, len(cedulas), tamaño_lote):
+            lote = cedulas[inicio:inicio + tamaño_lote]
+            cursor.execute(f'''
+                SELECT cedula, nombre, apellido, telefono, telefono_emergencia, direccion
+                FROM clientes WHERE cedula IN ({', '.join('?' * len(lote))})
+            ''', lote)
+            filas.extend(cursor.fetchall())
+        return filas
+
+    def insertar_clientes_lote(self, filas):
+        """Inserta (cedula, nombre, apellido, telefono, telefono_emergencia, direccion)
+        en una sola transacción; devuelve cuántas se insertaron.
+
+        Las cédulas que ya existan se ignoran en vez de abortar el lote.
+        """
+        fecha_registro = datetime.now().date().isoformat()
+        escritas, insertados = self.escribir_lote_clientes('''
+            INSERT OR IGNORE INTO clientes
+            (cedula, nombre, apellido, telefono, telefono_emergencia, direccion, foto_path, fecha_registro)
+            VALUES (?, ?, ?, ?, ?, ?, '', ?)
+        ''', (tuple(fila) + (fecha_registro,) for fila in filas))
+        return insertados
+
+    def upsert_clientes_lote(self, filas, campos):
+        """Inserta o actualiza por cédula filas (cedula, *campos) en una transacción.
+
+        campos son las columnas que trae el archivo (las demás no se tocan).
+        Las filas existentes sin ningún campo distinto no se escriben.
+        Devuelve (insertados, actualizados).
+        """
+        campos = list(campos)
+        invalidos = set(campos) - CAMPOS_ACTUALIZABLES
+        if invalidos or not {'nombre', 'apellido'} <= set(campos):
+            raise ValueError(f"Campos inválidos para actualizar clientes: {campos}")
+        fecha_registro = datetime.now().date().isoformat()
+        escritas, insertados = self.escribir_lote_clientes(f'''
+            INSERT INTO clientes (cedula, {', '.join(campos)}, foto_path, fecha_registro)
+            VALUES (?, {', '.join('?' * len(campos))}, '', ?)
+            ON CONFLICT(cedula) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in campos)}
+            WHERE {' OR '.join(f"IFNULL(clientes.{c}, '') IS NOT excluded.{c}" for c in campos)}
+        ''', (tuple(fila) + (fecha_registro,) for fila in filas))
+        return insertados, escritas - insertados
+
+    def escribir_lote_clientes(self, sql, parametros):
+        """executemany sobre clientes en una transacción; devuelve (filas escritas, filas nuevas)"""
+        with self.lock_escritura:
+            try:
+                cursor = self.conn.cursor()
+                # BEGIN explícito: el DROP/CREATE TRIGGER también queda en la transacción
+                cursor.execute('BEGIN')
+                ultimo = cursor.execute('SELECT IFNULL(MAX(rowid), 0) FROM clientes').fetchone()[0]
+                if self.busqueda_fts:
+                    # Indexar el lote completo al final es mucho más rápido que fila por fila
+                    cursor.execute('DROP TRIGGER IF EXISTS clientes_fts_insert')
+                cursor.executemany(sql, parametros)
+                escritas = cursor.rowcount
+                # Las filas nuevas reciben rowid mayores al último existente
+                nuevas = cursor.execute('SELECT COUNT(*) FROM clientes WHERE rowid > ?', (ultimo,)).fetchone()[0]
+                if self.busqueda_fts:
+                    cursor.execute('''
+                        INSERT INTO clientes_fts (rowid, cedula, nombre, apellido, telefono)
+                        SELECT rowid, cedula, nombre, apellido, telefono FROM clientes WHERE rowid > ?
+                    ''', (ultimo,))
+                    cursor.execute(TRIGGER_FTS_INSERT)
+                self.conn.commit()
+                self.cache_reportes.invalidar('clientes')
+                if escritas > nuevas:
+                    # Se reescribieron nombres de clientes existentes: no se sabe cuáles
+                    self.cache_miembros.limpiar()
+                return escritas, nuevas
+            except sqlite3.Error:
+                self.conn.rollback()
+                raise
+
     def actualizar_cliente(self, cedula, nombre, apellido, telefono, telefono_emergencia, direccion, foto_path):
         """Actualiza la información de un cliente"""
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                UPDATE clientes 
-                SET nombre = ?, apellido = ?, telefono = ?, telefono_emergencia = ?, 
-                    direccion = ?, foto_path = ?
-                WHERE cedula = ?
-            ''', (nombre, apellido, telefono, telefono_emergencia, direccion, foto_path, cedula))
+        with self.lock_escritura:
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute('''
+                    UPDATE clientes 
+                    SET nombre = ?, apellido = ?, telefono = ?, telefono_emergencia = ?, 
+                        direccion = ?, foto_path = ?
+                    WHERE cedula = ?
+                ''', (nombre, apellido, telefono, telefono_emergencia, direccion, foto_path, cedula))
             
-            self.conn.commit()
-            return cursor.rowcount > 0
-        except Exception as e:
-            print(f"Error actualizando cliente: {e}")
-            return False
+                self.conn.commit()
+                self.cache_miembros.invalidar(cedula)
+                self.cache_reportes.invalidar('clientes')
+                return cursor.rowcount > 0
+            except Exception as e:
+                self.conn.rollback()
+                print(f"Error actualizando cliente: {e}")
+                return False
 
     def buscar_clientes(self, criterios, estado="Todos"):
-        """Busca clientes con información de estado de pago (VERSIÓN CORREGIDA)"""
+        """Busca clientes con información de estado de pago (VERSIÓN CORREGIDA)
+        
+        criterios admite 'cedula', 'nombre', 'apellido', 'telefono' y 'texto'
+        (cualquiera de los cuatro). Con FTS5 cada palabra se busca como prefijo
+        y sin distinguir tildes; sin FTS5 se usa LIKE '%...%'.
+        """
         try:
-            cursor = self.conn.cursor()
+            cursor = self.lectura().cursor()
+            
+            hoy = datetime.now().date().isoformat()
+            consultas = []
+            if self.busqueda_fts:
+                for field in ['texto', 'cedula', 'nombre', 'apellido', 'telefono']:
+                    consulta = consulta_fts(criterios.get(field) or '', None if field == 'texto' else field)
+                    if consulta:
+                        consultas.append(consulta)
             
             query = """
                 SELECT c.*, 
-                       p.fecha_vencimiento as fecha_vencimiento,
+                       e.fecha_vencimiento as fecha_vencimiento,
                        CASE 
-                           WHEN p.fecha_vencimiento >= date('now') THEN 'Activo'
-                           WHEN p.fecha_vencimiento < date('now') THEN 'Vencido'
+                           WHEN e.fecha_vencimiento >= ? THEN 'Activo'
+                           WHEN e.fecha_vencimiento < ? THEN 'Vencido'
                            ELSE 'Sin pago'
                        END as estado_pago
                 FROM clientes c
-                LEFT JOIN pagos p ON c.cedula = p.cedula_cliente AND p.activo = 1
+                LEFT JOIN estado_membresia e ON e.cedula_cliente = c.cedula
                 WHERE 1=1
             """
-            params = []
+            params = [hoy, hoy]
             
             # Agregar criterios de búsqueda
-            for field in ['cedula', 'nombre', 'apellido', 'telefono']:
-                if criterios.get(field):
-                    query += f" AND c.{field} LIKE ?"
-                    params.append(f"%{criterios[field]}%")
+            if consultas:
+                query += " AND c.rowid IN (SELECT rowid FROM clientes_fts WHERE clientes_fts MATCH ?)"
+                params.append(" AND ".join(consultas))
+            elif not self.busqueda_fts:
+                for field in ['cedula', 'nombre', 'apellido', 'telefono']:
+                    if criterios.get(field):
+                        query += f" AND c.{field} LIKE ?"
+                        params.append(f"%{criterios[field]}%")
+                if criterios.get('texto'):
+                    query += " AND (c.cedula LIKE ? OR c.nombre LIKE ? OR c.apellido LIKE ? OR c.telefono LIKE ?)"
+                    params.extend([f"%{criterios['texto']}%"] * 4)
             
             # Filtro por estado (LÓGICA CORREGIDA)
             if estado == "Activos":
-                query += " AND p.fecha_vencimiento >= date('now')"
+                query += " AND e.fecha_vencimiento >= ?"
+                params.append(hoy)
             elif estado == "Vencidos":
                 # Vencidos O que nunca han tenido un pago activo
-                query += " AND (p.fecha_vencimiento < date('now') OR p.id IS NULL)"
+                query += " AND (e.fecha_vencimiento < ? OR e.cedula_cliente IS NULL)"
+                params.append(hoy)
             
             query += " ORDER BY c.nombre, c.apellido"
             
@@ -180,7 +928,7 @@ class Database:
             
     def get_historial_completo_cliente(self, cedula):
         """Obtiene el historial completo de un cliente"""
-        cursor = self.conn.cursor()
+        cursor = self.lectura().cursor()
         
         # Información del cliente
         cliente = self.get_cliente_by_cedula(cedula)
@@ -206,36 +954,68 @@ class Database:
     # --- MÉTODOS DE PAGOS ---
 
     def insert_pago(self, cedula_cliente, monto, duracion_meses, metodo_pago):
-        try:
-            cursor = self.conn.cursor()
+        with self.lock_escritura:
+            try:
+                cursor = self.conn.cursor()
             
-            fecha_pago = datetime.now().date()
-            fecha_vencimiento = fecha_pago + timedelta(days=30 * duracion_meses)
+                fecha_pago = datetime.now().date()
+                fecha_vencimiento = fecha_pago + timedelta(days=30 * duracion_meses)
             
-            # Desactivar pagos anteriores
-            cursor.execute('UPDATE pagos SET activo = 0 WHERE cedula_cliente = ?', (cedula_cliente,))
+                # Desactivar pagos anteriores
+                cursor.execute('UPDATE pagos SET activo = 0 WHERE cedula_cliente = ?', (cedula_cliente,))
             
-            # Insertar nuevo pago
-            cursor.execute('''
-                INSERT INTO pagos 
-                (cedula_cliente, monto, duracion_meses, fecha_pago, fecha_vencimiento, metodo_pago, activo)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (cedula_cliente, monto, duracion_meses, fecha_pago, fecha_vencimiento, metodo_pago, 1))
+                # Insertar nuevo pago
+                cursor.execute('''
+                    INSERT INTO pagos 
+                    (cedula_cliente, monto, duracion_meses, fecha_pago, fecha_vencimiento, metodo_pago, activo)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (cedula_cliente, monto, duracion_meses, fecha_pago, fecha_vencimiento, metodo_pago, 1))
             
-            self.conn.commit()
-            print(f"Pago insertado para {cedula_cliente}.")
-            return True
-        except Exception as e:
-            print(f"Error insertando pago: {e}")
-            return False
+                # Estado materializado, en la misma transacción que el pago
+                cursor.execute('''
+                    INSERT INTO estado_membresia (cedula_cliente, fecha_vencimiento, id_pago)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (cedula_cliente) DO UPDATE SET
+                        fecha_vencimiento = excluded.fecha_vencimiento,
+                        id_pago = excluded.id_pago
+                ''', (cedula_cliente, fecha_vencimiento, cursor.lastrowid))
+            
+                self.conn.commit()
+                self.cache_miembros.invalidar(cedula_cliente)
+                self.cache_reportes.invalidar('pagos')
+                print(f"Pago insertado para {cedula_cliente}.")
+                return True
+            except Exception as e:
+                self.conn.rollback()
+                print(f"Error insertando pago: {e}")
+                return False
     
     def get_pagos_by_cliente(self, cedula_cliente):
-        cursor = self.conn.cursor()
+        cursor = self.lectura().cursor()
         cursor.execute('SELECT * FROM pagos WHERE cedula_cliente = ? ORDER BY fecha_pago DESC', (cedula_cliente,))
         return cursor.fetchall()
     
+    def iterar_pagos_con_cliente(self, tamaño_lote=1000, desde=None, hasta=None):
+        """Recorre todos los pagos con el nombre del cliente, del más reciente al más antiguo.
+        
+        Una sola consulta leída por lotes: (id, cedula, nombre, apellido, monto,
+        duracion_meses, fecha_pago, fecha_vencimiento, metodo_pago, activo).
+        Con desde/hasta solo los pagos de esas fechas (inclusive).
+        """
+        filtro, parametros = filtro_fechas('p.fecha_pago', desde, hasta)
+        cursor = self.lectura().cursor()
+        cursor.execute(f'''
+            SELECT p.id, p.cedula_cliente, c.nombre, c.apellido, p.monto, p.duracion_meses,
+                   p.fecha_pago, p.fecha_vencimiento, p.metodo_pago, p.activo
+            FROM pagos p
+            LEFT JOIN clientes c ON c.cedula = p.cedula_cliente
+            {filtro}
+            ORDER BY p.fecha_pago DESC, p.id DESC
+        ''', parametros)
+        yield from leer_por_lotes(cursor, tamaño_lote)
+    
     def get_pago_activo(self, cedula_cliente):
-        cursor = self.conn.cursor()
+        cursor = self.lectura().cursor()
         cursor.execute('SELECT * FROM pagos WHERE cedula_cliente = ? AND activo = 1', (cedula_cliente,))
         return cursor.fetchone()
 
@@ -243,41 +1023,73 @@ class Database:
 
     def registrar_acceso(self, cedula_cliente, tipo_movimiento="Entrada"):
         """Registra entrada o salida de un cliente"""
+        exito, mensaje, _ = self.registrar_acceso_validado(cedula_cliente, tipo_movimiento)
+        return exito, mensaje
+
+    def registrar_acceso_validado(self, cedula_cliente, tipo_movimiento="Entrada"):
+        """Valida la membresía y registra el acceso con una consulta y una escritura.
+        
+        Los datos del cliente se leen de cache_miembros cuando están en caché,
+        así que una pasada repetida solo escribe el acceso. Devuelve (exito, mensaje, datos); datos es None si el cliente no existe o
+        un diccionario con 'nombre_completo' y 'fecha_vencimiento' para la UI.
+        """
         try:
-            cursor = self.conn.cursor()
+            cursor = self.lectura().cursor()
             
-            # Verificar si el cliente existe
-            cliente = self.get_cliente_by_cedula(cedula_cliente)
-            if not cliente:
-                return False, "Cliente no encontrado"
+            # Pagos o cambios hechos desde otra recepción también invalidan la caché
+            self.revisar_escrituras_externas()
+            en_cache = self.cache_miembros.obtener(cedula_cliente)
+            if en_cache:
+                nombre_completo, fecha_vencimiento = en_cache
+            else:
+                version = self.cache_miembros.version()
+                # Cliente y membresía en una sola búsqueda por clave primaria
+                cursor.execute('''
+                    SELECT c.nombre, c.apellido, e.fecha_vencimiento
+                    FROM clientes c
+                    LEFT JOIN estado_membresia e ON e.cedula_cliente = c.cedula
+                    WHERE c.cedula = ?
+                ''', (cedula_cliente,))
+                fila = cursor.fetchone()
+                if not fila:
+                    return False, "Cliente no encontrado", None
+                
+                nombre_completo = f"{fila[0]} {fila[1]}"
+                fecha_vencimiento = fila[2]
+                self.cache_miembros.guardar(cedula_cliente, nombre_completo, fecha_vencimiento, version)
             
-            # Verificar si tiene membresía activa
-            pago_activo = self.get_pago_activo(cedula_cliente)
-            if not pago_activo:
-                return False, "Membresía vencida o sin pago"
+            datos = {
+                'nombre_completo': nombre_completo,
+                'fecha_vencimiento': fecha_vencimiento
+            }
             
-            # Verificar si la membresía no está vencida
-            # pago_activo[5] es 'fecha_vencimiento'
-            fecha_vencimiento = datetime.strptime(pago_activo[5], '%Y-%m-%d').date()
-            if fecha_vencimiento < datetime.now().date():
-                return False, "Membresía vencida"
+            if fecha_vencimiento is None:
+                return False, "Membresía vencida o sin pago", datos
             
-            # Registrar acceso
-            cursor.execute('''
-                INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora)
-                VALUES (?, ?, ?)
-            ''', (cedula_cliente, tipo_movimiento, datetime.now()))
+            # Fechas ISO: la comparación de texto equivale a la de fechas
+            ahora = datetime.now()
+            if fecha_vencimiento < ahora.date().isoformat():
+                return False, "Membresía vencida", datos
             
-            self.conn.commit()
-            return True, f"Acceso {tipo_movimiento.lower()} registrado correctamente"
+            if self.escritor_accesos is not None:
+                self.escritor_accesos.encolar(cedula_cliente, tipo_movimiento, ahora)
+            else:
+                with self.lock_escritura:
+                    self.conn.execute('''
+                        INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora)
+                        VALUES (?, ?, ?)
+                    ''', (cedula_cliente, tipo_movimiento, ahora))
+                    self.conn.commit()
+                self.cache_reportes.invalidar('accesos')
+            return True, f"Acceso {tipo_movimiento.lower()} registrado correctamente", datos
             
         except Exception as e:
             print(f"Error registrando acceso: {e}")
-            return False, "Error al registrar acceso"
+            return False, "Error al registrar acceso", None
 
     def get_accesos_recientes(self, limite=50):
         """Obtiene los accesos más recientes"""
-        cursor = self.conn.cursor()
+        cursor = self.lectura().cursor()
         cursor.execute('''
             SELECT a.*, c.nombre, c.apellido 
             FROM accesos a
@@ -290,73 +1102,110 @@ class Database:
     # --- MÉTODOS DE ESTADÍSTICAS Y ADMIN ---
 
     def get_estadisticas_completas(self):
-        """Obtiene estadísticas completas del gimnasio"""
-        cursor = self.conn.cursor()
+        """Obtiene estadísticas completas del gimnasio, en una sola consulta"""
+        cursor = self.lectura().cursor()
+        hoy = datetime.now().date()
+        mes_anterior = hoy.replace(day=1) - timedelta(days=1)
         
-        # Total de clientes
-        cursor.execute('SELECT COUNT(*) FROM clientes')
-        total_clientes = cursor.fetchone()[0]
-        
-        # Clientes activos
+        # Conteos por índice y sumas sobre los resúmenes diarios (a lo sumo 31 días por método)
         cursor.execute('''
-            SELECT COUNT(DISTINCT cedula_cliente) 
-            FROM pagos 
-            WHERE activo = 1 AND fecha_vencimiento >= date('now')
-        ''')
-        clientes_activos = cursor.fetchone()[0]
+            SELECT
+                (SELECT COUNT(*) FROM clientes),
+                (SELECT COUNT(*) FROM estado_membresia WHERE fecha_vencimiento >= ?),
+                (SELECT SUM(total) FROM resumen_ingresos_dia WHERE dia >= ? AND dia < ?),
+                (SELECT SUM(total) FROM resumen_ingresos_dia WHERE dia >= ? AND dia < ?),
+                (SELECT SUM(cantidad) FROM resumen_accesos_hora
+                 WHERE dia >= ? AND dia < ? AND tipo_movimiento = 'Entrada')
+        ''', (hoy.isoformat(), *rango_mes(hoy.year, hoy.month),
+              *rango_mes(mes_anterior.year, mes_anterior.month), *rango_fechas(hoy)))
+        total_clientes, clientes_activos, ingresos_mes_actual, ingresos_mes_anterior, accesos_hoy = cursor.fetchone()
         
         # Clientes vencidos
         clientes_vencidos = total_clientes - clientes_activos
         
-        # Ingresos del mes actual
-        cursor.execute('''
-            SELECT SUM(monto) 
-            FROM pagos 
-            WHERE strftime('%Y-%m', fecha_pago) = strftime('%Y-%m', 'now')
-        ''')
-        ingresos_mes_actual = cursor.fetchone()[0] or 0
-        
-        # Ingresos del mes anterior
-        cursor.execute('''
-            SELECT SUM(monto) 
-            FROM pagos 
-            WHERE strftime('%Y-%m', fecha_pago) = strftime('%Y-%m', date('now', '-1 month'))
-        ''')
-        ingresos_mes_anterior = cursor.fetchone()[0] or 0
-        
-        # Accesos hoy
-        cursor.execute('''
-            SELECT COUNT(*) 
-            FROM accesos 
-            WHERE DATE(fecha_hora) = DATE('now') AND tipo_movimiento = 'Entrada'
-        ''')
-        accesos_hoy = cursor.fetchone()[0]
-        
         return {
             'total_clientes': total_clientes,
             'clientes_activos': clientes_activos,
             'clientes_vencidos': clientes_vencidos,
-            'ingresos_mes_actual': ingresos_mes_actual,
-            'ingresos_mes_anterior': ingresos_mes_anterior,
-            'accesos_hoy': accesos_hoy,
+            'ingresos_mes_actual': ingresos_mes_actual or 0,
+            'ingresos_mes_anterior': ingresos_mes_anterior or 0,
+            'accesos_hoy': accesos_hoy or 0,
             'tasa_retencion': (clientes_activos / total_clientes * 100) if total_clientes > 0 else 0
         }
 
+    def estadisticas(self, max_edad=ESTADISTICAS_MAX_EDAD):
+        """Instantánea de get_estadisticas_completas compartida por todo el dashboard.
+        
+        Se recalcula si alguna escritura la invalidó o si tiene más de
+        max_edad segundos (el día cambia y otra instancia puede escribir).
+        """
+        clave = ('estadisticas',)
+        guardado = self.cache_reportes.obtener(clave, max_edad)
+        if guardado is not None:
+            return guardado[1]
+        version = self.cache_reportes.version(FUENTES_ESTADISTICAS)
+        estadisticas = self.get_estadisticas_completas()
+        self.cache_reportes.guardar(clave, FUENTES_ESTADISTICAS, version, estadisticas)
+        return estadisticas
+
+    def cambios(self, vistas=None):
+        """Versiones actuales de TABLAS_VIGILADAS y las tablas que cambiaron desde `vistas`.
+        
+        Cada escritura de esta instancia sube la versión de su tabla (ver
+        CacheReportes.invalidar). Si otra conexión escribió en el archivo no
+        se sabe qué tocó: se descartan las cachés y cambian todas.
+        """
+        self.revisar_escrituras_externas()
+        versiones = dict(zip(TABLAS_VIGILADAS, self.cache_reportes.version(TABLAS_VIGILADAS)))
+        vistas = vistas or {}
+        return versiones, {tabla for tabla, version in versiones.items() if vistas.get(tabla) != version}
+    
+    def revisar_escrituras_externas(self):
+        # Sin esperar a la escritura en curso: se revisa en la próxima llamada
+        if not self.lock_escritura.acquire(blocking=False):
+            return
+        try:
+            data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self.data_version:
+                self.data_version = data_version
+                self.cache_miembros.limpiar()
+                self.cache_reportes.limpiar()
+        finally:
+            self.lock_escritura.release()
+
     def get_clientes_proximos_vencer(self, dias=7):
         """Obtiene clientes cuya membresía está por vencer"""
-        cursor = self.conn.cursor()
+        cursor = self.lectura().cursor()
+        hoy = datetime.now().date()
         cursor.execute('''
-            SELECT c.cedula, c.nombre, c.apellido, p.fecha_vencimiento,
-                   JULIANDAY(p.fecha_vencimiento) - JULIANDAY('now') as dias_restantes
-            FROM clientes c
-            JOIN pagos p ON c.cedula = p.cedula_cliente
-            WHERE p.activo = 1 
-              AND p.fecha_vencimiento >= date('now')
-              AND p.fecha_vencimiento <= date('now', ?)
-            ORDER BY p.fecha_vencimiento ASC
-        ''', (f'+{dias} days',))
+            SELECT c.cedula, c.nombre, c.apellido, e.fecha_vencimiento,
+                   JULIANDAY(e.fecha_vencimiento) - JULIANDAY('now') as dias_restantes
+            FROM estado_membresia e
+            JOIN clientes c ON c.cedula = e.cedula_cliente
+            WHERE e.fecha_vencimiento >= ?
+              AND e.fecha_vencimiento <= ?
+            ORDER BY e.fecha_vencimiento ASC
+        ''', (hoy.isoformat(), (hoy + timedelta(days=dias)).isoformat()))
         return cursor.fetchall()
 
+    def reconstruir_resumenes(self):
+        """Recalcula los resúmenes diarios desde pagos y accesos.
+        
+        Los triggers los mantienen al día; esto repara los datos si se
+        escribieron con los triggers deshabilitados o desde otra herramienta.
+        """
+        with self.lock_escritura:
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute("BEGIN")
+                for sql in RECONSTRUIR_RESUMENES:
+                    cursor.execute(sql)
+                self.conn.commit()
+                self.cache_reportes.limpiar()
+            except sqlite3.Error:
+                self.conn.rollback()
+                raise
+
     def crear_backup(self, ruta_backup=None):
         """Crea un backup de la base de datos"""
         try:
@@ -366,61 +1215,90 @@ class Database:
                 fecha = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
                 ruta_backup = f'backups/backup_gimnasio_{fecha}.db'
             
-            # Copiar archivo de base de datos
-            shutil.copy2('data/gimnasio.db', ruta_backup)
+            # API de backup de SQLite: incluye lo que aún está en el archivo -wal
+            destino = sqlite3.connect(ruta_backup)
+            try:
+                with self.lock_escritura:
+                    self.conn.backup(destino)
+            finally:
+                destino.close()
             print(f"Backup creado exitosamente: {ruta_backup}")
             return True
         except Exception as e:
             print(f"Error creando backup: {e}")
             return False
+    
+    def restaurar_backup(self, ruta_backup):
+        """Reemplaza el contenido de la base de datos con el de un backup"""
+        try:
+            if self.escritor_accesos is not None:
+                self.escritor_accesos.esperar_vaciado()
+            origen = sqlite3.connect(ruta_backup)
+            try:
+                with self.lock_escritura:
+                    origen.backup(self.conn)
+            finally:
+                origen.close()
+            self.cache_miembros.limpiar()
+            self.cache_reportes.limpiar()
+            self.aplicar_migraciones()
+            print(f"Backup restaurado: {ruta_backup}")
+            return True
+        except Exception as e:
+            print(f"Error restaurando backup: {e}")
+            return False
         
         # --- MÉTODOS ADICIONALES DE ACCESOS ---
 
+    def iterar_accesos_con_cliente(self, tamaño_lote=1000, desde=None, hasta=None):
+        """Recorre los accesos con el nombre del cliente, en orden cronológico.
+        
+        Igual que iterar_pagos_con_cliente: una consulta leída por lotes, para
+        exportar millones de filas sin tenerlas en memoria. Filas (id, cedula,
+        nombre, apellido, tipo_movimiento, fecha_hora).
+        """
+        filtro, parametros = filtro_fechas('a.fecha_hora', desde, hasta)
+        cursor = self.lectura().cursor()
+        cursor.execute(f'''
+            SELECT a.id, a.cedula_cliente, c.nombre, c.apellido, a.tipo_movimiento, a.fecha_hora
+            FROM accesos a
+            LEFT JOIN clientes c ON c.cedula = a.cedula_cliente
+            {filtro}
+            ORDER BY a.fecha_hora, a.id
+        ''', parametros)
+        yield from leer_por_lotes(cursor, tamaño_lote)
+
     def get_accesos_por_fecha(self, fecha_inicio, fecha_fin=None):
         """Obtiene accesos en un rango de fechas"""
-        cursor = self.conn.cursor()
+        cursor = self.lectura().cursor()
         
-        if fecha_fin is None:
-            fecha_fin = fecha_inicio
-            
         cursor.execute('''
             SELECT a.*, c.nombre, c.apellido 
             FROM accesos a
             JOIN clientes c ON a.cedula_cliente = c.cedula
-            WHERE DATE(a.fecha_hora) BETWEEN ? AND ?
+            WHERE a.fecha_hora >= ? AND a.fecha_hora < ?
             ORDER BY a.fecha_hora DESC
-        ''', (fecha_inicio, fecha_fin))
+        ''', rango_fechas(fecha_inicio, fecha_fin))
         return cursor.fetchall()
 
     def get_estadisticas_accesos(self):
         """Estadísticas de accesos"""
-        cursor = self.conn.cursor()
+        cursor = self.lectura().cursor()
+        hoy = datetime.now().date()
+        # Domingo anterior (equivale a date('now', 'weekday 0', '-7 days'))
+        inicio_semana = hoy + timedelta(days=(6 - hoy.weekday()) % 7 - 7)
         
-        # Accesos hoy
-        cursor.execute('''
-            SELECT COUNT(*) 
-            FROM accesos 
-            WHERE DATE(fecha_hora) = DATE('now') 
-            AND tipo_movimiento = 'Entrada'
-        ''')
-        accesos_hoy = cursor.fetchone()[0]
+        # Accesos hoy y esta semana
+        accesos_hoy = self.contar_entradas(hoy)
+        accesos_semana = self.contar_entradas(inicio_semana, hoy)
         
-        # Accesos esta semana
+        # Hora pico de accesos: 24 filas por día del resumen, no todo el historial
         cursor.execute('''
-            SELECT COUNT(*) 
-            FROM accesos 
-            WHERE fecha_hora >= date('now', 'weekday 0', '-7 days')
-            AND tipo_movimiento = 'Entrada'
-        ''')
-        accesos_semana = cursor.fetchone()[0]
-        
-        # Hora pico de accesos
-        cursor.execute('''
-            SELECT strftime('%H', fecha_hora) as hora, COUNT(*) as cantidad
-            FROM accesos
+            SELECT printf('%02d', hora) as hora, SUM(cantidad) as total
+            FROM resumen_accesos_hora
             WHERE tipo_movimiento = 'Entrada'
             GROUP BY hora
-            ORDER BY cantidad DESC
+            ORDER BY total DESC
             LIMIT 1
         ''')
         hora_pico = cursor.fetchone()
@@ -431,9 +1309,19 @@ class Database:
             'hora_pico': hora_pico[0] if hora_pico else 'N/A'
         }
 
+    def contar_entradas(self, desde, hasta=None):
+        """Entradas registradas entre dos fechas (inclusive), leídas del resumen diario"""
+        cursor = self.lectura().cursor()
+        cursor.execute('''
+            SELECT SUM(cantidad)
+            FROM resumen_accesos_hora
+            WHERE dia >= ? AND dia < ? AND tipo_movimiento = 'Entrada'
+        ''', rango_fechas(desde, hasta))
+        return cursor.fetchone()[0] or 0
+
     def get_ultimo_acceso_cliente(self, cedula_cliente):
         """Obtiene el último acceso de un cliente"""
-        cursor = self.conn.cursor()
+        cursor = self.lectura().cursor()
         cursor.execute('''
             SELECT * FROM accesos 
             WHERE cedula_cliente = ? 
@@ -444,55 +1332,255 @@ class Database:
 
     # --- MÉTODOS ADICIONALES DE CLIENTES ---
 
+    def iterar_clientes(self, tamaño_lote=1000):
+        """Mismas filas y orden que get_all_clientes, leídas por lotes"""
+        cursor = self.lectura().cursor()
+        cursor.execute('SELECT * FROM clientes ORDER BY nombre, apellido, cedula')
+        yield from leer_por_lotes(cursor, tamaño_lote)
+
     def get_all_clientes(self):
         """Obtiene todos los clientes"""
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM clientes ORDER BY nombre, apellido')
+        cursor = self.lectura().cursor()
+        cursor.execute('SELECT * FROM clientes ORDER BY nombre, apellido, cedula')
         return cursor.fetchall()
 
+    # --- PAGINACIÓN POR CLAVE ---
+    # Cada listado se recorre con "despues" = clave de la última fila vista;
+    # clave_*_en(posicion) da la clave de una posición para saltar (barra de
+    # desplazamiento) sin recorrer con OFFSET las páginas siguientes.
+
+    def contar_clientes(self):
+        return self.lectura().execute("SELECT COUNT(*) FROM clientes").fetchone()[0]
+
+    def pagina_clientes(self, despues=None, limite=100):
+        """Clientes en orden (nombre, apellido, cedula) a partir de la clave dada"""
+        cursor = self.lectura().cursor()
+        if despues is None:
+            cursor.execute('''
+                SELECT * FROM clientes ORDER BY nombre, apellido, cedula LIMIT ?
+            ''', (limite,))
+        else:
+            cursor.execute('''
+                SELECT * FROM clientes
+                WHERE (nombre, apellido, cedula) > (?, ?, ?)
+                ORDER BY nombre, apellido, cedula LIMIT ?
+            ''', (*despues, limite))
+        return cursor.fetchall()
+
+    def clave_cliente_en(self, posicion):
+        fila = self.lectura().execute('''
+            SELECT nombre, apellido, cedula FROM clientes
+            ORDER BY nombre, apellido, cedula LIMIT 1 OFFSET ?
+        ''', (posicion,)).fetchone()
+        return tuple(fila) if fila else None
+
+    def contar_pagos(self):
+        return self.lectura().execute("SELECT COUNT(*) FROM pagos").fetchone()[0]
+
+    def pagina_pagos(self, despues=None, limite=100):
+        """Pagos con el nombre del cliente, del más reciente al más antiguo.
+        
+        Mismas columnas que iterar_pagos_con_cliente; la clave es (fecha_pago, id).
+        """
+        consulta = '''
+            SELECT p.id, p.cedula_cliente, c.nombre, c.apellido, p.monto, p.duracion_meses,
+                   p.fecha_pago, p.fecha_vencimiento, p.metodo_pago, p.activo
+            FROM pagos p
+            LEFT JOIN clientes c ON c.cedula = p.cedula_cliente
+            {}
+            ORDER BY p.fecha_pago DESC, p.id DESC LIMIT ?
+        '''
+        cursor = self.lectura().cursor()
+        if despues is None:
+            cursor.execute(consulta.format(""), (limite,))
+        else:
+            cursor.execute(consulta.format("WHERE (p.fecha_pago, p.id) < (?, ?)"), (*despues, limite))
+        return cursor.fetchall()
+
+    def clave_pago_en(self, posicion):
+        fila = self.lectura().execute('''
+            SELECT fecha_pago, id FROM pagos
+            ORDER BY fecha_pago DESC, id DESC LIMIT 1 OFFSET ?
+        ''', (posicion,)).fetchone()
+        return tuple(fila) if fila else None
+
+    def contar_accesos(self):
+        return self.lectura().execute("SELECT COUNT(*) FROM accesos").fetchone()[0]
+
+    def pagina_accesos(self, despues=None, limite=100):
+        """Accesos con nombre del cliente, del más reciente al más antiguo.
+        
+        Mismas columnas que get_accesos_recientes; la clave es (fecha_hora, id).
+        """
+        consulta = '''
+            SELECT a.*, c.nombre, c.apellido
+            FROM accesos a
+            LEFT JOIN clientes c ON c.cedula = a.cedula_cliente
+            {}
+            ORDER BY a.fecha_hora DESC, a.id DESC LIMIT ?
+        '''
+        cursor = self.lectura().cursor()
+        if despues is None:
+            cursor.execute(consulta.format(""), (limite,))
+        else:
+            cursor.execute(consulta.format("WHERE (a.fecha_hora, a.id) < (?, ?)"), (*despues, limite))
+        return cursor.fetchall()
+
+    def clave_acceso_en(self, posicion):
+        fila = self.lectura().execute('''
+            SELECT fecha_hora, id FROM accesos
+            ORDER BY fecha_hora DESC, id DESC LIMIT 1 OFFSET ?
+        ''', (posicion,)).fetchone()
+        return tuple(fila) if fila else None
+
     def eliminar_cliente(self, cedula):
         """Elimina un cliente y sus registros asociados"""
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("DELETE FROM clientes WHERE cedula = ?", (cedula,))
-            self.conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error eliminando cliente: {e}")
-            return False
+        with self.lock_escritura:
+            try:
+                cursor = self.conn.cursor()
+                # Borrado explícito: las tablas antiguas no tienen ON DELETE CASCADE
+                cursor.execute("DELETE FROM accesos WHERE cedula_cliente = ?", (cedula,))
+                cursor.execute("DELETE FROM pagos WHERE cedula_cliente = ?", (cedula,))
+                cursor.execute("DELETE FROM clientes WHERE cedula = ?", (cedula,))
+                cursor.execute("DELETE FROM estado_membresia WHERE cedula_cliente = ?", (cedula,))
+                self.conn.commit()
+                self.cache_miembros.invalidar(cedula)
+                self.cache_reportes.invalidar('clientes', 'pagos', 'accesos')
+                return True
+            except Exception as e:
+                self.conn.rollback()
+                print(f"Error eliminando cliente: {e}")
+                return False
 
-    # --- MÉTODOS ADICIONALES DE PAGOS ---
+        # --- MÉTODOS ADICIONALES DE PAGOS ---
 
     def get_clientes_vencidos(self):
         """Obtiene clientes con membresía vencida"""
-        cursor = self.conn.cursor()
+        cursor = self.lectura().cursor()
         cursor.execute('''
-            SELECT c.cedula, c.nombre, c.apellido, p.fecha_vencimiento 
-            FROM clientes c
-            JOIN pagos p ON c.cedula = p.cedula_cliente
-            WHERE p.activo = 1 AND p.fecha_vencimiento < date('now')
-            ORDER BY p.fecha_vencimiento ASC
-        ''')
+            SELECT c.cedula, c.nombre, c.apellido, e.fecha_vencimiento, c.telefono
+            FROM estado_membresia e
+            JOIN clientes c ON c.cedula = e.cedula_cliente
+            WHERE e.fecha_vencimiento < ?
+            ORDER BY e.fecha_vencimiento ASC
+        ''', (datetime.now().date().isoformat(),))
         return cursor.fetchall()
 
     def get_ingresos_por_mes(self, año=None):
         """Obtiene ingresos mensuales"""
-        cursor = self.conn.cursor()
+        cursor = self.lectura().cursor()
         
         if año is None:
             año = datetime.now().year
             
         cursor.execute('''
             SELECT 
-                strftime('%m', fecha_pago) as mes,
-                SUM(monto) as total_mes,
-                COUNT(*) as cantidad_pagos
-            FROM pagos 
-            WHERE strftime('%Y', fecha_pago) = ?
+                substr(dia, 6, 2) as mes,
+                SUM(total) as total_mes,
+                SUM(cantidad) as cantidad_pagos
+            FROM resumen_ingresos_dia 
+            WHERE dia >= ? AND dia < ?
             GROUP BY mes
             ORDER BY mes
-        ''', (str(año),))
+        ''', rango_fechas(date(int(año), 1, 1), date(int(año), 12, 31)))
         
         return cursor.fetchall()
         
-    
\ No newline at end of file
+    
+
+    # --- REPORTES POR PERÍODO ---
+    # Una consulta agregada por reporte, acotada a [desde, hasta]; los
+    # resultados quedan en cache_reportes hasta que cambian sus tablas.
+
+    def reporte(self, nombre, desde, hasta):
+        """Filas del reporte `nombre` (ver FUENTES_REPORTES) entre dos fechas inclusive"""
+        fuentes = FUENTES_REPORTES[nombre]
+        clave = (nombre, a_fecha(desde).isoformat(), a_fecha(hasta).isoformat())
+        # Lo que escriba otra recepción en el mismo archivo también descarta la caché
+        self.revisar_escrituras_externas()
+        guardado = self.cache_reportes.obtener(clave)
+        if guardado is not None:
+            return guardado[1]
+        version = self.cache_reportes.version(fuentes)
+        filas = getattr(self, f'reporte_{nombre}')(desde, hasta)
+        self.cache_reportes.guardar(clave, fuentes, version, filas)
+        return filas
+
+    def reporte_pagos_mensuales(self, desde, hasta):
+        """(mes, pagos, ingresos, clientes nuevos) por mes, incluidos los meses sin datos"""
+        meses = meses_entre(desde, hasta)
+        if not meses:
+            return []
+        cursor = self.lectura().cursor()
+        cursor.execute(f'''
+            WITH meses (mes, inicio, fin) AS (VALUES {', '.join(['(?, ?, ?)'] * len(meses))})
+            SELECT m.mes,
+                   (SELECT IFNULL(SUM(cantidad), 0) FROM resumen_ingresos_dia
+                    WHERE dia >= m.inicio AND dia < m.fin),
+                   (SELECT IFNULL(SUM(total), 0) FROM resumen_ingresos_dia
+                    WHERE dia >= m.inicio AND dia < m.fin),
+                   (SELECT COUNT(*) FROM clientes
+                    WHERE fecha_registro >= m.inicio AND fecha_registro < m.fin)
+            FROM meses m
+            ORDER BY m.mes
+        ''', [valor for mes in meses for valor in mes])
+        return cursor.fetchall()
+
+    def reporte_accesos_diarios(self, desde, hasta):
+        """(dia, entradas, salidas, total, hora pico 'HH:00') de cada día con accesos, del más reciente"""
+        cursor = self.lectura().cursor()
+        cursor.execute('''
+            SELECT r.dia,
+                   SUM(CASE WHEN r.tipo_movimiento = 'Entrada' THEN r.cantidad ELSE 0 END),
+                   SUM(CASE WHEN r.tipo_movimiento = 'Salida' THEN r.cantidad ELSE 0 END),
+                   SUM(r.cantidad),
+                   (SELECT printf('%02d:00', p.hora) FROM resumen_accesos_hora p
+                    WHERE p.dia = r.dia AND p.tipo_movimiento = 'Entrada' AND p.cantidad > 0
+                    ORDER BY p.cantidad DESC, p.hora LIMIT 1)
+            FROM resumen_accesos_hora r
+            WHERE r.dia >= ? AND r.dia < ?
+            GROUP BY r.dia
+            HAVING SUM(r.cantidad) > 0
+            ORDER BY r.dia DESC
+        ''', rango_fechas(desde, hasta))
+        return cursor.fetchall()
+
+    def reporte_ingresos_metodo(self, desde, hasta):
+        """(método, pagos, ingresos, porcentaje de los ingresos) del más al menos recaudado"""
+        cursor = self.lectura().cursor()
+        cursor.execute('''
+            SELECT metodo_pago, SUM(cantidad), SUM(total),
+                   IFNULL(SUM(total) * 100.0 / NULLIF(SUM(SUM(total)) OVER (), 0), 0)
+            FROM resumen_ingresos_dia
+            WHERE dia >= ? AND dia < ?
+            GROUP BY metodo_pago
+            HAVING SUM(cantidad) > 0
+            ORDER BY SUM(total) DESC
+        ''', rango_fechas(desde, hasta))
+        return cursor.fetchall()
+
+    def reporte_tendencia(self, desde, hasta):
+        """(mes, clientes con membresía vigente al cierre, ingresos) por mes.
+        
+        El cierre es el último día del mes, o hoy para el mes en curso. Un
+        pago vence a lo sumo 31 días por mes de duración después de pagarse
+        (insert_pago usa 30), así que solo se leen los pagos de esa ventana.
+        """
+        manana = (datetime.now().date() + timedelta(days=1)).isoformat()
+        meses = [(mes, inicio, min(fin, manana)) for mes, inicio, fin in meses_entre(desde, hasta)]
+        if not meses:
+            return []
+        cursor = self.lectura().cursor()
+        cursor.execute(f'''
+            WITH meses (mes, inicio, fin) AS (VALUES {', '.join(['(?, ?, ?)'] * len(meses))})
+            SELECT m.mes,
+                   (SELECT COUNT(DISTINCT p.cedula_cliente) FROM pagos p
+                    WHERE p.fecha_pago >= date(m.fin, -(SELECT 31 * IFNULL(MAX(duracion_meses), 0) + 1
+                                                        FROM pagos) || ' days')
+                      AND p.fecha_pago < m.fin AND p.fecha_vencimiento >= date(m.fin, '-1 day')),
+                   (SELECT IFNULL(SUM(total), 0) FROM resumen_ingresos_dia
+                    WHERE dia >= m.inicio AND dia < m.fin)
+            FROM meses m
+            ORDER BY m.mes
+        ''', [valor for mes in meses for valor in mes])
+        return cursor.fetchall()
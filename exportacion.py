@@ -0,0 +1,128 @@
+import csv
+import os
+from functools import partial
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from tareas import ejecutor_de
+
+# Filas de una hoja de Excel, encabezado incluido
+FILAS_POR_HOJA = 1_048_576
+# Cada cuántas filas se informa el avance (y se revisa si se canceló)
+AVISO_CADA = 10_000
+
+ENCABEZADOS_CLIENTES = ['Cédula', 'Nombre', 'Apellido', 'Teléfono', 'Teléfono Emergencia',
+                        'Dirección', 'Foto', 'Fecha Registro']
+ENCABEZADOS_PAGOS = ['ID', 'Cédula', 'Nombre', 'Apellido', 'Monto', 'Meses', 'Fecha Pago',
+                     'Fecha Vencimiento', 'Método', 'Activo']
+ENCABEZADOS_ACCESOS = ['ID', 'Cédula', 'Nombre', 'Apellido', 'Movimiento', 'Fecha y Hora']
+
+
+class ExportacionCancelada(Exception):
+    pass
+
+
+def exportar_filas(ruta, encabezados, filas, al_avanzar=None, hoja='Datos'):
+    """Escribe filas (cualquier iterable) en un .csv o .xlsx sin juntarlas en memoria.
+
+    Las filas se consumen a medida que se escriben, así que con un generador
+    de Database la memoria no depende del tamaño del listado. al_avanzar
+    recibe las filas escritas cada AVISO_CADA; si devuelve False se corta con
+    ExportacionCancelada. Devuelve el número de filas escritas.
+
+    Se escribe en un temporal junto al destino: si falla o se cancela no
+    queda un archivo a medias ni se pisa uno anterior.
+    """
+    temporal = ruta + '.tmp'
+    try:
+        if ruta.lower().endswith('.csv'):
+            escritas = exportar_csv(temporal, encabezados, filas, al_avanzar)
+        else:
+            escritas = exportar_xlsx(temporal, encabezados, filas, al_avanzar, hoja)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    return escritas
+
+
+def avisar(al_avanzar, escritas):
+    if al_avanzar is not None and escritas % AVISO_CADA == 0 and al_avanzar(escritas) is False:
+        raise ExportacionCancelada(f"Exportación cancelada tras {escritas} filas")
+
+
+def exportar_csv(ruta, encabezados, filas, al_avanzar=None):
+    escritas = 0
+    # utf-8-sig y punto y coma: así lo abre Excel en español sin asistente
+    with open(ruta, 'w', newline='', encoding='utf-8-sig') as archivo:
+        escritor = csv.writer(archivo, delimiter=';')
+        escritor.writerow(encabezados)
+        for fila in filas:
+            escritor.writerow(fila)
+            escritas += 1
+            avisar(al_avanzar, escritas)
+    return escritas
+
+
+def exportar_xlsx(ruta, encabezados, filas, al_avanzar=None, hoja='Datos'):
+    # openpyxl se importa recién al exportar a Excel (no hace falta al arrancar)
+    from openpyxl import Workbook
+    # Solo escritura: openpyxl vuelca cada fila al XML en vez de guardar celdas
+    libro = Workbook(write_only=True)
+    actual, en_hoja, escritas = None, FILAS_POR_HOJA, 0
+    for fila in filas:
+        if en_hoja == FILAS_POR_HOJA:
+            # Más filas de las que caben en una hoja: se sigue en otra
+            numero = len(libro.worksheets) + 1
+            actual = libro.create_sheet(hoja if numero == 1 else f"{hoja} {numero}")
+            actual.append(encabezados)
+            en_hoja = 1
+        actual.append(fila)
+        en_hoja += 1
+        escritas += 1
+        avisar(al_avanzar, escritas)
+    if actual is None:
+        libro.create_sheet(hoja).append(encabezados)
+    libro.save(ruta)
+    return escritas
+
+
+def exportar_con_avance(parent, ruta, encabezados, filas, titulo="Exportando", hoja='Datos'):
+    """Corre exportar_filas en segundo plano con una ventana de avance y cancelación.
+
+    filas puede ser un generador de Database: su consulta se ejecuta recién al
+    recorrerlo, en el hilo de la tarea.
+    """
+    tareas = ejecutor_de(parent)
+    ventana = tk.Toplevel(parent)
+    ventana.title(titulo)
+    ventana.geometry("380x140")
+    ventana.transient(parent.winfo_toplevel())
+    ventana.grab_set()
+    ventana.protocol("WM_DELETE_WINDOW", lambda: None)
+    estado = ttk.Label(ventana, text="Leyendo datos...")
+    estado.pack(pady=(15, 5))
+    barra = ttk.Progressbar(ventana, mode='indeterminate', length=320)
+    barra.pack(pady=5)
+    barra.start(20)
+
+    def avanzar(escritas):
+        estado.config(text=f"{escritas:,} filas escritas")
+
+    def terminar(escritas):
+        ventana.destroy()
+        messagebox.showinfo("Éxito", f"{escritas:,} filas exportadas a:\n{ruta}")
+
+    def fallar(error):
+        ventana.destroy()
+        messagebox.showerror("Error", f"No se pudo exportar: {error}")
+
+    def cancelar():
+        # La tarea se corta en el próximo aviso de avance y borra el temporal
+        tareas.cancelar('exportacion')
+        ventana.destroy()
+
+    ttk.Button(ventana, text="Cancelar", command=cancelar).pack(pady=10)
+    tareas.ejecutar('exportacion', partial(exportar_filas, hoja=hoja), ruta, encabezados, filas,
+                    al_terminar=terminar, al_fallar=fallar, al_avanzar=avanzar)
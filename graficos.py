@@ -0,0 +1,131 @@
+import math
+
+
+class Grafico:
+    """Gráfico de una figura de matplotlib que crea sus artistas una sola vez.
+
+    Cada actualizar() cambia solo los datos de los artistas (alturas, ángulos,
+    líneas) y pide el dibujo con draw_idle, que Tk junta en uno solo. Los ejes
+    cambian de escala con los datos, así que no sirve blitting.
+    """
+
+    def __init__(self, figura, canvas):
+        self.figura = figura
+        self.canvas = canvas
+        self.ajustado = False
+
+    def dibujar(self):
+        # tight_layout solo con los primeros datos: las etiquetas casi no cambian de tamaño
+        if not self.ajustado:
+            self.figura.tight_layout()
+            self.ajustado = True
+        self.canvas.draw_idle()
+
+
+def etiquetar_x(ax, etiquetas):
+    ax.set_xticks(range(len(etiquetas)))
+    ax.set_xticklabels(etiquetas)
+
+
+class GraficoBarras(Grafico):
+    """Barras con su valor encima (ingresos por mes)"""
+
+    def __init__(self, figura, canvas, titulo, etiqueta_y, color, formato='${:,.0f}'):
+        super().__init__(figura, canvas)
+        self.ax = figura.add_subplot(111)
+        self.color = color
+        self.formato = formato
+        self.barras = []
+        self.valores = []
+        self.ax.set_title(titulo, fontweight='bold')
+        self.ax.set_ylabel(etiqueta_y)
+        self.ax.grid(True, alpha=0.3)
+
+    def crear_barras(self, cantidad):
+        for barra, texto in zip(self.barras, self.valores):
+            barra.remove()
+            texto.remove()
+        self.barras = list(self.ax.bar(range(cantidad), [0] * cantidad, color=self.color, alpha=0.7))
+        self.valores = [self.ax.text(i, 0, '', ha='center', va='bottom') for i in range(cantidad)]
+        self.ajustado = False
+
+    def actualizar(self, etiquetas, valores):
+        # Solo se vuelven a crear si cambia la cantidad de barras
+        if len(valores) != len(self.barras):
+            self.crear_barras(len(valores))
+        for barra, texto, valor in zip(self.barras, self.valores, valores):
+            barra.set_height(valor)
+            texto.set_y(valor)
+            texto.set_text(self.formato.format(valor))
+        etiquetar_x(self.ax, etiquetas)
+        # Lugar arriba para los textos de las barras
+        self.ax.set_ylim(0, max(valores, default=0) * 1.15 or 1)
+        self.dibujar()
+
+
+class GraficoTorta(Grafico):
+    """Torta de categorías fijas; las que valen 0 se ocultan"""
+
+    def __init__(self, figura, canvas, titulo, etiquetas, colores, inicio=90):
+        super().__init__(figura, canvas)
+        self.ax = figura.add_subplot(111)
+        self.inicio = inicio
+        self.porciones, self.etiquetas, self.porcentajes = self.ax.pie(
+            [1] * len(etiquetas), labels=etiquetas, colors=colores, autopct='%1.1f%%',
+            startangle=inicio)
+        for texto in self.porcentajes:
+            texto.set_color('white')
+            texto.set_fontweight('bold')
+        self.ax.set_title(titulo, fontweight='bold')
+
+    def actualizar(self, valores):
+        total = sum(valores)
+        angulo = self.inicio
+        for porcion, etiqueta, porcentaje, valor in zip(self.porciones, self.etiquetas,
+                                                         self.porcentajes, valores):
+            visible = total > 0 and valor > 0
+            for artista in (porcion, etiqueta, porcentaje):
+                artista.set_visible(visible)
+            if not visible:
+                continue
+            # Mismas posiciones que calcula ax.pie (etiqueta a 1.1, porcentaje a 0.6 del radio)
+            barrido = 360 * valor / total
+            porcion.set_theta1(angulo)
+            porcion.set_theta2(angulo + barrido)
+            medio = math.radians(angulo + barrido / 2)
+            x, y = math.cos(medio), math.sin(medio)
+            etiqueta.set_position((1.1 * x, 1.1 * y))
+            etiqueta.set_horizontalalignment('left' if x > 0 else 'right')
+            porcentaje.set_position((0.6 * x, 0.6 * y))
+            porcentaje.set_text(f"{valor / total * 100:.1f}%")
+            angulo += barrido
+        self.dibujar()
+
+
+class GraficoDobleEje(Grafico):
+    """Dos series con ejes y propios (clientes e ingresos); el twinx se crea una vez"""
+
+    def __init__(self, figura, canvas, titulo, serie1, serie2):
+        super().__init__(figura, canvas)
+        self.ax1 = figura.add_subplot(111)
+        self.ax2 = self.ax1.twinx()
+        self.lineas = []
+        for ax, (nombre, color, marcador, tamaño) in ((self.ax1, serie1), (self.ax2, serie2)):
+            linea, = ax.plot([], [], marcador + '-', color=color, linewidth=2,
+                             markersize=tamaño, label=nombre)
+            ax.set_ylabel(nombre, color=color)
+            ax.tick_params(axis='y', labelcolor=color)
+            self.lineas.append(linea)
+        self.ax1.legend(self.lineas, [linea.get_label() for linea in self.lineas], loc='upper left')
+        self.ax1.set_title(titulo, fontweight='bold')
+        self.ax1.grid(True, alpha=0.3)
+
+    def actualizar(self, etiquetas, valores1, valores2):
+        posiciones = range(len(etiquetas))
+        for ax, linea, valores in ((self.ax1, self.lineas[0], valores1),
+                                   (self.ax2, self.lineas[1], valores2)):
+            linea.set_data(posiciones, valores)
+            ax.relim()
+            ax.autoscale_view()
+        etiquetar_x(self.ax1, etiquetas)
+        self.dibujar()
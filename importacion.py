@@ -0,0 +1,284 @@
+import json
+import os
+
+import pandas as pd
+from openpyxl import load_workbook
+
+COLUMNAS_CLIENTE = ['cedula', 'nombre', 'apellido', 'telefono', 'telefono_emergencia', 'direccion']
+COLUMNAS_OBLIGATORIAS = ['cedula', 'nombre', 'apellido']
+
+
+def columnas_faltantes(df):
+    """Columnas obligatorias que no están en el archivo"""
+    presentes = {str(col).strip().lower() for col in df.columns}
+    return [col for col in COLUMNAS_OBLIGATORIAS if col not in presentes]
+
+
+def normalizar_columnas(df):
+    """Columnas de cliente como texto sin espacios; las opcionales que falten quedan vacías"""
+    df = df.rename(columns=lambda col: str(col).strip().lower())
+    limpio = pd.DataFrame(index=df.index)
+    for col in COLUMNAS_CLIENTE:
+        if col not in df.columns:
+            limpio[col] = ''
+            continue
+        serie = df[col]
+        numerica = pd.api.types.is_numeric_dtype(serie)
+        serie = serie.astype('string').str.strip()
+        if numerica:
+            # Excel entrega 12345 como 12345.0 si la columna tiene celdas vacías
+            serie = serie.str.replace(r'\.0$', '', regex=True)
+        limpio[col] = serie.fillna('')
+    return limpio
+
+
+def preparar_clientes(df, existentes):
+    """Separa las filas del archivo en válidas, rechazadas y duplicadas.
+
+    Rechazadas son las que no tienen cédula, nombre o apellido; duplicadas
+    las que repiten una cédula del archivo o de `existentes` (un set).
+    Devuelve (DataFrame de válidas, número de rechazadas, cédulas duplicadas).
+    """
+    return clasificar_clientes(normalizar_columnas(df), existentes)
+
+
+def clasificar_clientes(limpio, existentes):
+    """preparar_clientes sobre columnas ya normalizadas"""
+    completas = (limpio[COLUMNAS_OBLIGATORIAS] != '').all(axis=1)
+    cedulas = limpio['cedula'].where(completas)
+    duplicadas = completas & (cedulas.duplicated(keep='first') | cedulas.isin(existentes))
+    validas = limpio.loc[completas & ~duplicadas, COLUMNAS_CLIENTE]
+    return validas, int((~completas).sum()), limpio.loc[duplicadas, 'cedula'].tolist()
+
+
+def importar_clientes(db, df):
+    """Carga masiva: valida con pandas y registra las filas válidas en una transacción"""
+    validas, rechazados, duplicados = preparar_clientes(df, db.cedulas_existentes())
+    insertados = db.insertar_clientes_lote(validas.itertuples(index=False, name=None))
+    # Cédulas registradas por otra vía entre la validación y el insert
+    omitidos = len(validas) - insertados
+    return {
+        'insertados': insertados,
+        'rechazados': rechazados,
+        'duplicados': duplicados,
+        'omitidos': omitidos
+    }
+
+
+# --- IMPORTACIÓN POR BLOQUES (archivos grandes) ---
+# El archivo se lee de a TAMAÑO_BLOQUE filas; cada bloque se valida y se
+# registra en su propia transacción, y después se guarda un punto de control
+# junto al archivo para poder continuar si la carga se interrumpe.
+
+TAMAÑO_BLOQUE = 5000
+
+
+def leer_bloques(ruta, tamaño=TAMAÑO_BLOQUE, saltar=0):
+    """Genera (DataFrame, filas leídas, fracción del archivo) sin cargarlo entero.
+
+    `saltar` son las filas de datos ya importadas; las filas leídas incluyen
+    las saltadas y las vacías, para que sirvan de punto de control.
+    """
+    if ruta.lower().endswith('.csv'):
+        return leer_bloques_csv(ruta, tamaño, saltar)
+    return leer_bloques_xlsx(ruta, tamaño, saltar)
+
+
+def leer_bloques_csv(ruta, tamaño, saltar):
+    total = os.path.getsize(ruta) or 1
+    with open(ruta, 'rb') as archivo:
+        # Excel en español guarda los CSV separados por punto y coma
+        primera = archivo.readline()
+        archivo.seek(0)
+        separador = ';' if primera.count(b';') > primera.count(b',') else ','
+        # Las líneas vacías se leen (y se descartan después) para que cuenten
+        # como filas leídas igual en la carga y al continuar
+        lector = pd.read_csv(archivo, sep=separador, dtype=str, keep_default_na=False,
+                             skip_blank_lines=False, encoding='utf-8-sig', chunksize=tamaño)
+        leidas = 0
+        for bloque in lector:
+            # Se salta por registros y no por líneas (skiprows): un campo entre
+            # comillas puede ocupar varias líneas, como suele pasar con la dirección
+            desde = max(saltar - leidas, 0)
+            leidas += len(bloque)
+            if desde >= len(bloque):
+                continue
+            bloque = bloque.iloc[desde:]
+            bloque = bloque[(bloque != '').any(axis=1)]
+            yield bloque, leidas, min(archivo.tell() / total, 1.0)
+
+
+def leer_bloques_xlsx(ruta, tamaño, saltar):
+    # Solo lectura: openpyxl va leyendo las filas del XML en vez de cargar la hoja
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        hoja = libro.active
+        encabezados = next(hoja.iter_rows(max_row=1, values_only=True), None)
+        if encabezados is None:
+            return
+        columnas = ['' if valor is None else str(valor) for valor in encabezados]
+        ancho = len(columnas)
+        total = max((hoja.max_row or 0) - 1, 1)
+        leidas, filas = saltar, []
+        for fila in hoja.iter_rows(min_row=2 + saltar, values_only=True):
+            leidas += 1
+            if any(valor is not None for valor in fila):
+                filas.append((tuple(fila) + (None,) * ancho)[:ancho])
+            if len(filas) >= tamaño:
+                yield pd.DataFrame(filas, columns=columnas), leidas, min(leidas / total, 1.0)
+                filas = []
+        if filas:
+            yield pd.DataFrame(filas, columns=columnas), leidas, 1.0
+    finally:
+        libro.close()
+
+
+def ruta_progreso(ruta):
+    return ruta + '.progreso.json'
+
+
+def firma_archivo(ruta):
+    """Tamaño y fecha de modificación: un punto de control solo vale para el mismo archivo"""
+    estado = os.stat(ruta)
+    return [estado.st_size, estado.st_mtime]
+
+
+def progreso_guardado(ruta, modo='insertar'):
+    """Punto de control de una carga interrumpida de este mismo archivo y modo, o None"""
+    try:
+        with open(ruta_progreso(ruta), 'r', encoding='utf-8') as f:
+            progreso = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if progreso.get('firma') != firma_archivo(ruta) or progreso.get('modo', 'insertar') != modo:
+        return None
+    return progreso
+
+
+def guardar_progreso(ruta, progreso):
+    temporal = ruta_progreso(ruta) + '.tmp'
+    try:
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(progreso, f)
+        os.replace(temporal, ruta_progreso(ruta))
+    except OSError as e:
+        print(f"No se pudo guardar el punto de control de la carga: {e}")
+
+
+def borrar_progreso(ruta):
+    try:
+        os.remove(ruta_progreso(ruta))
+    except FileNotFoundError:
+        pass
+
+
+def ruta_informe(ruta):
+    return ruta + '.diferencias.csv'
+
+
+def comparar_clientes(validas, actuales, campos):
+    """Diferencias entre las filas válidas de un archivo y lo ya registrado.
+
+    actuales son filas de Database.clientes_por_cedula; campos, las columnas
+    del archivo que se comparan. Devuelve (nuevas, cambiadas, cambios): las
+    filas con cédula nueva, las registradas con algún campo distinto y un
+    DataFrame cedula/campo/antes/despues con cada campo que cambia.
+    """
+    registradas = (pd.DataFrame(actuales, columns=COLUMNAS_CLIENTE).set_index('cedula')[campos]
+                   .astype('string').fillna(''))
+    es_nueva = ~validas['cedula'].isin(registradas.index)
+    existentes = validas[~es_nueva].set_index('cedula')[campos].astype('string')
+    antes = registradas.loc[existentes.index]
+    distinto = antes.ne(existentes)
+
+    filas, columnas = distinto.to_numpy().nonzero()
+    cambios = pd.DataFrame({
+        'cedula': distinto.index[filas],
+        'campo': distinto.columns[columnas],
+        'antes': antes.to_numpy()[filas, columnas],
+        'despues': existentes.to_numpy()[filas, columnas]
+    })
+    return validas[es_nueva], existentes[distinto.any(axis=1).to_numpy()].reset_index(), cambios
+
+
+def escribir_informe(ruta, nuevas, cambios, primero):
+    """Agrega al informe CSV de una simulación las altas y los campos que cambian"""
+    altas = pd.DataFrame({
+        'cedula': nuevas['cedula'],
+        'campo': '(nuevo)',
+        'antes': '',
+        'despues': nuevas['nombre'] + ' ' + nuevas['apellido']
+    })
+    pd.concat([altas, cambios]).to_csv(ruta_informe(ruta), mode='w' if primero else 'a',
+                                       header=primero, index=False, encoding='utf-8')
+
+
+def importar_archivo(db, ruta, tamaño_bloque=TAMAÑO_BLOQUE, al_avanzar=None, actualizar=False, simular=False):
+    """Importa clientes de un .csv o .xlsx por bloques, con memoria constante.
+
+    Si hay un punto de control del mismo archivo, continúa desde ahí. Después
+    de cada bloque llama a al_avanzar(fracción, progreso); si devuelve False
+    la carga se detiene dejando el punto de control. Devuelve el progreso
+    acumulado con 'completo' indicando si se llegó al final.
+
+    Con actualizar, las cédulas ya registradas se sincronizan (solo se
+    escriben las que cambian, y solo las columnas que trae el archivo). Con
+    simular no se escribe nada: los totales son los que se aplicarían y las
+    diferencias quedan en ruta_informe(ruta).
+    """
+    modo = 'actualizar' if actualizar else 'insertar'
+    progreso = None if simular else progreso_guardado(ruta, modo)
+    progreso = progreso or {
+        'firma': firma_archivo(ruta),
+        'modo': modo,
+        'filas': 0,
+        'insertados': 0,
+        'actualizados': 0,
+        'sin_cambios': 0,
+        'rechazados': 0,
+        'duplicados': 0,
+        'ejemplos_duplicados': []
+    }
+    reanudado_desde = progreso['filas']
+    primero = True
+    for bloque, leidas, fraccion in leer_bloques(ruta, tamaño_bloque, progreso['filas']):
+        if primero:
+            faltantes = columnas_faltantes(bloque)
+            if faltantes:
+                raise ValueError(f"Faltan las columnas: {', '.join(faltantes)}")
+        limpio = normalizar_columnas(bloque)
+        if actualizar:
+            presentes = {str(col).strip().lower() for col in bloque.columns}
+            campos = [col for col in COLUMNAS_CLIENTE[1:] if col in presentes]
+            validas, rechazados, duplicados = clasificar_clientes(limpio, set())
+            nuevas, cambiadas, cambios = comparar_clientes(
+                validas, db.clientes_por_cedula(validas['cedula']), campos)
+            if simular:
+                escribir_informe(ruta, nuevas, cambios, primero)
+                insertados, actualizados = len(nuevas), len(cambiadas)
+            else:
+                filas = pd.concat([nuevas, cambiadas])[['cedula'] + campos]
+                insertados, actualizados = db.upsert_clientes_lote(filas.itertuples(index=False, name=None), campos)
+            progreso['actualizados'] += actualizados
+            progreso['sin_cambios'] += len(validas) - len(nuevas) - len(cambiadas)
+        else:
+            # Solo se consultan las cédulas del bloque: la memoria no crece con el archivo
+            existentes = db.cedulas_registradas(set(limpio['cedula']) - {''})
+            validas, rechazados, duplicados = clasificar_clientes(limpio, existentes)
+            insertados = len(validas) if simular else \
+                db.insertar_clientes_lote(validas.itertuples(index=False, name=None))
+        primero = False
+
+        progreso['filas'] = leidas
+        progreso['insertados'] += insertados
+        progreso['rechazados'] += rechazados
+        progreso['duplicados'] += len(duplicados) + (0 if actualizar else len(validas) - insertados)
+        progreso['ejemplos_duplicados'] = (progreso['ejemplos_duplicados'] + duplicados)[:5]
+        if not simular:
+            guardar_progreso(ruta, progreso)
+        if al_avanzar is not None and al_avanzar(fraccion, dict(progreso)) is False:
+            return dict(progreso, completo=False, simulado=simular, reanudado_desde=reanudado_desde)
+
+    if not simular:
+        borrar_progreso(ruta)
+    return dict(progreso, completo=True, simulado=simular, reanudado_desde=reanudado_desde)
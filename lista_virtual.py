@@ -0,0 +1,263 @@
+import tkinter as tk
+from tkinter import ttk
+
+from tareas import ejecutor_de
+
+
+class ProveedorPaginado:
+    """Lee un listado de Database por páginas con paginación por clave.
+
+    contar() da el total, pagina(despues, limite) las filas siguientes a una
+    clave, clave_en(posicion) la clave de una posición (para saltos) y
+    clave(fila) la clave de una fila ya leída.
+    """
+
+    def __init__(self, contar, pagina, clave_en, clave):
+        self.contar = contar
+        self.pagina = pagina
+        self.clave_en = clave_en
+        self.clave = clave
+
+    def leer_pagina(self, numero, tamaño, ancla=None):
+        """Filas de la página `numero`; ancla es la clave de la última fila de la anterior"""
+        if numero == 0:
+            return self.pagina(None, tamaño)
+        if ancla is None:
+            ancla = self.clave_en(numero * tamaño - 1)
+            if ancla is None:
+                return []
+        return self.pagina(ancla, tamaño)
+
+
+class ProveedorLista:
+    """Mismo contrato que ProveedorPaginado sobre filas ya cargadas en memoria"""
+
+    def __init__(self, filas):
+        self.filas = filas
+
+    def contar(self):
+        return len(self.filas)
+
+    def clave(self, fila):
+        return None
+
+    def leer_pagina(self, numero, tamaño, ancla=None):
+        return self.filas[numero * tamaño:(numero + 1) * tamaño]
+
+
+class VentanaPaginada:
+    """Páginas leídas de un proveedor; conserva solo las cercanas a la vista"""
+
+    def __init__(self, proveedor, tamaño_pagina=100, paginas_en_memoria=6):
+        self.proveedor = proveedor
+        self.tamaño_pagina = tamaño_pagina
+        self.paginas_en_memoria = paginas_en_memoria
+        self.paginas = {}
+        self.total = 0
+
+    def pagina_de(self, posicion):
+        return posicion // self.tamaño_pagina
+
+    def ancla(self, numero):
+        """Clave de la última fila de la página anterior, si está en memoria"""
+        anterior = self.paginas.get(numero - 1)
+        if anterior:
+            return self.proveedor.clave(anterior[-1])
+        return None
+
+    def leer(self, numero):
+        """Consulta la página (sin guardarla); se puede llamar desde otro hilo"""
+        return self.proveedor.leer_pagina(numero, self.tamaño_pagina, self.ancla(numero))
+
+    def guardar(self, numero, filas, actual):
+        self.paginas[numero] = filas
+        # Descartar las páginas más alejadas de la que se está mostrando
+        while len(self.paginas) > self.paginas_en_memoria:
+            lejana = max(self.paginas, key=lambda n: abs(n - actual))
+            del self.paginas[lejana]
+
+    def faltantes(self, inicio, cantidad, prefetch=1):
+        """Páginas necesarias para mostrar [inicio, inicio+cantidad) más las vecinas"""
+        if self.total == 0:
+            return []
+        primera = max(0, self.pagina_de(inicio) - prefetch)
+        ultima = min(self.pagina_de(self.total - 1),
+                     self.pagina_de(inicio + max(cantidad, 1) - 1) + prefetch)
+        return [n for n in range(primera, ultima + 1) if n not in self.paginas]
+
+    def filas(self, inicio, cantidad):
+        """Filas [inicio, inicio+cantidad); None donde la página aún no llegó"""
+        resultado = []
+        for posicion in range(inicio, min(inicio + cantidad, self.total)):
+            pagina = self.paginas.get(self.pagina_de(posicion))
+            indice = posicion % self.tamaño_pagina
+            resultado.append(pagina[indice] if pagina is not None and indice < len(pagina) else None)
+        return resultado
+
+    def reiniciar(self, proveedor=None, total=0):
+        if proveedor is not None:
+            self.proveedor = proveedor
+        self.paginas = {}
+        self.total = total
+
+
+class ListaVirtual(ttk.Frame):
+    """Treeview que solo crea las filas visibles de un listado grande.
+
+    Las páginas se piden en segundo plano con el ejecutor de tareas; al
+    desplazarse se vuelven a pintar las mismas pocas filas con otro tramo.
+    """
+
+    def __init__(self, parent, columnas, proveedor, formatear=None, anchos=None,
+                 encabezados=None, tamaño_pagina=100, al_contar=None, **kwargs):
+        super().__init__(parent)
+        self.columnas = columnas
+        self.formatear = formatear or tuple
+        self.al_contar = al_contar
+        self.ventana = VentanaPaginada(proveedor, tamaño_pagina)
+        self.tareas = ejecutor_de(parent)
+        self.inicio = 0
+        self.visibles = kwargs.get('height', 15)
+        self.seleccionada = None
+        self.generacion = 0
+        self.pedidas = set()
+
+        self.tree = ttk.Treeview(self, columns=columnas, show='headings', selectmode='browse', **kwargs)
+        for col in columnas:
+            self.tree.heading(col, text=(encabezados or {}).get(col, col))
+            self.tree.column(col, width=(anchos or {}).get(col, 120), anchor='center')
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.desplazar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind('<Configure>', self.al_redimensionar)
+        self.tree.bind('<<TreeviewSelect>>', self.al_seleccionar, add='+')
+        self.tree.bind('<MouseWheel>', self.al_rueda)
+        self.tree.bind('<Button-4>', lambda e: self.mover(-3))
+        self.tree.bind('<Button-5>', lambda e: self.mover(3))
+        self.tree.bind('<Up>', lambda e: self.mover_seleccion(-1))
+        self.tree.bind('<Down>', lambda e: self.mover_seleccion(1))
+        self.tree.bind('<Prior>', lambda e: self.mover(-self.visibles))
+        self.tree.bind('<Next>', lambda e: self.mover(self.visibles))
+        self.tree.bind('<Home>', lambda e: self.ir_a(0))
+        self.tree.bind('<End>', lambda e: self.ir_a(self.ventana.total))
+
+        self.recargar()
+
+    def recargar(self, proveedor=None):
+        """Vuelve a contar y leer desde el proveedor (o uno nuevo)"""
+        self.generacion += 1
+        self.pedidas.clear()
+        if proveedor is not None:
+            self.inicio = 0
+            self.seleccionada = None
+        self.ventana.reiniciar(proveedor)
+        generacion = self.generacion
+        self.tareas.ejecutar(f'lista.{id(self)}.contar', self.ventana.proveedor.contar,
+                             al_terminar=lambda total: self.total_leido(generacion, total))
+
+    def total_leido(self, generacion, total):
+        if generacion != self.generacion:
+            return
+        self.ventana.total = total
+        self.inicio = max(0, min(self.inicio, total - self.visibles))
+        if self.al_contar is not None:
+            self.al_contar(total)
+        self.pintar()
+
+    def pedir_paginas(self):
+        generacion = self.generacion
+        for numero in self.ventana.faltantes(self.inicio, self.visibles):
+            if numero in self.pedidas:
+                continue
+            self.pedidas.add(numero)
+            self.tareas.ejecutar(f'lista.{id(self)}.{numero}', self.ventana.leer, numero,
+                                 al_terminar=lambda filas, n=numero: self.pagina_leida(generacion, n, filas))
+
+    def pagina_leida(self, generacion, numero, filas):
+        if generacion != self.generacion:
+            return
+        self.pedidas.discard(numero)
+        self.ventana.guardar(numero, filas, self.ventana.pagina_de(self.inicio))
+        self.pintar()
+
+    def pintar(self):
+        """Reemplaza las filas del Treeview por el tramo visible"""
+        if not self.tree.winfo_exists():
+            return
+        self.al_seleccionar()
+        self.tree.delete(*self.tree.get_children())
+        for desplazamiento, fila in enumerate(self.ventana.filas(self.inicio, self.visibles)):
+            posicion = self.inicio + desplazamiento
+            valores = self.formatear(fila) if fila is not None else ('…',)
+            self.tree.insert('', tk.END, iid=str(posicion), values=valores)
+        if self.seleccionada is not None and self.tree.exists(str(self.seleccionada)):
+            self.tree.selection_set(str(self.seleccionada))
+        total = self.ventana.total
+        if total:
+            self.scrollbar.set(self.inicio / total, min(1.0, (self.inicio + self.visibles) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self.pedir_paginas()
+
+    def ir_a(self, posicion):
+        posicion = max(0, min(posicion, self.ventana.total - self.visibles))
+        if posicion != self.inicio:
+            self.inicio = posicion
+            self.pintar()
+        return 'break'
+
+    def mover(self, filas):
+        return self.ir_a(self.inicio + filas)
+
+    def desplazar(self, accion, cantidad, unidad=None):
+        """Comando de la barra de desplazamiento (moveto / scroll)"""
+        if accion == 'moveto':
+            self.ir_a(int(float(cantidad) * self.ventana.total))
+        elif accion == 'scroll':
+            paso = self.visibles if unidad == 'pages' else 1
+            self.mover(int(cantidad) * paso)
+
+    def al_rueda(self, event):
+        return self.mover(-3 if event.delta > 0 else 3)
+
+    def mover_seleccion(self, paso):
+        self.al_seleccionar()
+        if self.seleccionada is None:
+            return 'break'
+        destino = max(0, min(self.seleccionada + paso, self.ventana.total - 1))
+        # Quitar la selección vieja antes de pintar, o pintar() la volvería a tomar
+        self.tree.selection_remove(self.tree.selection())
+        self.seleccionada = destino
+        if destino < self.inicio:
+            self.ir_a(destino)
+        elif destino >= self.inicio + self.visibles:
+            self.ir_a(destino - self.visibles + 1)
+        elif self.tree.exists(str(destino)):
+            self.tree.selection_set(str(destino))
+        return 'break'
+
+    def al_seleccionar(self, event=None):
+        seleccion = self.tree.selection()
+        if seleccion:
+            self.seleccionada = int(seleccion[0])
+
+    def al_redimensionar(self, event):
+        hijos = self.tree.get_children()
+        caja = self.tree.bbox(hijos[0]) if hijos else None
+        if caja:
+            encabezado, alto_fila = caja[1], caja[3]
+        else:
+            encabezado, alto_fila = 25, 20
+        visibles = max(1, (event.height - encabezado) // max(alto_fila, 1))
+        if visibles != self.visibles:
+            self.visibles = visibles
+            self.inicio = max(0, min(self.inicio, self.ventana.total - self.visibles))
+            self.pintar()
+
+    def fila_seleccionada(self):
+        """Fila original (sin formatear) seleccionada, aunque no esté visible"""
+        if self.seleccionada is None:
+            return None
+        filas = self.ventana.filas(self.seleccionada, 1)
+        return filas[0] if filas else None
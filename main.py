@@ -1,20 +1,34 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
+import os
+from functools import partial
 from datetime import datetime
 from database import Database
-from accesos_ui import AccesosUI
-from clientes_ui import ClientesUI
-from pagos_ui import PagosUI
-from reportes_ui import ReportesUI
-from configuracion_ui import ConfiguracionUI
+from tareas import EjecutorTareas
+from pantallas import Pantallas
+from lista_virtual import ListaVirtual, ProveedorLista, ProveedorPaginado
+from busqueda_incremental import FiltroRapido
+
+# Las pantallas y la importación se importan al abrirlas: traen matplotlib,
+# pandas, openpyxl y PIL, que el menú y los accesos no usan.
+# benchmarks/bench_arranque.py controla que sigan fuera del arranque.
 
 class GimnasioApp:
     def __init__(self, root):
         self.root = root
         self.db = Database()
+        # Los accesos se confirman por lotes; Database.cerrar() escribe lo pendiente
+        self.db.iniciar_escritor_accesos()
+        # Las consultas pesadas corren en segundo plano (compartido por todas las pantallas)
+        self.tareas = EjecutorTareas(root)
         self.configure_ventana()
-        # self.main_frame ya no se crea aquí, se crea en cada vista
+        # Cada pantalla se arma una vez y después solo se oculta y se muestra
+        self.pantallas = Pantallas(root)
+        for nombre, construir in (('menu', self.construir_menu), ('accesos', self.construir_accesos),
+                                  ('clientes', self.construir_clientes), ('pagos', self.construir_pagos),
+                                  ('reportes', self.construir_reportes),
+                                  ('configuracion', self.construir_configuracion)):
+            self.pantallas.registrar(nombre, construir)
         self.crear_interfaz()
 
     def configure_ventana(self):
@@ -26,14 +40,39 @@ class GimnasioApp:
         self.create_main_menu()
 
     def clear_window(self):
-        """Limpia todos los widgets del frame principal para dibujar una nueva vista."""
-        # Esta implementación destruye todo y lo reconstruye.
+        """Oculta la pantalla actual y destruye las vistas armadas por los métodos de gestión."""
+        # Las pantallas de self.pantallas se conservan, con sus consultas en curso;
+        # los resultados de las vistas destruidas ya no tienen dónde mostrarse
+        self.tareas.cancelar_todas('main.')
+        self.pantallas.ocultar()
         for widget in self.root.winfo_children():
-            widget.destroy()
+            if not self.pantallas.es_pantalla(widget):
+                widget.destroy()
 
-    def create_main_menu(self):
+    def mostrar_pantalla(self, nombre, error=None):
         self.clear_window()
-        main_frame = tk.Frame(self.root, bg='#f0f0f0', padx=20, pady=20)
+        try:
+            return self.pantallas.mostrar(nombre)
+        except Exception as e:
+            messagebox.showerror("Error", f"{error}: {e}")
+            if nombre != 'menu':
+                self.create_main_menu()
+
+    def barra_volver(self, marco):
+        # Frame para botón de volver
+        top_frame = tk.Frame(marco, bg='#f0f0f0')
+        top_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        tk.Button(top_frame, text="← Volver al Menú Principal", 
+                  font=("Arial", 10),
+                  command=self.create_main_menu).pack(side=tk.LEFT)
+        return top_frame
+
+    def create_main_menu(self):
+        self.mostrar_pantalla('menu')
+
+    def construir_menu(self, marco):
+        main_frame = tk.Frame(marco, bg='#f0f0f0', padx=20, pady=20)
         main_frame.pack(fill=tk.BOTH, expand=True)
 
         tk.Label(main_frame, text="GIMNASIO FITNESS", font=("Arial", 20, "bold"), bg='#f0f0f0', fg='#2c3e50').pack(pady=20)
@@ -64,116 +103,57 @@ class GimnasioApp:
 
     def show_accesos(self):
         """Muestra la interfaz de control de accesos (Nueva Versión)"""
-        self.clear_window()
-        
-        # Frame para botón de volver
-        top_frame = tk.Frame(self.root, bg='#f0f0f0')
-        top_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        tk.Button(top_frame, text="← Volver al Menú Principal", 
-                  font=("Arial", 10),
-                  command=self.create_main_menu).pack(side=tk.LEFT)
-        
-        # Inicializar la interfaz de accesos (requiere accesos_ui.py)
-        try:
-            self.accesos_ui = AccesosUI(self.root, self.db)
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo cargar el módulo de accesos: {e}")
-            self.create_main_menu()
+        self.accesos_ui = self.mostrar_pantalla('accesos', "No se pudo cargar el módulo de accesos")
+
+    def construir_accesos(self, marco):
+        from accesos_ui import AccesosUI
+        self.barra_volver(marco)
+        return AccesosUI(marco, self.db)
 
     def show_clientes(self):
-        """Muestra la interfaz de gestión de clientes - VERSIÓN CORREGIDA"""
-        print("🎯 Iniciando show_clientes...")
-        
-        # Limpiar ventana completamente
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
-        # Frame principal MUY SIMPLE
-        main_frame = tk.Frame(self.root, bg='#f0f0f0')
-        main_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Solo botón de volver arriba
-        top_frame = tk.Frame(main_frame, bg='#f0f0f0')
-        top_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        tk.Button(top_frame, text="← Volver al Menú Principal", 
-                font=("Arial", 10),
-                command=self.create_main_menu).pack(side=tk.LEFT)
+        """Muestra la interfaz de gestión de clientes"""
+        self.clientes_ui = self.mostrar_pantalla('clientes', "No se pudo cargar el módulo de clientes")
+
+    def construir_clientes(self, marco):
+        from clientes_ui import ClientesUI
+        barra = self.barra_volver(marco)
+        tk.Button(barra, text="📋 Lista General", font=("Arial", 10),
+                  command=self.lista_clientes).pack(side=tk.RIGHT)
+        # Carga masiva (con reanudación) y sincronización con el CRM
+        tk.Button(barra, text="📥 Carga Masiva / CRM", font=("Arial", 10),
+                  command=self.gestion_clientes).pack(side=tk.RIGHT, padx=5)
         
         # Frame contenedor para ClientesUI
-        clientes_container = tk.Frame(main_frame)
+        clientes_container = tk.Frame(marco)
         clientes_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Inicializar la interfaz de clientes
-        try:
-            print("🔧 Cargando ClientesUI...")
-            self.clientes_ui = ClientesUI(clientes_container, self.db)
-            print("✅ ClientesUI cargada exitosamente")
-        except Exception as e:
-            print(f"❌ Error cargando ClientesUI: {e}")
-            # Mostrar error simple
-            error_label = tk.Label(clientes_container, 
-                                text=f"Error cargando interfaz: {e}", 
-                                fg='red', font=("Arial", 12))
-            error_label.pack(pady=50)
+        return ClientesUI(clientes_container, self.db)
 
     def show_pagos(self):
         """Muestra la interfaz de gestión de pagos"""
-        self.clear_window()
-        
-        # Frame para botón de volver
-        top_frame = tk.Frame(self.root, bg='#f0f0f0')
-        top_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        tk.Button(top_frame, text="← Volver al Menú Principal", 
-                font=("Arial", 10),
-                command=self.create_main_menu).pack(side=tk.LEFT)
-    
-        # Inicializar la interfaz de pagos
-        try:
-            self.pagos_ui = PagosUI(self.root, self.db)
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo cargar el módulo de pagos: {e}")
-            self.create_main_menu()
+        self.pagos_ui = self.mostrar_pantalla('pagos', "No se pudo cargar el módulo de pagos")
+
+    def construir_pagos(self, marco):
+        from pagos_ui import PagosUI
+        self.barra_volver(marco)
+        return PagosUI(marco, self.db)
 
     def show_reportes(self):
         """Muestra la interfaz de reportes y dashboard"""
-        self.clear_window()
-        
-        # Frame para botón de volver
-        top_frame = tk.Frame(self.root, bg='#f0f0f0')
-        top_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        tk.Button(top_frame, text="← Volver al Menú Principal", 
-                font=("Arial", 10),
-                command=self.create_main_menu).pack(side=tk.LEFT)
-        
-        # Inicializar la interfaz de reportes
-        try:
-            self.reportes_ui = ReportesUI(self.root, self.db)
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo cargar el módulo de reportes: {e}")
-            self.create_main_menu()
+        self.reportes_ui = self.mostrar_pantalla('reportes', "No se pudo cargar el módulo de reportes")
+
+    def construir_reportes(self, marco):
+        from reportes_ui import ReportesUI
+        self.barra_volver(marco)
+        return ReportesUI(marco, self.db)
 
     def show_configuracion(self):
         """Muestra la interfaz de configuración"""
-        self.clear_window()
-        
-        # Frame para botón de volver
-        top_frame = tk.Frame(self.root, bg='#f0f0f0')
-        top_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        tk.Button(top_frame, text="← Volver al Menú Principal", 
-                font=("Arial", 10),
-                command=self.create_main_menu).pack(side=tk.LEFT)
-        
-        # Inicializar la interfaz de configuración
-        try:
-            self.configuracion_ui = ConfiguracionUI(self.root, self.db)
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo cargar el módulo de configuración: {e}")
-            self.create_main_menu()
+        self.configuracion_ui = self.mostrar_pantalla('configuracion', "No se pudo cargar el módulo de configuración")
+
+    def construir_configuracion(self, marco):
+        from configuracion_ui import ConfiguracionUI
+        self.barra_volver(marco)
+        return ConfiguracionUI(marco, self.db)
 
     # --- MÉTODOS DE GESTIÓN (Implementaciones Antiguas) ---
 
@@ -190,6 +170,7 @@ class GimnasioApp:
         buttons = [
             ("➕ Registrar Cliente", self.registrar_cliente_individual),
             ("📊 Carga Masiva (Excel)", self.carga_masiva_excel),
+            ("🔄 Sincronizar desde CRM", self.sincronizar_clientes),
             ("📋 Lista General", self.lista_clientes),
             ("🔍 Búsqueda Avanzada", self.buscar_cliente)
         ]
@@ -197,7 +178,7 @@ class GimnasioApp:
         for text, command in buttons:
             tk.Button(button_frame, text=text, command=command, font=("Arial", 11), bg='#27ae60', fg='white', width=30, height=2, relief='flat').pack(pady=8)
 
-        tk.Button(main_frame, text="← Volver al Menú Principal", command=self.create_main_menu, font=("Arial", 10), bg='#e74c3c', fg='white', relief='flat').pack(pady=20)
+        tk.Button(main_frame, text="← Volver a Clientes", command=self.show_clientes, font=("Arial", 10), bg='#e74c3c', fg='white', relief='flat').pack(pady=20)
 
     def registrar_cliente_individual(self):
         self.clear_window()
@@ -246,78 +227,201 @@ class GimnasioApp:
             messagebox.showerror("Error", f"Error al guardar cliente: {str(e)}")
 
     def carga_masiva_excel(self):
-        file_path = filedialog.askopenfilename(title="Seleccionar archivo Excel", filetypes=[("Excel files", "*.xlsx *.xls")])
+        file_path = filedialog.askopenfilename(title="Seleccionar archivo de clientes",
+                                               filetypes=[("Excel o CSV", "*.xlsx *.csv"), ("Excel 97-2003", "*.xls")])
         if not file_path:
             return
-        
+        if file_path.lower().endswith('.xls'):
+            # openpyxl no lee .xls: se carga entero con pandas
+            self.carga_masiva_dataframe(file_path)
+            return
+
+        from importacion import progreso_guardado
+        progreso = progreso_guardado(file_path)
+        if progreso:
+            pregunta = (f"La carga anterior de este archivo se interrumpió después de {progreso['filas']} filas.\n"
+                        f"¿Deseas continuarla desde ahí?")
+        else:
+            pregunta = f"¿Deseas cargar los clientes de {os.path.basename(file_path)}?"
+        if not messagebox.askyesno("Confirmar Carga", pregunta):
+            return
+
+        self.ejecutar_carga(file_path, "Carga masiva", self.mostrar_resultado_carga)
+
+    def sincronizar_clientes(self):
+        """Actualiza clientes desde un export del CRM: primero simula y muestra las diferencias"""
+        file_path = filedialog.askopenfilename(title="Seleccionar export del CRM",
+                                               filetypes=[("Excel o CSV", "*.xlsx *.csv")])
+        if not file_path:
+            return
+        from importacion import borrar_progreso, progreso_guardado
+        if progreso_guardado(file_path, 'actualizar'):
+            # Una sincronización interrumpida se continúa sin volver a simular
+            continuar = messagebox.askyesnocancel("Sincronizar", "La sincronización anterior de este archivo se interrumpió.\n"
+                                                                "¿Deseas continuarla desde donde quedó? (No = empezar de nuevo)")
+            if continuar is None:
+                return
+            if continuar:
+                self.ejecutar_carga(file_path, "Sincronizando", self.mostrar_resultado_carga, actualizar=True)
+                return
+            borrar_progreso(file_path)
+        self.ejecutar_carga(file_path, "Comparando con la base de datos",
+                            lambda resultado: self.confirmar_sincronizacion(file_path, resultado),
+                            actualizar=True, simular=True)
+
+    def confirmar_sincronizacion(self, file_path, simulacion):
+        from importacion import ruta_informe
+        msg = (f"➕ Clientes nuevos: {simulacion['insertados']}\n"
+               f"✏️ Con cambios: {simulacion['actualizados']}\n"
+               f"= Sin cambios: {simulacion['sin_cambios']}\n"
+               f"❌ Rechazados (faltan datos): {simulacion['rechazados']}\n"
+               f"⚠️ Repetidos en el archivo: {simulacion['duplicados']}\n\n"
+               f"Detalle de las diferencias:\n{ruta_informe(file_path)}")
+        if not simulacion['insertados'] and not simulacion['actualizados']:
+            messagebox.showinfo("Sincronizar", "La base de datos ya está al día.\n\n" + msg)
+            return
+        if messagebox.askyesno("Sincronizar", msg + "\n\n¿Aplicar estos cambios?"):
+            self.ejecutar_carga(file_path, "Sincronizando", self.mostrar_resultado_carga, actualizar=True)
+
+    def ejecutar_carga(self, file_path, titulo, al_terminar, **opciones):
+        """Corre importar_archivo en segundo plano con una ventana de avance"""
+        from importacion import importar_archivo
+        ventana = tk.Toplevel(self.root)
+        ventana.title(titulo)
+        ventana.geometry("380x140")
+        ventana.transient(self.root)
+        ventana.grab_set()
+        ventana.protocol("WM_DELETE_WINDOW", lambda: None)
+        estado = tk.Label(ventana, text="Leyendo archivo...", font=("Arial", 10))
+        estado.pack(pady=(15, 5))
+        barra = ttk.Progressbar(ventana, mode='determinate', maximum=100, length=320)
+        barra.pack(pady=5)
+
+        def avanzar(fraccion, progreso):
+            barra['value'] = fraccion * 100
+            estado.config(text=f"{progreso['filas']} filas leídas")
+
+        def terminar(resultado):
+            ventana.destroy()
+            al_terminar(resultado)
+
+        def fallar(error):
+            ventana.destroy()
+            messagebox.showerror("Error", f"La carga se detuvo: {str(error)}\n"
+                                          f"Lo ya registrado se conserva; al volver a cargar el archivo se continúa.")
+
+        def cancelar():
+            # La carga se detiene al terminar el bloque en curso y deja el punto de control
+            self.tareas.cancelar('main.carga_masiva')
+            ventana.destroy()
+            messagebox.showinfo(titulo, "Carga cancelada. Al volver a cargar el archivo se continúa donde quedó.")
+
+        tk.Button(ventana, text="Cancelar", command=cancelar, bg='#e74c3c', fg='white', relief='flat').pack(pady=10)
+        self.tareas.ejecutar('main.carga_masiva', partial(importar_archivo, **opciones), self.db, file_path,
+                             al_terminar=terminar, al_fallar=fallar, al_avanzar=avanzar)
+
+    def carga_masiva_dataframe(self, file_path):
+        import pandas as pd
+        from importacion import COLUMNAS_OBLIGATORIAS, columnas_faltantes, importar_clientes
         try:
             df = pd.read_excel(file_path)
-            required = ['cedula', 'nombre', 'apellido']
-            if not all(col in df.columns for col in required):
-                messagebox.showerror("Error", f"El archivo Excel debe contener las columnas: {', '.join(required)}.")
+            if columnas_faltantes(df):
+                messagebox.showerror("Error", f"El archivo Excel debe contener las columnas: {', '.join(COLUMNAS_OBLIGATORIAS)}.")
                 return
 
             if not messagebox.askyesno("Confirmar Carga", f"Se encontraron {len(df)} registros.\n¿Deseas proceder con la carga masiva?"):
                 return
             
-            registrados, errores, repetidos = 0, 0, []
-            for _, row in df.iterrows():
-                try:
-                    cedula = str(row['cedula']).strip()
-                    if not cedula or not str(row['nombre']).strip() or not str(row['apellido']).strip():
-                        errores += 1
-                        continue
-                    
-                    # Asumiendo que db.insert_cliente existe
-                    if self.db.insert_cliente(cedula, str(row['nombre']).strip(), str(row['apellido']).strip(), str(row.get('telefono', '')).strip(), str(row.get('telefono_emergencia', '')).strip(), str(row.get('direccion', '')).strip(), ""):
-                        registrados += 1
-                    else:
-                        errores += 1
-                        repetidos.append(cedula)
-                except Exception:
-                    errores += 1
-            
-            msg = f"✅ Registrados: {registrados}\n❌ Errores/Duplicados: {errores}"
-            if repetidos:
-                msg += f"\n\nCédulas duplicadas:\n{', '.join(repetidos[:5])}{'...' if len(repetidos) > 5 else ''}"
-            messagebox.showinfo("Resultado de Carga", msg)
-            # self.update_stats() # Este método fue eliminado, ya no es necesario
+            # Ventana modal como en ejecutar_carga: sin navegar, clear_window no descarta el resultado
+            ventana = tk.Toplevel(self.root)
+            ventana.title("Carga Masiva")
+            ventana.geometry("380x100")
+            ventana.transient(self.root)
+            ventana.grab_set()
+            ventana.protocol("WM_DELETE_WINDOW", lambda: None)
+            tk.Label(ventana, text=f"Registrando {len(df)} filas...", font=("Arial", 10)).pack(pady=(15, 5))
+            barra = ttk.Progressbar(ventana, mode='indeterminate', length=320)
+            barra.pack(pady=5)
+            barra.start()
+
+            def terminar(r):
+                ventana.destroy()
+                self.mostrar_resultado_carga(dict(r, duplicados=len(r['duplicados']) + r['omitidos'],
+                                                  ejemplos_duplicados=r['duplicados'][:5]))
+
+            def fallar(e):
+                ventana.destroy()
+                messagebox.showerror("Error", f"No se pudo completar la carga masiva.\n{str(e)}")
+
+            # Validación con pandas e inserción en una sola transacción, fuera del hilo de Tk
+            self.tareas.ejecutar('main.carga_masiva', importar_clientes, self.db, df,
+                                 al_terminar=terminar, al_fallar=fallar)
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo procesar el archivo Excel.\n{str(e)}")
 
+    def mostrar_resultado_carga(self, resultado):
+        repetidos, duplicados = resultado['ejemplos_duplicados'], resultado['duplicados']
+        msg = f"✅ Registrados: {resultado['insertados']}\n"
+        if resultado.get('actualizados'):
+            msg += f"✏️ Actualizados: {resultado['actualizados']}\n"
+        msg += (f"⚠️ Duplicados: {duplicados}\n"
+                f"❌ Rechazados (faltan datos): {resultado['rechazados']}")
+        if resultado.get('reanudado_desde'):
+            msg += f"\n\n(Continuada desde la fila {resultado['reanudado_desde']})"
+        if repetidos:
+            msg += f"\n\nCédulas duplicadas:\n{', '.join(repetidos[:5])}{'...' if duplicados > 5 else ''}"
+        messagebox.showinfo("Resultado de Carga", msg)
+
     def lista_clientes(self):
         self.clear_window()
         main_frame = tk.Frame(self.root, bg='#f0f0f0', padx=20, pady=20)
         main_frame.pack(fill=tk.BOTH, expand=True)
         tk.Label(main_frame, text="Lista General de Clientes", font=("Arial", 16, "bold"), bg='#f0f0f0', fg='#2c3e50').pack(pady=20)
+
+        filtro_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        filtro_frame.pack(fill=tk.X)
+        tk.Label(filtro_frame, text="Búsqueda rápida:", font=("Arial", 10), bg='#f0f0f0').pack(side=tk.LEFT, padx=(0, 10))
+        filtro_entry = tk.Entry(filtro_frame, font=("Arial", 10), width=30)
+        filtro_entry.pack(side=tk.LEFT)
+        contador = tk.Label(filtro_frame, text="", font=("Arial", 10), bg='#f0f0f0')
+        contador.pack(side=tk.RIGHT)
         
         tree_frame = tk.Frame(main_frame)
         tree_frame.pack(fill=tk.BOTH, expand=True, pady=10)
-        
-        try:
-            # Asumiendo que db.get_all_clientes() existe
-            clientes = self.db.get_all_clientes() 
-            if not clientes:
-                tk.Label(tree_frame, text="No hay clientes registrados.", font=("Arial", 12), bg='#f0f0f0').pack(pady=50)
-            else:
-                columns = ('Cédula', 'Nombre', 'Apellido', 'Teléfono')
-                tree = ttk.Treeview(tree_frame, columns=columns, show='headings')
-                for col in columns:
-                    tree.heading(col, text=col)
-                    tree.column(col, width=150, anchor='center')
-                
-                for cliente in clientes:
-                    tree.insert('', tk.END, values=(cliente[0], cliente[1], cliente[2], cliente[3]))
-                
-                scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=tree.yview)
-                tree.configure(yscroll=scrollbar.set)
-                scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-                tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        except Exception as e:
-            tk.Label(tree_frame, text=f"Error al cargar clientes: {e}", font=("Arial", 12), fg='red', bg='#f0f0f0').pack(pady=50)
+        sin_clientes = tk.Label(tree_frame, text="No hay clientes registrados.", font=("Arial", 12), bg='#f0f0f0')
+        
+        columns = ('Cédula', 'Nombre', 'Apellido', 'Teléfono')
+        lista = ListaVirtual(tree_frame, columns, self.proveedor_clientes(),
+                             formatear=lambda c: (c[0], c[1], c[2], c[3]),
+                             anchos=dict.fromkeys(columns, 150),
+                             al_contar=lambda total: self.total_clientes(filtro, lista, sin_clientes, contador, total))
+        lista.pack(fill=tk.BOTH, expand=True)
+        # Mismas columnas que muestra la tabla; la copia se arma con la primera tecla
+        filtro = FiltroRapido(lista, self.tareas, 'main.indice_clientes', self.db.get_all_clientes,
+                              self.proveedor_clientes, columnas_busqueda=(0, 1, 2, 3))
+        filtro_entry.bind('<KeyRelease>', lambda e: filtro.filtrar(filtro_entry.get()))
+        tk.Button(filtro_frame, text="🔄 Actualizar", command=lambda: filtro.recargar(filtro_entry.get()),
+                  relief='flat').pack(side=tk.LEFT, padx=10)
             
         tk.Button(main_frame, text="← Volver", command=self.show_clientes, bg='#e74c3c', fg='white', relief='flat').pack(pady=10)
 
+    def proveedor_clientes(self):
+        return ProveedorPaginado(self.db.contar_clientes, self.db.pagina_clientes,
+                                 self.db.clave_cliente_en, clave=lambda c: (c[1], c[2], c[0]))
+
+    def total_clientes(self, filtro, lista, sin_clientes, contador, total):
+        if filtro.filtrando():
+            contador.config(text=f"Mostrando {total} de {len(filtro.indice)} clientes")
+            return
+        contador.config(text=f"Total de clientes: {total}")
+        # Sin clientes se muestra el aviso; al volver a contar con clientes, la lista
+        if total == 0:
+            lista.pack_forget()
+            sin_clientes.pack(pady=50)
+        elif not lista.winfo_manager():
+            sin_clientes.pack_forget()
+            lista.pack(fill=tk.BOTH, expand=True)
+
     def buscar_cliente(self):
         self.clear_window()
         main_frame = tk.Frame(self.root, bg='#f0f0f0', padx=20, pady=20)
@@ -356,15 +460,12 @@ class GimnasioApp:
         resultados_frame = tk.Frame(main_frame)
         resultados_frame.pack(fill=tk.BOTH, expand=True, pady=(5,0))
         columns = ('Cédula', 'Nombre', 'Apellido', 'Teléfono', 'Estado', 'Vence')
-        self.tree_resultados = ttk.Treeview(resultados_frame, columns=columns, show='headings', height=8)
-        column_config = [('Cédula', 100), ('Nombre', 150), ('Apellido', 150), ('Teléfono', 100), ('Estado', 80), ('Vence', 100)]
-        for col, width in column_config:
-            self.tree_resultados.heading(col, text=col)
-            self.tree_resultados.column(col, width=width, anchor='center')
-        scrollbar = ttk.Scrollbar(resultados_frame, orient=tk.VERTICAL, command=self.tree_resultados.yview)
-        self.tree_resultados.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.tree_resultados.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        column_config = {'Cédula': 100, 'Nombre': 150, 'Apellido': 150, 'Teléfono': 100, 'Estado': 80, 'Vence': 100}
+        # Los resultados quedan en memoria; el Treeview solo tiene las filas visibles
+        self.lista_resultados = ListaVirtual(resultados_frame, columns, ProveedorLista([]),
+                                             formatear=self.formatear_resultado, anchos=column_config, height=8)
+        self.lista_resultados.pack(fill=tk.BOTH, expand=True)
+        self.tree_resultados = self.lista_resultados.tree
 
         self.contador_label = tk.Label(main_frame, text="", font=("Arial", 9), bg='#f0f0f0', fg='#34495e')
         self.contador_label.pack(pady=5)
@@ -378,36 +479,35 @@ class GimnasioApp:
         self.ejecutar_busqueda()
 
     def ejecutar_busqueda(self):
-        try:
-            criterios = {field: entry.get().strip() for field, entry in self.busqueda_entries.items() if entry.get().strip()}
-            estado = self.estado_var.get()
-            
-            # Asumiendo que db.buscar_clientes existe
-            resultados = self.db.buscar_clientes(criterios, estado)
-            
-            self.tree_resultados.delete(*self.tree_resultados.get_children())
-            
-            for cliente in resultados:
-                # La data del cliente viene de db.buscar_clientes
-                # (cedula, nombre, apellido, telefono, ..., fecha_vencimiento, estado_pago)
-                # Indices: 0-cedula, 1-nombre, 2-apellido, 3-telefono, 8-fecha_vencimiento, 9-estado_pago
-                cedula = cliente[0]
-                nombre = cliente[1]
-                apellido = cliente[2]
-                telefono = cliente[3]
-                fecha_venc = cliente[8] if len(cliente) > 8 and cliente[8] else "N/A"
-                estado_pago = cliente[9] if len(cliente) > 9 and cliente[9] else "Sin pago"
-
-                if estado_pago == "Activo" and fecha_venc != "N/A":
-                    venc_dt = datetime.strptime(fecha_venc, '%Y-%m-%d').strftime('%d/%m/%Y')
-                else:
-                    venc_dt = "N/A"
-                    
-                self.tree_resultados.insert('', tk.END, values=(cedula, nombre, apellido, telefono, estado_pago, venc_dt))
+        criterios = {field: entry.get().strip() for field, entry in self.busqueda_entries.items() if entry.get().strip()}
+        estado = self.estado_var.get()
+        
+        # Una búsqueda nueva descarta el resultado de la anterior si aún no llegó
+        self.tareas.ejecutar('main.busqueda', self.db.buscar_clientes, criterios, estado,
+                             al_terminar=self.mostrar_resultados_busqueda,
+                             al_fallar=lambda e: messagebox.showerror("Error", f"Error en la búsqueda: {str(e)}"))
+
+    def mostrar_resultados_busqueda(self, resultados):
+        self.lista_resultados.recargar(ProveedorLista(resultados))
+        self.contador_label.config(text=f"Se encontraron {len(resultados)} cliente(s)")
+
+    def formatear_resultado(self, cliente):
+        # La data del cliente viene de db.buscar_clientes
+        # (cedula, nombre, apellido, telefono, ..., fecha_vencimiento, estado_pago)
+        # Indices: 0-cedula, 1-nombre, 2-apellido, 3-telefono, 8-fecha_vencimiento, 9-estado_pago
+        cedula = cliente[0]
+        nombre = cliente[1]
+        apellido = cliente[2]
+        telefono = cliente[3]
+        fecha_venc = cliente[8] if len(cliente) > 8 and cliente[8] else "N/A"
+        estado_pago = cliente[9] if len(cliente) > 9 and cliente[9] else "Sin pago"
+
+        if estado_pago == "Activo" and fecha_venc != "N/A":
+            venc_dt = datetime.strptime(fecha_venc, '%Y-%m-%d').strftime('%d/%m/%Y')
+        else:
+            venc_dt = "N/A"
             
-            self.contador_label.config(text=f"Se encontraron {len(resultados)} cliente(s)")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error en la búsqueda: {str(e)}")
+        return (cedula, nombre, apellido, telefono, estado_pago, venc_dt)
 
     def limpiar_busqueda(self):
         for entry in self.busqueda_entries.values():
@@ -649,7 +749,7 @@ class GimnasioApp:
         self.historial_pagos_cedula(cedula)
         # Necesitamos cambiar el botón "Volver" de esa vista
         for widget in self.root.winfo_children():
-            if isinstance(widget, tk.Frame):
+            if isinstance(widget, tk.Frame) and not self.pantallas.es_pantalla(widget):
                 for w_child in widget.winfo_children():
                     if isinstance(w_child, tk.Button) and "Volver" in w_child.cget("text"):
                         w_child.config(text="← Volver a Gestión de Pagos", command=self.gestion_pagos)
@@ -666,31 +766,25 @@ class GimnasioApp:
         tree_frame = tk.Frame(main_frame)
         tree_frame.pack(fill=tk.BOTH, expand=True, pady=10)
         
+        self.tareas.ejecutar('main.vista', self.db.get_clientes_vencidos,
+                             al_terminar=lambda clientes: self.mostrar_clientes_vencidos(tree_frame, clientes),
+                             al_fallar=lambda e: tk.Label(tree_frame, text=f"Error al cargar clientes vencidos: {e}", font=("Arial", 12), fg='red', bg='#f0f0f0').pack(pady=50))
+        
+        tk.Button(main_frame, text="← Volver", command=self.gestion_pagos, font=("Arial", 10), bg='#e74c3c', fg='white', relief='flat').pack(pady=10)
+
+    def mostrar_clientes_vencidos(self, tree_frame, clientes):
         try:
-            # Asumiendo que db.get_clientes_vencidos() existe
-            clientes = self.db.get_clientes_vencidos() 
             if not clientes:
                 tk.Label(tree_frame, text="¡No hay clientes con membresías vencidas!", font=("Arial", 12), fg='green', bg='#f0f0f0').pack(pady=50)
             else:
                 columns = ('Cédula', 'Nombre', 'Apellido', 'Vencimiento')
-                tree = ttk.Treeview(tree_frame, columns=columns, show='headings')
-                for col in columns:
-                    tree.heading(col, text=col)
-                    tree.column(col, anchor='center', width=150)
-                
-                for cliente in clientes:
-                    # Asumiendo que cliente[3] es la fecha de vencimiento
-                    vencimiento = datetime.strptime(cliente[3], '%Y-%m-%d').strftime('%d/%m/%Y')
-                    tree.insert('', tk.END, values=(cliente[0], cliente[1], cliente[2], vencimiento))
-                
-                scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=tree.yview)
-                tree.configure(yscroll=scrollbar.set)
-                scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-                tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+                # cliente[3] es la fecha de vencimiento; solo se formatean las filas visibles
+                lista = ListaVirtual(tree_frame, columns, ProveedorLista(clientes),
+                                     formatear=lambda c: (c[0], c[1], c[2], datetime.strptime(c[3], '%Y-%m-%d').strftime('%d/%m/%Y')),
+                                     anchos=dict.fromkeys(columns, 150))
+                lista.pack(fill=tk.BOTH, expand=True)
         except Exception as e:
             tk.Label(tree_frame, text=f"Error al cargar clientes vencidos: {e}", font=("Arial", 12), fg='red', bg='#f0f0f0').pack(pady=50)
-        
-        tk.Button(main_frame, text="← Volver", command=self.gestion_pagos, font=("Arial", 10), bg='#e74c3c', fg='white', relief='flat').pack(pady=10)
 
     def reportes(self):
         messagebox.showinfo("Próximamente", "Módulo de Reportes General - En desarrollo")
@@ -701,4 +795,8 @@ class GimnasioApp:
 if __name__ == "__main__":
     root = tk.Tk()
     app = GimnasioApp(root)
-    root.mainloop()
\ No newline at end of file
+    try:
+        root.mainloop()
+    finally:
+        app.tareas.cerrar()
+        app.db.cerrar()
\ No newline at end of file
@@ -2,12 +2,15 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime, timedelta
 import sqlite3
+from tareas import ejecutor_de
+from lista_virtual import ListaVirtual, ProveedorLista, ProveedorPaginado
 
 class PagosUI:
     def __init__(self, parent, db):
         self.parent = parent
         self.db = db
         self.cliente_actual = None
+        self.tareas = ejecutor_de(parent)
         self.setup_ui()
     
     def setup_ui(self):
@@ -145,7 +148,6 @@ class PagosUI:
         tree_frame.pack(fill=tk.BOTH, expand=True, pady=10)
         
         columns = ('id', 'cedula', 'cliente', 'monto', 'duracion', 'fecha_pago', 'fecha_vencimiento', 'metodo', 'estado')
-        self.historial_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=15)
         
         # Configurar columnas
         column_config = [
@@ -160,18 +162,13 @@ class PagosUI:
             ('estado', 'Estado', 80)
         ]
         
-        for col, heading, width in column_config:
-            self.historial_tree.heading(col, text=heading)
-            self.historial_tree.column(col, width=width)
-        
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.historial_tree.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.historial_tree.configure(yscrollcommand=scrollbar.set)
-        self.historial_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        # Cargar todos los pagos inicialmente
-        self.cargar_todos_pagos()
+        # Lista virtual: empieza con todos los pagos, leídos por páginas
+        self.lista_historial = ListaVirtual(
+            tree_frame, columns, self.proveedor_pagos(), formatear=self.formatear_pago,
+            encabezados={col: heading for col, heading, _ in column_config},
+            anchos={col: width for col, _, width in column_config}, height=15)
+        self.lista_historial.pack(fill=tk.BOTH, expand=True)
+        self.historial_tree = self.lista_historial.tree
     
     def setup_tab_vencidos(self):
         """Configura la pestaña de clientes vencidos"""
@@ -193,7 +190,6 @@ class PagosUI:
         tree_frame.pack(fill=tk.BOTH, expand=True, pady=10)
         
         columns = ('cedula', 'cliente', 'telefono', 'fecha_vencimiento', 'dias_vencido')
-        self.vencidos_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=15)
         
         column_config = [
             ('cedula', 'Cédula', 100),
@@ -203,14 +199,12 @@ class PagosUI:
             ('dias_vencido', 'Días Vencido', 100)
         ]
         
-        for col, heading, width in column_config:
-            self.vencidos_tree.heading(col, text=heading)
-            self.vencidos_tree.column(col, width=width)
-        
-        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.vencidos_tree.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.vencidos_tree.configure(yscrollcommand=scrollbar.set)
-        self.vencidos_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.lista_vencidos = ListaVirtual(
+            tree_frame, columns, ProveedorLista([]), formatear=self.formatear_vencido,
+            encabezados={col: heading for col, heading, _ in column_config},
+            anchos={col: width for col, _, width in column_config}, height=15)
+        self.lista_vencidos.pack(fill=tk.BOTH, expand=True)
+        self.vencidos_tree = self.lista_vencidos.tree
         
         # Bind para selección
         self.vencidos_tree.bind('<<TreeviewSelect>>', self.on_vencido_select)
@@ -340,95 +334,70 @@ class PagosUI:
             messagebox.showwarning("Advertencia", "Ingrese una cédula")
             return
         
-        try:
-            # Limpiar treeview
-            for item in self.historial_tree.get_children():
-                self.historial_tree.delete(item)
-            
-            # Obtener pagos del cliente
-            pagos = self.db.get_pagos_by_cliente(cedula)
-            
-            if not pagos:
-                messagebox.showinfo("Info", "No se encontraron pagos para esta cédula")
-                return
-            
-            # Obtener información del cliente
-            cliente = self.db.get_cliente_by_cedula(cedula)
-            nombre_cliente = f"{cliente[1]} {cliente[2]}" if cliente else "N/A"
-            
-            # Agregar pagos al treeview
-            for pago in pagos:
-                estado = "ACTIVO" if pago[7] == 1 else "INACTIVO"
-                self.historial_tree.insert('', 'end', values=(
-                    pago[0], cedula, nombre_cliente, f"${pago[2]:.2f}", 
-                    f"{pago[3]} mes(es)", pago[4], pago[5], pago[6], estado
-                ))
-            
-            messagebox.showinfo("Éxito", f"Se encontraron {len(pagos)} pagos")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo cargar el historial: {e}")
+        # Comparte clave con cargar_todos_pagos: gana la última solicitud
+        self.tareas.ejecutar('pagos.historial', self.leer_historial, cedula,
+                             al_terminar=lambda pagos: self.mostrar_historial(cedula, pagos),
+                             al_fallar=lambda e: messagebox.showerror(
+                                 "Error", f"No se pudo cargar el historial: {e}"))
+    
+    def leer_historial(self, cedula):
+        """Pagos del cliente con las mismas columnas que Database.pagina_pagos"""
+        pagos = self.db.get_pagos_by_cliente(cedula)
+        cliente = self.db.get_cliente_by_cedula(cedula) if pagos else None
+        nombre, apellido = (cliente[1], cliente[2]) if cliente else (None, None)
+        return [(p[0], p[1], nombre, apellido) + tuple(p[2:8]) for p in pagos]
+    
+    def mostrar_historial(self, cedula, pagos):
+        if not pagos:
+            messagebox.showinfo("Info", "No se encontraron pagos para esta cédula")
+            return
+        
+        self.lista_historial.recargar(ProveedorLista(pagos))
+        messagebox.showinfo("Éxito", f"Se encontraron {len(pagos)} pagos")
+    
+    def proveedor_pagos(self):
+        """Todos los pagos, del más reciente al más antiguo, paginados por (fecha_pago, id)"""
+        return ProveedorPaginado(self.db.contar_pagos, self.db.pagina_pagos,
+                                 self.db.clave_pago_en, clave=lambda p: (p[6], p[0]))
+    
+    def formatear_pago(self, pago):
+        (id_pago, cedula, nombre, apellido, monto, duracion,
+         fecha_pago, fecha_vencimiento, metodo, activo) = pago
+        nombre_cliente = f"{nombre} {apellido}" if nombre is not None else "N/A"
+        estado = "ACTIVO" if activo == 1 else "INACTIVO"
+        return (id_pago, cedula, nombre_cliente, f"${monto:.2f}", 
+                f"{duracion} mes(es)", fecha_pago, fecha_vencimiento, metodo, estado)
     
     def cargar_todos_pagos(self):
         """Carga todos los pagos del sistema"""
-        try:
-            # Limpiar treeview
-            for item in self.historial_tree.get_children():
-                self.historial_tree.delete(item)
-            
-            # Obtener todos los clientes y sus pagos
-            clientes = self.db.get_all_clientes()
-            total_pagos = 0
-            
-            for cliente in clientes:
-                cedula = cliente[0]
-                pagos = self.db.get_pagos_by_cliente(cedula)
-                nombre_cliente = f"{cliente[1]} {cliente[2]}"
-                
-                for pago in pagos:
-                    estado = "ACTIVO" if pago[7] == 1 else "INACTIVO"
-                    self.historial_tree.insert('', 'end', values=(
-                        pago[0], cedula, nombre_cliente, f"${pago[2]:.2f}", 
-                        f"{pago[3]} mes(es)", pago[4], pago[5], pago[6], estado
-                    ))
-                    total_pagos += 1
-            
-            self.hist_cedula_var.set("")  # Limpiar búsqueda
-            print(f"✅ Cargados {total_pagos} pagos en total")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudieron cargar los pagos: {e}")
+        # Una búsqueda por cédula pendiente no debe reemplazar el listado completo
+        self.tareas.cancelar('pagos.historial')
+        self.lista_historial.recargar(self.proveedor_pagos())
+        self.hist_cedula_var.set("")  # Limpiar búsqueda
+    
+    def refrescar(self):
+        """Al volver a la pantalla (ver Pantallas): vuelve a leer las listas, no los widgets"""
+        self.cargar_clientes_vencidos()
+        if self.hist_cedula_var.get().strip():
+            self.cargar_historial()
+        else:
+            self.lista_historial.recargar()
     
     def cargar_clientes_vencidos(self):
         """Carga la lista de clientes vencidos"""
+        self.tareas.ejecutar('pagos.vencidos', self.db.get_clientes_vencidos,
+                             al_terminar=self.mostrar_clientes_vencidos,
+                             al_fallar=lambda e: messagebox.showerror(
+                                 "Error", f"No se pudieron cargar clientes vencidos: {e}"))
+    
+    def mostrar_clientes_vencidos(self, clientes_vencidos):
         try:
-            # Limpiar treeview
-            for item in self.vencidos_tree.get_children():
-                self.vencidos_tree.delete(item)
-            
-            # Obtener clientes vencidos
-            clientes_vencidos = self.db.get_clientes_vencidos()
+            self.lista_vencidos.recargar(ProveedorLista(clientes_vencidos))
             
             if not clientes_vencidos:
                 self.contador_vencidos.config(text="✅ No hay clientes vencidos", foreground='green')
                 return
             
-            hoy = datetime.now().date()
-            
-            for cliente in clientes_vencidos:
-                cedula = cliente[0]
-                nombre_cliente = f"{cliente[1]} {cliente[2]}"
-                telefono = cliente[3] or "N/A"
-                fecha_vencimiento = cliente[4]
-                
-                # Calcular días vencidos
-                vencimiento = datetime.strptime(fecha_vencimiento, '%Y-%m-%d').date()
-                dias_vencido = (hoy - vencimiento).days
-                
-                self.vencidos_tree.insert('', 'end', values=(
-                    cedula, nombre_cliente, telefono, fecha_vencimiento, dias_vencido
-                ))
-            
             self.contador_vencidos.config(
                 text=f"⚠️ {len(clientes_vencidos)} clientes vencidos", 
                 foreground='red'
@@ -437,6 +406,18 @@ class PagosUI:
         except Exception as e:
             messagebox.showerror("Error", f"No se pudieron cargar clientes vencidos: {e}")
     
+    def formatear_vencido(self, cliente):
+        cedula = cliente[0]
+        nombre_cliente = f"{cliente[1]} {cliente[2]}"
+        fecha_vencimiento = cliente[3]
+        telefono = cliente[4] or "N/A"
+        
+        # Calcular días vencidos
+        vencimiento = datetime.strptime(fecha_vencimiento, '%Y-%m-%d').date()
+        dias_vencido = (datetime.now().date() - vencimiento).days
+        
+        return (cedula, nombre_cliente, telefono, fecha_vencimiento, dias_vencido)
+    
     def on_vencido_select(self, event):
         """Cuando se selecciona un cliente vencido"""
         selection = self.vencidos_tree.selection()
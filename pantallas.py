@@ -0,0 +1,61 @@
+import tkinter as tk
+
+
+class Pantallas:
+    """Pantallas de la ventana principal, construidas una sola vez.
+
+    mostrar(nombre) oculta la pantalla actual con pack_forget y muestra la
+    pedida. La primera vez la arma con la función registrada; las siguientes
+    solo llama al refrescar() del objeto que devolvió (si lo tiene), que
+    recarga los datos sin volver a crear widgets ni figuras.
+    """
+
+    def __init__(self, root, crear_marco=None):
+        self.root = root
+        self.crear_marco = crear_marco or (lambda: tk.Frame(root, bg='#f0f0f0'))
+        self.constructores = {}
+        self.marcos = {}
+        self.objetos = {}
+        self.actual = None
+
+    def registrar(self, nombre, construir):
+        """construir(marco) arma la pantalla dentro de marco y devuelve su objeto"""
+        self.constructores[nombre] = construir
+
+    def mostrar(self, nombre):
+        self.ocultar()
+        marco = self.marcos.get(nombre)
+        if marco is None:
+            marco = self.crear_marco()
+            marco.pack(fill=tk.BOTH, expand=True)
+            self.marcos[nombre] = marco
+            try:
+                self.objetos[nombre] = self.constructores[nombre](marco)
+            except Exception:
+                # Una pantalla a medio armar no se guarda: se reintenta en la próxima visita
+                self.descartar(nombre)
+                raise
+        else:
+            marco.pack(fill=tk.BOTH, expand=True)
+            refrescar = getattr(self.objetos.get(nombre), 'refrescar', None)
+            if refrescar is not None:
+                refrescar()
+        self.actual = nombre
+        return self.objetos.get(nombre)
+
+    def ocultar(self):
+        if self.actual is not None:
+            self.marcos[self.actual].pack_forget()
+            self.actual = None
+
+    def descartar(self, nombre):
+        """Destruye la pantalla; la próxima visita la vuelve a armar"""
+        marco = self.marcos.pop(nombre, None)
+        self.objetos.pop(nombre, None)
+        if self.actual == nombre:
+            self.actual = None
+        if marco is not None:
+            marco.destroy()
+
+    def es_pantalla(self, widget):
+        return any(widget is marco for marco in self.marcos.values())
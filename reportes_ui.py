@@ -1,15 +1,70 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
+from tkinter import ttk, messagebox, filedialog
+from datetime import date, datetime, timedelta
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import pandas as pd
 import os
+from functools import partial
+from tareas import ejecutor_de
+from graficos import GraficoBarras, GraficoDobleEje, GraficoTorta
+from exportacion import (ENCABEZADOS_ACCESOS, ENCABEZADOS_CLIENTES, ENCABEZADOS_PAGOS,
+                         exportar_con_avance, exportar_filas)
+
+
+MESES = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 'Julio',
+         'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
+# Meses que muestran los gráficos del dashboard y de tendencias
+MESES_GRAFICOS = 6
+# Cada cuánto el modo en vivo busca cambios; a lo sumo un redibujado por vuelta
+INTERVALO_VIVO_MS = 2000
+# Partes del dashboard que dependen de cada tabla (los accesos no se muestran)
+PARTES_POR_TABLA = {
+    'clientes': {'metricas', 'estado', 'avanzadas'},
+    'pagos': {'metricas', 'estado', 'ingresos', 'avanzadas', 'tendencia'},
+    'accesos': set(),
+}
+PARTES_DASHBOARD = set().union(*PARTES_POR_TABLA.values())
+
+
+def partes_afectadas(tablas):
+    """Partes del dashboard que hay que volver a dibujar si cambiaron `tablas`"""
+    return set().union(*(PARTES_POR_TABLA.get(tabla, set()) for tabla in tablas))
+
+
+def inicio_de_meses(hoy, meses):
+    """Primer día del mes que deja `meses` meses contando el actual"""
+    mes = hoy.month - (meses - 1)
+    año = hoy.year + (mes - 1) // 12
+    return date(año, (mes - 1) % 12 + 1, 1)
+
+
+def rango_periodo(periodo, hoy=None):
+    """Fechas (desde, hasta) inclusive de un período del selector de reportes"""
+    hoy = hoy or date.today()
+    if periodo == "este_año":
+        return date(hoy.year, 1, 1), hoy
+    if periodo == "3_meses":
+        # El mes actual y los dos anteriores
+        return inicio_de_meses(hoy, 3), hoy
+    return hoy.replace(day=1), hoy
+
+
+def nombre_mes(mes, abreviado=False):
+    """'2026-03' -> 'Marzo 2026' (o 'Mar')"""
+    año, numero = mes.split('-')
+    nombre = MESES[int(numero) - 1]
+    return nombre[:3] if abreviado else f"{nombre} {año}"
+
 
 class ReportesUI:
     def __init__(self, parent, db):
         self.parent = parent
         self.db = db
+        self.tareas = ejecutor_de(parent)
+        # Versiones de las tablas que muestra el dashboard (ver Database.cambios)
+        self.versiones_vistas = {}
+        self.revision_vivo = None
+        self.leyendo_dashboard = False
         self.setup_ui()
     
     def setup_ui(self):
@@ -42,8 +97,8 @@ class ReportesUI:
         self.setup_tab_reportes()
         self.setup_tab_estadisticas()
         
-        # Cargar datos iniciales
-        self.actualizar_dashboard()
+        # Cargar datos iniciales; el aviso queda solo para el botón Actualizar
+        self.actualizar_dashboard(avisar=False)
     
     def setup_tab_dashboard(self):
         """Configura el dashboard principal"""
@@ -57,6 +112,13 @@ class ReportesUI:
         ttk.Button(top_frame, text="🔄 Actualizar Dashboard", 
                   command=self.actualizar_dashboard).pack(side=tk.LEFT, padx=5)
         
+        self.en_vivo_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top_frame, text="⚡ En vivo", variable=self.en_vivo_var,
+                        command=self.cambiar_modo_vivo).pack(side=tk.LEFT, padx=5)
+        
+        self.actualizado_label = ttk.Label(top_frame, text="", foreground='gray')
+        self.actualizado_label.pack(side=tk.LEFT, padx=5)
+        
         # Frame para métricas rápidas
         metricas_frame = ttk.LabelFrame(main_frame, text="📊 Métricas Rápidas")
         metricas_frame.pack(fill=tk.X, pady=10)
@@ -91,19 +153,22 @@ class ReportesUI:
         ingresos_frame = ttk.LabelFrame(graficos_frame, text="📈 Ingresos Mensuales")
         ingresos_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
         
-        self.fig_ingresos = plt.Figure(figsize=(6, 4), dpi=80)
-        self.ax_ingresos = self.fig_ingresos.add_subplot(111)
+        self.fig_ingresos = Figure(figsize=(6, 4), dpi=80)
         self.canvas_ingresos = FigureCanvasTkAgg(self.fig_ingresos, ingresos_frame)
         self.canvas_ingresos.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.grafico_ingresos = GraficoBarras(self.fig_ingresos, self.canvas_ingresos,
+                                              'Ingresos Mensuales', 'Ingresos ($)', '#3498db')
         
         # Gráfico de estado de clientes
         estado_frame = ttk.LabelFrame(graficos_frame, text="👥 Estado de Clientes")
         estado_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5, 0))
         
-        self.fig_estado = plt.Figure(figsize=(6, 4), dpi=80)
-        self.ax_estado = self.fig_estado.add_subplot(111)
+        self.fig_estado = Figure(figsize=(6, 4), dpi=80)
         self.canvas_estado = FigureCanvasTkAgg(self.fig_estado, estado_frame)
         self.canvas_estado.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.grafico_estado = GraficoTorta(self.fig_estado, self.canvas_estado, 'Estado de Clientes',
+                                           ['Activos', 'Vencidos', 'Sin Pago'],
+                                           ['#27ae60', '#e74c3c', '#95a5a6'])
     
     def setup_tab_reportes(self):
         """Configura la pestaña de reportes detallados"""
@@ -147,6 +212,9 @@ class ReportesUI:
         ttk.Button(btn_frame, text="📄 Exportar a Excel", 
                   command=self.exportar_excel).pack(side=tk.LEFT, padx=5)
         
+        ttk.Button(btn_frame, text="📦 Exportar Detalle", 
+                  command=self.exportar_detalle).pack(side=tk.LEFT, padx=5)
+        
         ttk.Button(btn_frame, text="🖨️ Imprimir Reporte", 
                   command=self.imprimir_reporte).pack(side=tk.LEFT, padx=5)
         
@@ -171,10 +239,13 @@ class ReportesUI:
         crecimiento_frame.pack(fill=tk.BOTH, expand=True, pady=10)
         
         # Gráfico de tendencia
-        self.fig_tendencia = plt.Figure(figsize=(10, 6), dpi=80)
-        self.ax_tendencia = self.fig_tendencia.add_subplot(111)
+        self.fig_tendencia = Figure(figsize=(10, 6), dpi=80)
         self.canvas_tendencia = FigureCanvasTkAgg(self.fig_tendencia, crecimiento_frame)
         self.canvas_tendencia.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.grafico_tendencia = GraficoDobleEje(self.fig_tendencia, self.canvas_tendencia,
+                                                 'Tendencia: Clientes vs Ingresos',
+                                                 ('Clientes Activos', '#3498db', 'o', 8),
+                                                 ('Ingresos ($)', '#e74c3c', 's', 6))
         
         # Frame para estadísticas numéricas
         stats_frame = ttk.Frame(main_frame)
@@ -200,163 +271,155 @@ class ReportesUI:
         for i in range(4):
             stats_frame.grid_columnconfigure(i, weight=1)
     
-    def actualizar_dashboard(self):
-        """Actualiza todo el dashboard"""
+    def actualizar_dashboard(self, partes=PARTES_DASHBOARD, avisar=True):
+        """Actualiza el dashboard (solo `partes` en el modo en vivo)"""
+        # Una sola tarea en segundo plano lee todo lo que muestra el tablero
+        self.leyendo_dashboard = True
+        self.tareas.ejecutar('reportes.dashboard', self.leer_dashboard,
+                             al_terminar=partial(self.mostrar_dashboard, partes=partes, avisar=avisar),
+                             al_fallar=partial(self.error_dashboard, avisar=avisar))
+    
+    def leer_dashboard(self):
+        """Estadísticas y reportes de los últimos meses (corre fuera del hilo de Tk)"""
+        hoy = date.today()
+        desde = inicio_de_meses(hoy, MESES_GRAFICOS)
+        # Versiones antes de leer: un cambio que llegue durante la lectura se ve en la próxima vuelta
+        versiones, _ = self.db.cambios()
+        # Lo que no cambió sale de las cachés de Database
+        return (versiones, self.db.estadisticas(),
+                self.db.reporte('pagos_mensuales', desde, hoy),
+                self.db.reporte('tendencia', desde, hoy))
+    
+    def cambiar_modo_vivo(self):
+        if self.revision_vivo is not None:
+            self.parent.after_cancel(self.revision_vivo)
+            self.revision_vivo = None
+        if self.en_vivo_var.get():
+            self.revisar_cambios()
+    
+    def revisar_cambios(self):
+        """Vuelta del modo en vivo: redibuja lo que afectaron las escrituras desde la última"""
+        self.revision_vivo = None
+        if not self.en_vivo_var.get() or not self.tab_dashboard.winfo_exists():
+            return
+        # Con la pantalla oculta no se dibuja: refrescar() se pone al día al volver
+        if self.notebook.winfo_ismapped():
+            self.actualizar_cambios()
+        self.revision_vivo = self.parent.after(INTERVALO_VIVO_MS, self.revisar_cambios)
+    
+    def refrescar(self):
+        """Al volver a la pantalla (ver Pantallas): redibuja solo lo que cambió mientras tanto"""
+        self.actualizar_cambios()
+    
+    def actualizar_cambios(self):
+        """Redibuja las partes afectadas por las escrituras desde lo último que se mostró"""
+        # Con una lectura en curso, lo que cambie mientras tanto se junta para la vuelta siguiente
+        if self.leyendo_dashboard:
+            return
+        versiones, cambiadas = self.db.cambios(self.versiones_vistas)
+        partes = partes_afectadas(cambiadas)
+        if partes:
+            self.actualizar_dashboard(partes, avisar=False)
+        else:
+            # Solo accesos: nada que dibujar
+            self.versiones_vistas = versiones
+    
+    def mostrar_dashboard(self, datos, partes=PARTES_DASHBOARD, avisar=True):
+        versiones, stats, mensuales, tendencia = datos
+        self.leyendo_dashboard = False
         try:
-            # Obtener estadísticas completas
-            stats = self.db.get_estadisticas_completas()
-            
-            # Actualizar métricas rápidas
-            self.metricas_labels['clientes_total'].config(
-                text=f"{stats['total_clientes']}",
-                foreground='#2c3e50'
-            )
-            self.metricas_labels['clientes_activos'].config(
-                text=f"{stats['clientes_activos']}",
-                foreground='#27ae60'
-            )
-            self.metricas_labels['clientes_vencidos'].config(
-                text=f"{stats['clientes_vencidos']}",
-                foreground='#e74c3c'
-            )
-            self.metricas_labels['ingresos_mes'].config(
-                text=f"${stats['ingresos_mes_actual']:,.2f}",
-                foreground='#9b59b6'
-            )
+            if 'metricas' in partes:
+                self.actualizar_metricas(stats)
             
             # Actualizar gráficos
-            self.actualizar_grafico_ingresos()
-            self.actualizar_grafico_estado_clientes()
-            self.actualizar_estadisticas_avanzadas()
-            
-            messagebox.showinfo("Éxito", "Dashboard actualizado correctamente")
+            if 'ingresos' in partes:
+                self.actualizar_grafico_ingresos(mensuales)
+            if 'estado' in partes:
+                self.actualizar_grafico_estado_clientes(stats)
+            if 'avanzadas' in partes:
+                self.actualizar_estadisticas_avanzadas(stats, mensuales, tendencia)
+            if 'tendencia' in partes:
+                self.actualizar_grafico_tendencia(tendencia)
+            
+            self.versiones_vistas = versiones
+            self.actualizado_label.config(text=f"Actualizado {datetime.now():%H:%M:%S}")
+            if avisar:
+                messagebox.showinfo("Éxito", "Dashboard actualizado correctamente")
             
         except Exception as e:
+            self.error_dashboard(e, avisar)
+    
+    def error_dashboard(self, e, avisar=True):
+        self.leyendo_dashboard = False
+        # En vivo no se interrumpe con ventanas: se reintenta en la próxima vuelta
+        if avisar:
             messagebox.showerror("Error", f"No se pudo actualizar el dashboard: {e}")
+        else:
+            print(f"Error actualizando el dashboard: {e}")
     
-    def actualizar_grafico_ingresos(self):
-        """Actualiza el gráfico de ingresos mensuales"""
+    def actualizar_metricas(self, stats):
+        """Actualiza las métricas rápidas"""
+        self.metricas_labels['clientes_total'].config(
+            text=f"{stats['total_clientes']}",
+            foreground='#2c3e50'
+        )
+        self.metricas_labels['clientes_activos'].config(
+            text=f"{stats['clientes_activos']}",
+            foreground='#27ae60'
+        )
+        self.metricas_labels['clientes_vencidos'].config(
+            text=f"{stats['clientes_vencidos']}",
+            foreground='#e74c3c'
+        )
+        self.metricas_labels['ingresos_mes'].config(
+            text=f"${stats['ingresos_mes_actual']:,.2f}",
+            foreground='#9b59b6'
+        )
+    
+    def actualizar_grafico_ingresos(self, mensuales):
+        """Actualiza el gráfico de ingresos mensuales (filas del reporte pagos_mensuales)"""
         try:
-            # Obtener ingresos de los últimos 6 meses
-            self.ax_ingresos.clear()
-            
-            # Simular datos (en una implementación real, esto vendría de la base de datos)
-            meses = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun']
-            ingresos = [1500, 1800, 2200, 1900, 2500, 2800]
-            
-            bars = self.ax_ingresos.bar(meses, ingresos, color='#3498db', alpha=0.7)
-            self.ax_ingresos.set_title('Ingresos Mensuales', fontweight='bold')
-            self.ax_ingresos.set_ylabel('Ingresos ($)')
-            
-            # Agregar valores en las barras
-            for bar in bars:
-                height = bar.get_height()
-                self.ax_ingresos.text(bar.get_x() + bar.get_width()/2., height,
-                                     f'${height:,.0f}',
-                                     ha='center', va='bottom')
-            
-            self.ax_ingresos.grid(True, alpha=0.3)
-            self.fig_ingresos.tight_layout()
-            self.canvas_ingresos.draw()
-            
+            self.grafico_ingresos.actualizar([nombre_mes(fila[0], abreviado=True) for fila in mensuales],
+                                             [fila[2] for fila in mensuales])
         except Exception as e:
             print(f"Error actualizando gráfico de ingresos: {e}")
     
-    def actualizar_grafico_estado_clientes(self):
+    def actualizar_grafico_estado_clientes(self, stats):
         """Actualiza el gráfico de estado de clientes"""
         try:
-            self.ax_estado.clear()
-            
-            stats = self.db.get_estadisticas_completas()
-            
-            labels = ['Activos', 'Vencidos', 'Sin Pago']
-            sizes = [
+            self.grafico_estado.actualizar([
                 stats['clientes_activos'],
                 stats['clientes_vencidos'],
                 stats['total_clientes'] - stats['clientes_activos'] - stats['clientes_vencidos']
-            ]
-            colors = ['#27ae60', '#e74c3c', '#95a5a6']
-            
-            # Filtrar categorías con 0 valores
-            filtered_data = [(label, size, color) for label, size, color in zip(labels, sizes, colors) if size > 0]
-            if filtered_data:
-                labels, sizes, colors = zip(*filtered_data)
-            
-            wedges, texts, autotexts = self.ax_estado.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%',
-                                                         startangle=90)
-            
-            self.ax_estado.set_title('Estado de Clientes', fontweight='bold')
-            
-            # Mejorar la legibilidad
-            for autotext in autotexts:
-                autotext.set_color('white')
-                autotext.set_fontweight('bold')
-            
-            self.fig_estado.tight_layout()
-            self.canvas_estado.draw()
-            
+            ])
         except Exception as e:
             print(f"Error actualizando gráfico de estado: {e}")
     
-    def actualizar_estadisticas_avanzadas(self):
+    def actualizar_estadisticas_avanzadas(self, stats, mensuales, tendencia):
         """Actualiza las estadísticas avanzadas"""
         try:
-            stats = self.db.get_estadisticas_completas()
-            
             # Calcular estadísticas avanzadas
             tasa_retencion = stats.get('tasa_retencion', 0)
-            crecimiento = 12.5  # Simulado
+            # Clientes vigentes al cierre de este mes contra el anterior
+            anterior, actual = [fila[1] for fila in tendencia[-2:]] if len(tendencia) > 1 else (0, 0)
+            crecimiento = (actual - anterior) / anterior * 100 if anterior else 0
             ingreso_promedio = stats['ingresos_mes_actual'] / max(stats['clientes_activos'], 1)
-            clientes_nuevos = 8  # Simulado
+            clientes_nuevos = mensuales[-1][3] if mensuales else 0
             
             self.stats_labels['tasa_retencion'].config(text=f"{tasa_retencion:.1f}%")
             self.stats_labels['crecimiento_clientes'].config(text=f"{crecimiento:.1f}%")
             self.stats_labels['ingreso_promedio'].config(text=f"${ingreso_promedio:.2f}")
             self.stats_labels['clientes_nuevos_mes'].config(text=f"{clientes_nuevos}")
             
-            # Actualizar gráfico de tendencia
-            self.actualizar_grafico_tendencia()
-            
         except Exception as e:
             print(f"Error actualizando estadísticas avanzadas: {e}")
     
-    def actualizar_grafico_tendencia(self):
-        """Actualiza el gráfico de tendencias"""
+    def actualizar_grafico_tendencia(self, tendencia):
+        """Actualiza el gráfico de tendencias (filas del reporte tendencia)"""
         try:
-            self.ax_tendencia.clear()
-            
-            # Datos simulados para tendencia
-            meses = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun']
-            clientes_activos = [45, 48, 52, 55, 58, 62]
-            ingresos = [1500, 1800, 2200, 1900, 2500, 2800]
-            
-            # Gráfico de línea doble
-            ax1 = self.ax_tendencia
-            ax2 = ax1.twinx()
-            
-            # Línea de clientes activos
-            line1 = ax1.plot(meses, clientes_activos, 'o-', color='#3498db', linewidth=2, 
-                            markersize=8, label='Clientes Activos')
-            ax1.set_ylabel('Clientes Activos', color='#3498db')
-            ax1.tick_params(axis='y', labelcolor='#3498db')
-            
-            # Línea de ingresos
-            line2 = ax2.plot(meses, ingresos, 's-', color='#e74c3c', linewidth=2,
-                            markersize=6, label='Ingresos ($)')
-            ax2.set_ylabel('Ingresos ($)', color='#e74c3c')
-            ax2.tick_params(axis='y', labelcolor='#e74c3c')
-            
-            # Combinar leyendas
-            lines = line1 + line2
-            labels = [l.get_label() for l in lines]
-            ax1.legend(lines, labels, loc='upper left')
-            
-            ax1.set_title('Tendencia: Clientes vs Ingresos', fontweight='bold')
-            ax1.grid(True, alpha=0.3)
-            
-            self.fig_tendencia.tight_layout()
-            self.canvas_tendencia.draw()
-            
+            self.grafico_tendencia.actualizar([nombre_mes(fila[0], abreviado=True) for fila in tendencia],
+                                              [fila[1] for fila in tendencia],
+                                              [fila[2] for fila in tendencia])
         except Exception as e:
             print(f"Error actualizando gráfico de tendencia: {e}")
     
@@ -366,24 +429,29 @@ class ReportesUI:
             tipo_reporte = self.tipo_reporte_var.get()
             periodo = self.periodo_var.get()
             
+            # Un reporte pedido antes no debe pintar sobre las columnas nuevas
+            self.tareas.cancelar('reportes.tabla')
+            
             # Limpiar treeview
             for item in self.reportes_tree.get_children():
                 self.reportes_tree.delete(item)
             
+            desde, hasta = rango_periodo(periodo)
+            
             # Configurar columnas según el tipo de reporte
             if tipo_reporte == "pagos_mensuales":
-                self.generar_reporte_pagos_mensuales()
+                self.generar_reporte_pagos_mensuales(desde, hasta)
             elif tipo_reporte == "clientes_estado":
                 self.generar_reporte_clientes_estado()
             elif tipo_reporte == "accesos_diarios":
-                self.generar_reporte_accesos()
+                self.generar_reporte_accesos(desde, hasta)
             elif tipo_reporte == "ingresos_metodo":
-                self.generar_reporte_ingresos_metodo()
+                self.generar_reporte_ingresos_metodo(desde, hasta)
                 
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo generar el reporte: {e}")
     
-    def generar_reporte_pagos_mensuales(self):
+    def generar_reporte_pagos_mensuales(self, desde, hasta):
         """Genera reporte de pagos mensuales"""
         columns = ('Mes', 'Total Pagos', 'Ingresos Totales', 'Clientes Nuevos')
         self.reportes_tree.configure(columns=columns)
@@ -392,18 +460,19 @@ class ReportesUI:
             self.reportes_tree.heading(col, text=col)
             self.reportes_tree.column(col, width=120)
         
-        # Datos simulados
-        datos = [
-            ('Enero 2024', 15, 2250.00, 5),
-            ('Febrero 2024', 18, 2700.00, 6),
-            ('Marzo 2024', 22, 3300.00, 7),
-            ('Abril 2024', 19, 2850.00, 4),
-            ('Mayo 2024', 25, 3750.00, 8),
-            ('Junio 2024', 28, 4200.00, 9)
-        ]
-        
-        for dato in datos:
-            self.reportes_tree.insert('', 'end', values=dato)
+        self.pedir_reporte('pagos_mensuales', desde, hasta,
+                           lambda f: (nombre_mes(f[0]), f[1], f"${f[2]:,.2f}", f[3]))
+    
+    def pedir_reporte(self, nombre, desde, hasta, formatear):
+        """Lee db.reporte en segundo plano y llena la tabla con las filas formateadas"""
+        self.tareas.ejecutar('reportes.tabla', self.db.reporte, nombre, desde, hasta,
+                             al_terminar=lambda filas: self.mostrar_reporte(filas, formatear),
+                             al_fallar=lambda e: messagebox.showerror(
+                                 "Error", f"No se pudo generar el reporte: {e}"))
+    
+    def mostrar_reporte(self, filas, formatear):
+        for fila in filas:
+            self.reportes_tree.insert('', 'end', values=formatear(fila))
     
     def generar_reporte_clientes_estado(self):
         """Genera reporte de clientes por estado"""
@@ -414,7 +483,12 @@ class ReportesUI:
             self.reportes_tree.heading(col, text=col)
             self.reportes_tree.column(col, width=120)
         
-        stats = self.db.get_estadisticas_completas()
+        self.tareas.ejecutar('reportes.tabla', self.db.estadisticas,
+                             al_terminar=self.mostrar_reporte_clientes_estado,
+                             al_fallar=lambda e: messagebox.showerror(
+                                 "Error", f"No se pudo generar el reporte: {e}"))
+    
+    def mostrar_reporte_clientes_estado(self, stats):
         total = stats['total_clientes']
         
         datos = [
@@ -429,7 +503,7 @@ class ReportesUI:
         for dato in datos:
             self.reportes_tree.insert('', 'end', values=dato)
     
-    def generar_reporte_accesos(self):
+    def generar_reporte_accesos(self, desde, hasta):
         """Genera reporte de accesos diarios"""
         columns = ('Fecha', 'Entradas', 'Salidas', 'Total', 'Hora Pico')
         self.reportes_tree.configure(columns=columns)
@@ -438,19 +512,10 @@ class ReportesUI:
             self.reportes_tree.heading(col, text=col)
             self.reportes_tree.column(col, width=100)
         
-        # Datos simulados
-        datos = [
-            ('2024-06-01', 45, 42, 87, '18:00'),
-            ('2024-06-02', 38, 35, 73, '19:00'),
-            ('2024-06-03', 52, 48, 100, '18:30'),
-            ('2024-06-04', 41, 39, 80, '18:00'),
-            ('2024-06-05', 47, 44, 91, '19:00')
-        ]
-        
-        for dato in datos:
-            self.reportes_tree.insert('', 'end', values=dato)
+        self.pedir_reporte('accesos_diarios', desde, hasta,
+                           lambda f: (f[0], f[1], f[2], f[3], f[4] or '-'))
     
-    def generar_reporte_ingresos_metodo(self):
+    def generar_reporte_ingresos_metodo(self, desde, hasta):
         """Genera reporte de ingresos por método de pago"""
         columns = ('Método', 'Cantidad Pagos', 'Ingresos Totales', 'Porcentaje')
         self.reportes_tree.configure(columns=columns)
@@ -459,35 +524,15 @@ class ReportesUI:
             self.reportes_tree.heading(col, text=col)
             self.reportes_tree.column(col, width=120)
         
-        # Datos simulados
-        total_ingresos = 19050.00
-        datos = [
-            ('Efectivo', 85, 12750.00, '67%'),
-            ('Tarjeta', 42, 5250.00, '28%'),
-            ('Transferencia', 8, 1050.00, '5%')
-        ]
-        
-        for dato in datos:
-            self.reportes_tree.insert('', 'end', values=dato)
+        self.pedir_reporte('ingresos_metodo', desde, hasta,
+                           lambda f: (f[0] or 'Sin método', f[1], f"${f[2]:,.2f}", f"{f[3]:.0f}%"))
     
     def exportar_excel(self):
         """Exporta el reporte actual a Excel"""
         try:
-            # Obtener datos del treeview
-            datos = []
             columns = self.reportes_tree['columns']
-            
-            # Agregar headers
             headers = [self.reportes_tree.heading(col)['text'] for col in columns]
-            datos.append(headers)
-            
-            # Agregar datos
-            for item in self.reportes_tree.get_children():
-                valores = self.reportes_tree.item(item)['values']
-                datos.append(valores)
-            
-            # Crear DataFrame y exportar
-            df = pd.DataFrame(datos[1:], columns=datos[0])
+            filas = (self.reportes_tree.item(item)['values'] for item in self.reportes_tree.get_children())
             
             # Crear directorio de reportes si no existe
             os.makedirs('reportes', exist_ok=True)
@@ -496,14 +541,39 @@ class ReportesUI:
             fecha = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
             nombre_archivo = f"reportes/reporte_{fecha}.xlsx"
             
-            # Exportar
-            df.to_excel(nombre_archivo, index=False)
+            # El reporte es un resumen de pocas filas: se escribe directo, sin DataFrame
+            exportar_filas(nombre_archivo, headers, filas, hoja="Reporte")
             
             messagebox.showinfo("Éxito", f"Reporte exportado como:\n{nombre_archivo}")
             
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo exportar a Excel: {e}")
     
+    def exportar_detalle(self):
+        """Exporta las filas detrás del reporte (pagos, accesos o clientes) del período elegido"""
+        tipo_reporte = self.tipo_reporte_var.get()
+        desde, hasta = rango_periodo(self.periodo_var.get())
+        if tipo_reporte == "accesos_diarios":
+            nombre, encabezados = "Accesos", ENCABEZADOS_ACCESOS
+            filas = self.db.iterar_accesos_con_cliente(desde=desde, hasta=hasta)
+        elif tipo_reporte == "clientes_estado":
+            nombre, encabezados = "Clientes", ENCABEZADOS_CLIENTES
+            filas = self.db.iterar_clientes()
+        else:
+            nombre, encabezados = "Pagos", ENCABEZADOS_PAGOS
+            filas = self.db.iterar_pagos_con_cliente(desde=desde, hasta=hasta)
+        
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            initialfile=f"{nombre.lower()}_{desde.isoformat()}_{hasta.isoformat()}",
+            filetypes=[("CSV", "*.csv"), ("Excel files", "*.xlsx"), ("All files", "*.*")],
+            title=f"Exportar {nombre.lower()} del período"
+        )
+        if file_path:
+            # Un año de accesos son millones de filas: se leen y escriben por lotes
+            exportar_con_avance(self.parent, file_path, encabezados, filas,
+                                titulo=f"Exportando {nombre.lower()}", hoja=nombre)
+    
     def imprimir_reporte(self):
         """Simula la impresión del reporte"""
         messagebox.showinfo("Imprimir", "Función de impresión habilitada\nEl reporte se enviará a la impresora predeterminada")
\ No newline at end of file
@@ -0,0 +1,160 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class EjecutorTareas:
+    """Ejecuta consultas en un pool de hilos y entrega el resultado en el hilo de Tk.
+
+    Cada tarea lleva una clave; encolar otra con la misma clave deja obsoleta
+    la anterior, cuyo resultado se descarta. Los hilos no tocan Tk: dejan el
+    resultado en una cola que el hilo principal revisa con root.after.
+
+    Con al_avanzar, la función recibe un argumento al_avanzar(*valores) para
+    informar su avance; devuelve False si la tarea ya fue cancelada.
+    """
+
+    def __init__(self, root, max_hilos=4, intervalo_ms=15):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self.pool = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix='tareas')
+        self.resultados = queue.Queue()
+        self.vigentes = {}
+        self.lock = threading.Lock()
+        self.revisando = None
+        self.cerrado = False
+        # Un solo ejecutor por ventana raíz, compartido por todas las pantallas
+        root.ejecutor_tareas = self
+
+    def ejecutar(self, clave, funcion, *args, al_terminar=None, al_fallar=None, al_avanzar=None):
+        """Ejecuta funcion(*args) en segundo plano; reemplaza la tarea previa de la clave"""
+        if self.cerrado:
+            raise RuntimeError("El ejecutor de tareas está cerrado")
+        tarea = Tarea(clave, al_terminar, al_fallar, al_avanzar)
+        with self.lock:
+            anterior = self.vigentes.get(clave)
+            self.vigentes[clave] = tarea
+        if anterior is not None:
+            anterior.cancelar()
+        tarea.futuro = self.pool.submit(self.correr, tarea, funcion, args)
+        self.programar_revision()
+        return tarea
+
+    def correr(self, tarea, funcion, args):
+        if tarea.cancelada:
+            return
+        kwargs = {}
+        if tarea.al_avanzar is not None:
+            kwargs['al_avanzar'] = lambda *valores: self.avisar(tarea, valores)
+        try:
+            self.resultados.put((tarea, True, funcion(*args, **kwargs)))
+        except Exception as e:
+            self.resultados.put((tarea, False, e))
+
+    def avisar(self, tarea, valores):
+        """Encola un aviso de avance (exito None); False si la tarea fue cancelada"""
+        if tarea.cancelada:
+            return False
+        self.resultados.put((tarea, None, valores))
+        return True
+
+    def cancelar(self, clave):
+        with self.lock:
+            tarea = self.vigentes.pop(clave, None)
+        if tarea is not None:
+            tarea.cancelar()
+
+    def cancelar_todas(self, prefijo=''):
+        """Cancela las tareas cuya clave empieza con prefijo (todas, sin prefijo)"""
+        with self.lock:
+            tareas = [tarea for clave, tarea in self.vigentes.items() if clave.startswith(prefijo)]
+            for tarea in tareas:
+                del self.vigentes[tarea.clave]
+        for tarea in tareas:
+            tarea.cancelar()
+
+    def pendientes(self):
+        with self.lock:
+            return len(self.vigentes)
+
+    def programar_revision(self):
+        if self.revisando is None and not self.cerrado:
+            self.revisando = self.root.after(self.intervalo_ms, self.revisar)
+
+    def revisar(self):
+        """Entrega en el hilo de Tk los resultados listos"""
+        self.revisando = None
+        while True:
+            try:
+                tarea, exito, valor = self.resultados.get_nowait()
+            except queue.Empty:
+                break
+            if exito is None:
+                # Aviso de avance: la tarea sigue en curso
+                if not tarea.cancelada:
+                    self.entregar(tarea, exito, valor)
+                continue
+            with self.lock:
+                if self.vigentes.get(tarea.clave) is tarea:
+                    del self.vigentes[tarea.clave]
+                else:
+                    tarea.cancelar()
+            if tarea.cancelada:
+                continue
+            self.entregar(tarea, exito, valor)
+        if self.pendientes():
+            self.programar_revision()
+
+    def entregar(self, tarea, exito, valor):
+        try:
+            if exito is None:
+                tarea.al_avanzar(*valor)
+            elif exito:
+                if tarea.al_terminar is not None:
+                    tarea.al_terminar(valor)
+            elif tarea.al_fallar is not None:
+                tarea.al_fallar(valor)
+            else:
+                print(f"Error en tarea '{tarea.clave}': {valor}")
+        except Exception as e:
+            # La pantalla pudo cerrarse mientras la consulta corría
+            print(f"Error entregando tarea '{tarea.clave}': {e}")
+
+    def cerrar(self):
+        self.cerrado = True
+        self.cancelar_todas()
+        if self.revisando is not None:
+            try:
+                self.root.after_cancel(self.revisando)
+            except Exception:
+                pass
+            self.revisando = None
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+class Tarea:
+    """Solicitud en curso; cancelar() descarta su resultado"""
+
+    def __init__(self, clave, al_terminar, al_fallar, al_avanzar=None):
+        self.clave = clave
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.al_avanzar = al_avanzar
+        self.futuro = None
+        self.cancelada = False
+
+    def cancelar(self):
+        self.cancelada = True
+        if self.futuro is not None:
+            self.futuro.cancel()
+
+
+def ejecutor_de(widget):
+    """Ejecutor compartido de la ventana del widget; se crea en el primer uso"""
+    root = widget.winfo_toplevel()
+    while getattr(root, 'master', None) is not None:
+        root = root.master
+    ejecutor = getattr(root, 'ejecutor_tareas', None)
+    if ejecutor is None or ejecutor.cerrado:
+        ejecutor = EjecutorTareas(root)
+    return ejecutor
@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+MODULOS_PESADOS = ('pandas', 'matplotlib', 'PIL', 'openpyxl', 'numpy')
+
+
+def cargados_al_importar(modulo):
+    # En un proceso nuevo: en este ya pueden estar cargados por otras pruebas
+    codigo = f"import sys, {modulo}; print(' '.join(sorted(sys.modules)))"
+    salida = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True,
+                            text=True, check=True).stdout.split()
+    return [nombre for nombre in MODULOS_PESADOS if nombre in salida]
+
+
+def test_el_menu_no_carga_librerias_pesadas():
+    assert cargados_al_importar('main') == []
+
+
+def test_pantallas_sin_graficos_no_cargan_librerias_pesadas():
+    for pantalla in ('accesos_ui', 'clientes_ui', 'pagos_ui', 'configuracion_ui'):
+        assert cargados_al_importar(pantalla) == [], pantalla
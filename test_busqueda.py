@@ -0,0 +1,180 @@
+import pytest
+
+from busqueda_incremental import BusquedaIncremental, FiltroRapido, IndiceColumnar, ProveedorFiltrado
+from database import Database, consulta_fts
+from lista_virtual import ProveedorLista
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'))
+    db.insert_cliente('001-123', 'María José', 'González', '809-555-1234')
+    db.insert_cliente('002', 'Mario', 'Pérez', '809-777-0000')
+    db.insert_cliente('003', 'Ana', 'Gonzalo', '')
+    yield db
+    db.cerrar()
+
+
+def cedulas(db, criterios, estado="Todos"):
+    return sorted(fila[0] for fila in db.buscar_clientes(criterios, estado))
+
+
+def test_consulta_fts_cita_palabras_y_marca_prefijos():
+    assert consulta_fts('mar gon') == '"mar"* AND "gon"*'
+    assert consulta_fts('a"b', 'nombre') == '{nombre} : ("a""b"*)'
+    assert consulta_fts('   ') is None
+
+
+def test_busqueda_por_prefijo_sin_tildes(db):
+    assert db.busqueda_fts
+    assert cedulas(db, {'texto': 'mar'}) == ['001-123', '002']
+    assert cedulas(db, {'texto': 'maria gonz'}) == ['001-123']
+    assert cedulas(db, {'texto': 'GONZÁLEZ'}) == ['001-123']
+    assert cedulas(db, {'apellido': 'gonz'}) == ['001-123', '003']
+    assert cedulas(db, {'nombre': 'gonz'}) == []
+    assert cedulas(db, {'telefono': '777'}) == ['002']
+    assert cedulas(db, {'texto': '"OR'}) == []
+
+
+def test_triggers_mantienen_el_indice(db):
+    db.actualizar_cliente('002', 'Marco', 'Pérez', '', '', '', '')
+    assert cedulas(db, {'texto': 'mario'}) == []
+    assert cedulas(db, {'texto': 'marco'}) == ['002']
+
+    db.eliminar_cliente('003')
+    assert cedulas(db, {'texto': 'ana'}) == []
+    db.insert_cliente('004', 'Ánabel', 'Ruiz')
+    assert cedulas(db, {'texto': 'ana'}) == ['004']
+
+
+def test_sin_fts_se_usa_like(db):
+    db.busqueda_fts = False
+    assert cedulas(db, {'texto': 'MAR'}) == ['001-123', '002']
+    assert cedulas(db, {'cedula': '00', 'apellido': 'Gonz'}) == ['001-123', '003']
+
+
+@pytest.mark.parametrize('fts', [True, False])
+def test_acotar_coincide_con_la_base_de_datos(db, fts):
+    db.busqueda_fts = fts
+    db.insert_cliente('004', 'Ánabel', 'Gómez', '809-555-9999')
+    incremental = BusquedaIncremental(por_prefijo=fts)
+    tecleado = ['g', 'go', 'gon', 'gonz', 'gonz m', 'gonz mar'] if fts else ['5', '55', '555', '-555-']
+
+    for anterior, termino in zip(tecleado, tecleado[1:]):
+        incremental.recordar(anterior, db.buscar_clientes({'texto': anterior}))
+        assert incremental.puede_acotar(termino)
+        assert sorted(f[0] for f in incremental.acotar(termino)) == cedulas(db, {'texto': termino})
+
+
+def test_no_acota_si_el_termino_no_alarga_el_anterior(db):
+    incremental = BusquedaIncremental()
+    assert not incremental.puede_acotar('mar')
+    incremental.recordar('mar', db.buscar_clientes({'texto': 'mar'}))
+    assert incremental.puede_acotar('MARÍ')
+    assert not incremental.puede_acotar('ma')
+    assert not incremental.puede_acotar('mor')
+    assert not incremental.puede_acotar('mar-go')  # frase para FTS5
+
+
+def test_indice_columnar_filtra_sin_tildes_y_acota(db):
+    indice = IndiceColumnar(db.get_all_clientes(), columnas_busqueda=(0, 1, 2, 3))
+    assert len(indice) == 3
+    assert indice.fila(0) == tuple(db.get_all_clientes()[0])
+
+    nombres = lambda posiciones: [indice.fila(p)[1] for p in posiciones]
+    assert nombres(indice.filtrar('GONZ')) == ['Ana', 'María José']
+    # Solo revisa lo que ya coincidía con 'gonz'
+    indice.claves[2] += 'gonzalez'
+    assert nombres(indice.filtrar('gonzá')) == ['Ana', 'María José']
+    assert nombres(indice.filtrar('gonzal')) == ['Ana', 'María José']
+    assert nombres(indice.filtrar('-555-')) == ['María José']
+    # No coincide a través de columnas distintas
+    assert indice.filtrar('gonzalez809') == []
+    assert len(indice.filtrar('  ')) == 3
+
+
+def test_proveedor_filtrado_arma_solo_la_pagina(db):
+    indice = IndiceColumnar(db.get_all_clientes())
+    proveedor = ProveedorFiltrado(indice, indice.filtrar('o'))
+    assert proveedor.contar() == 3
+    assert [f[0] for f in proveedor.leer_pagina(1, 2)] == ['001-123']
+    assert IndiceColumnar([], columnas_busqueda=(0, 1)).filtrar('x') == []
+
+
+class ListaFalsa:
+    """Lo que FiltroRapido usa de ListaVirtual"""
+
+    def __init__(self, proveedor):
+        self.ventana = type('Ventana', (), {'proveedor': proveedor})()
+        self.recargas = 0
+
+    def recargar(self, proveedor=None):
+        self.recargas += 1
+        if proveedor is not None:
+            self.ventana.proveedor = proveedor
+
+
+class TareasDiferidas:
+    """Guarda las tareas y las corre al terminar()"""
+
+    def __init__(self):
+        self.pendientes = {}
+
+    def ejecutar(self, clave, funcion, *args, al_terminar=None, al_fallar=None):
+        self.pendientes[clave] = (lambda: funcion(*args), al_terminar)
+
+    def cancelar(self, clave):
+        self.pendientes.pop(clave, None)
+
+    def terminar(self):
+        pendientes, self.pendientes = self.pendientes, {}
+        for funcion, al_terminar in pendientes.values():
+            al_terminar(funcion())
+
+
+def test_filtro_rapido_aplica_lo_tecleado_mientras_arma_el_indice(db):
+    completo = lambda: ProveedorLista(db.get_all_clientes())
+    lista, tareas = ListaFalsa(completo()), TareasDiferidas()
+    filtro = FiltroRapido(lista, tareas, 'indice', db.get_all_clientes, completo, columnas_busqueda=(0, 1, 2, 3))
+
+    filtro.filtrar('g')
+    filtro.filtrar('gonz')
+    assert len(tareas.pendientes) == 1 and not filtro.filtrando()
+    tareas.terminar()
+    assert filtro.filtrando() and lista.ventana.proveedor.contar() == 2
+
+    # Actualizar descarta la copia: el cliente nuevo aparece al volver a armarla
+    db.insert_cliente('004', 'Luis', 'Gonzaga')
+    filtro.recargar('gonz')
+    tareas.terminar()
+    assert lista.ventana.proveedor.contar() == 3 and len(filtro.indice) == 4
+
+    filtro.filtrar('')
+    assert not filtro.filtrando()
+
+
+class TextoFalso:
+    def __init__(self, texto=''):
+        self.texto = texto
+
+    def get(self):
+        return self.texto
+
+
+def test_busqueda_vuelve_a_pedir_el_texto_de_un_resultado_descartado(db):
+    from clientes_ui import ClientesUI
+    ui = ClientesUI.__new__(ClientesUI)
+    ui.db, ui.tareas = db, TareasDiferidas()
+    ui.incremental = BusquedaIncremental(por_prefijo=db.busqueda_fts)
+    ui.busqueda_programada = ui.termino_pedido = ui.ultima_tecla = None
+    ui.search_var = TextoFalso('gonz')
+    ui.lista_panel = ListaFalsa(ProveedorLista(db.get_all_clientes()))
+
+    ui.ejecutar_busqueda()
+    # Teclea una letra y la borra antes de que llegue el resultado de 'gonz'
+    ui.search_var.texto = 'gonza'
+    ui.tareas.terminar()
+    ui.search_var.texto = 'gonz'
+    ui.ejecutar_busqueda()
+    ui.tareas.terminar()
+    assert sorted(f[0] for f in ui.lista_panel.ventana.proveedor.leer_pagina(0, 10)) == ['001-123', '003']
@@ -0,0 +1,54 @@
+import sqlite3
+import threading
+
+import pytest
+
+from database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'))
+    db.insert_cliente('1001', 'Ana', 'Pérez')
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+    yield db
+    db.cerrar()
+
+
+def test_lectura_es_por_hilo_y_de_solo_lectura(db):
+    principal = db.lectura()
+    assert db.lectura() is principal
+    assert principal is not db.conn
+    with pytest.raises(sqlite3.OperationalError):
+        principal.execute("DELETE FROM clientes")
+
+    otras = []
+    hilo = threading.Thread(target=lambda: otras.append(db.lectura()))
+    hilo.start()
+    hilo.join()
+    assert otras[0] is not principal
+    assert len(db.conexiones_lectura) == 2
+
+
+def test_lecturas_concurrentes_con_escrituras(db):
+    errores = []
+
+    def leer():
+        try:
+            for _ in range(50):
+                assert db.get_cliente_by_cedula('1001') is not None
+                db.get_estadisticas_completas()
+        except Exception as e:
+            errores.append(e)
+
+    lectores = [threading.Thread(target=leer) for _ in range(4)]
+    for hilo in lectores:
+        hilo.start()
+    for i in range(50):
+        db.insert_cliente(f"2{i:03d}", 'Nombre', 'Apellido')
+        db.registrar_acceso('1001')
+    for hilo in lectores:
+        hilo.join()
+
+    assert not errores
+    assert len(db.get_all_clientes()) == 51
@@ -0,0 +1,84 @@
+import sqlite3
+import time
+from datetime import datetime
+
+import pytest
+
+from database import PERFIL_CONEXION, Database, EscritorAccesos
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'))
+    db.insert_cliente('1001', 'Ana', 'Pérez')
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+    yield db
+    db.cerrar()
+
+
+def contar_accesos(db):
+    return db.conn.execute("SELECT COUNT(*) FROM accesos").fetchone()[0]
+
+
+def test_escritor_agrupa_y_vacia_al_cerrar(db):
+    escritor = EscritorAccesos(db, max_eventos=50, intervalo=60)
+    for _ in range(120):
+        escritor.encolar('1001', 'Entrada', datetime.now())
+
+    escritor.cerrar()
+    assert escritor.total_escritos == 120
+    assert contar_accesos(db) == 120
+
+
+def test_escritor_escribe_al_vencer_el_intervalo(db):
+    escritor = EscritorAccesos(db, max_eventos=1000, intervalo=0.05)
+    escritor.encolar('1001', 'Entrada', datetime.now())
+
+    assert escritor.esperar_vaciado()
+    assert contar_accesos(db) == 1
+    escritor.cerrar()
+    with pytest.raises(RuntimeError):
+        escritor.encolar('1001', 'Salida', datetime.now())
+
+
+def test_registrar_acceso_usa_el_escritor(db):
+    db.iniciar_escritor_accesos(max_eventos=10, intervalo=60)
+    for _ in range(3):
+        assert db.registrar_acceso('1001')[0]
+    assert contar_accesos(db) == 0
+
+    assert db.escritor_accesos.esperar_vaciado()
+    assert contar_accesos(db) == 3
+
+
+def test_evento_huerfano_no_frena_el_lote(db):
+    # Cédula validada y borrada antes de escribir el lote: viola la clave foránea
+    escritor = EscritorAccesos(db, max_eventos=1000, intervalo=0.05)
+    escritor.encolar('9999', 'Entrada', datetime.now())
+    escritor.encolar('1001', 'Entrada', datetime.now())
+
+    assert escritor.esperar_vaciado()
+    assert contar_accesos(db) == 1
+    assert (escritor.total_escritos, escritor.total_descartados) == (1, 1)
+    escritor.encolar('1001', 'Salida', datetime.now())
+    assert escritor.esperar_vaciado()
+    assert contar_accesos(db) == 2
+    escritor.cerrar()
+
+
+def test_base_ocupada_reintenta_con_espera(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'), perfil=dict(PERFIL_CONEXION, busy_timeout_ms=10))
+    db.insert_cliente('1001', 'Ana', 'Pérez')
+    otra = sqlite3.connect(db.ruta_db)
+    otra.execute("BEGIN IMMEDIATE")
+    escritor = EscritorAccesos(db, max_eventos=1000, intervalo=0.02)
+    escritor.encolar('1001', 'Entrada', datetime.now())
+
+    time.sleep(0.3)
+    assert escritor.espera_reintento > 0 and escritor.pendientes
+    otra.rollback()
+    otra.close()
+    assert escritor.esperar_vaciado()
+    assert contar_accesos(db) == 1 and escritor.espera_reintento == 0
+    escritor.cerrar()
+    db.cerrar()
@@ -0,0 +1,136 @@
+import sqlite3
+
+import pytest
+
+from database import CacheMiembros, Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'))
+    db.insert_cliente('1001', 'Ana', 'Pérez')
+    db.insert_cliente('1002', 'Luis', 'Gómez')
+    yield db
+    db.cerrar()
+
+
+def estado(db, cedula):
+    return db.conn.execute(
+        "SELECT fecha_vencimiento, id_pago FROM estado_membresia WHERE cedula_cliente = ?",
+        (cedula,)).fetchone()
+
+
+def test_insert_pago_actualiza_estado(db):
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+    db.insert_pago('1001', 135.0, 3, 'Tarjeta')
+
+    pago_activo = db.get_pago_activo('1001')
+    assert estado(db, '1001') == (pago_activo[5], pago_activo[0])
+    assert db.conn.execute("SELECT COUNT(*) FROM estado_membresia").fetchone()[0] == 1
+
+
+def test_buscar_clientes_usa_estado(db):
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+    db.conn.execute(
+        "UPDATE estado_membresia SET fecha_vencimiento = '2000-01-01' WHERE cedula_cliente = '1001'")
+    db.conn.commit()
+
+    resultados = {fila[0]: fila[9] for fila in db.buscar_clientes({}, "Todos")}
+    assert resultados == {'1001': 'Vencido', '1002': 'Sin pago'}
+    assert [fila[0] for fila in db.buscar_clientes({}, "Vencidos")] == ['1001', '1002']
+    assert db.buscar_clientes({}, "Activos") == []
+    assert [fila[0] for fila in db.get_clientes_vencidos()] == ['1001']
+
+
+def test_eliminar_cliente_borra_estado(db):
+    db.insert_pago('1002', 50.0, 1, 'Efectivo')
+    assert db.eliminar_cliente('1002')
+    assert estado(db, '1002') is None
+    assert db.get_estadisticas_completas()['clientes_activos'] == 0
+
+
+def test_migracion_rellena_estado_desde_pagos(tmp_path):
+    ruta = str(tmp_path / 'antigua.db')
+    conn = sqlite3.connect(ruta)
+    conn.execute("CREATE TABLE pagos (id INTEGER PRIMARY KEY AUTOINCREMENT, cedula_cliente TEXT, "
+                 "monto REAL, duracion_meses INTEGER, fecha_pago DATE, fecha_vencimiento DATE, "
+                 "metodo_pago TEXT, activo BOOLEAN DEFAULT 1)")
+    conn.executemany(
+        "INSERT INTO pagos (cedula_cliente, monto, duracion_meses, fecha_pago, fecha_vencimiento, "
+        "metodo_pago, activo) VALUES (?, 50, 1, '2025-01-01', ?, 'Efectivo', ?)",
+        [('1001', '2025-01-31', 0), ('1001', '2025-03-02', 1), ('1002', '2025-02-15', 1)])
+    conn.commit()
+    conn.close()
+
+    db = Database(ruta)
+    assert estado(db, '1001') == ('2025-03-02', 2)
+    assert estado(db, '1002') == ('2025-02-15', 3)
+    db.conn.close()
+
+
+def test_registrar_acceso_validado_devuelve_datos_del_cliente(db):
+    assert db.registrar_acceso_validado('9999') == (False, "Cliente no encontrado", None)
+
+    exito, mensaje, datos = db.registrar_acceso_validado('1001')
+    assert not exito and mensaje == "Membresía vencida o sin pago"
+    assert datos == {'nombre_completo': 'Ana Pérez', 'fecha_vencimiento': None}
+
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+    exito, _, datos = db.registrar_acceso_validado('1001', 'Entrada')
+    assert exito and datos['fecha_vencimiento'] == db.get_pago_activo('1001')[5]
+
+    db.conn.execute(
+        "UPDATE estado_membresia SET fecha_vencimiento = '2000-01-01' WHERE cedula_cliente = '1001'")
+    db.conn.commit()
+    db.cache_miembros.limpiar()
+    assert db.registrar_acceso('1001') == (False, "Membresía vencida")
+    assert db.conn.execute("SELECT COUNT(*) FROM accesos").fetchone()[0] == 1
+
+
+def test_cache_miembros_se_invalida_en_escrituras(db):
+    db.registrar_acceso_validado('1001')
+    db.registrar_acceso_validado('1001')
+    assert db.cache_miembros.estadisticas()['aciertos'] == 1
+
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+    exito, _, datos = db.registrar_acceso_validado('1001')
+    assert exito and datos['fecha_vencimiento'] is not None
+
+    db.actualizar_cliente('1001', 'Ana María', 'Pérez', '', '', '', '')
+    assert db.registrar_acceso_validado('1001')[2]['nombre_completo'] == 'Ana María Pérez'
+
+    db.eliminar_cliente('1001')
+    assert db.registrar_acceso_validado('1001') == (False, "Cliente no encontrado", None)
+
+
+def test_cache_miembros_descarta_el_menos_usado():
+    cache = CacheMiembros(capacidad=2)
+    cache.guardar('1', 'A', None)
+    cache.guardar('2', 'B', None)
+    cache.obtener('1')
+    cache.guardar('3', 'C', None)
+
+    assert cache.obtener('2') is None
+    assert cache.obtener('1') == ('A', None)
+    assert cache.estadisticas()['tamaño'] == 2
+
+
+def test_cache_miembros_no_guarda_lecturas_invalidadas():
+    cache = CacheMiembros()
+    version = cache.version()
+    # Un pago invalida la cédula mientras la pasada todavía leía la base
+    cache.invalidar('1')
+    cache.guardar('1', 'A', None, version)
+    assert cache.obtener('1') is None
+
+    cache.guardar('1', 'A', '2030-01-01', cache.version())
+    assert cache.obtener('1') == ('A', '2030-01-01')
+
+
+def test_cache_miembros_ve_escrituras_de_otra_conexion(db, tmp_path):
+    assert db.registrar_acceso_validado('1001')[2]['nombre_completo'] == 'Ana Pérez'
+    otra = sqlite3.connect(str(tmp_path / 'gimnasio.db'))
+    otra.execute("UPDATE clientes SET apellido = 'Ruiz' WHERE cedula = '1001'")
+    otra.commit()
+    otra.close()
+    assert db.registrar_acceso_validado('1001')[2]['nombre_completo'] == 'Ana Ruiz'
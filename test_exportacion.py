@@ -0,0 +1,86 @@
+import csv
+import os
+from datetime import date
+
+import pytest
+from openpyxl import load_workbook
+
+import exportacion
+from database import Database
+from exportacion import ENCABEZADOS_ACCESOS, ExportacionCancelada, exportar_filas
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'))
+    db.insert_cliente('1001', 'Ana', 'Pérez')
+    db.insert_cliente('1002', 'Luis', 'Gómez')
+    cursor = db.conn.cursor()
+    cursor.executemany("INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora) VALUES (?, ?, ?)", [
+        ('1001', 'Entrada', '2026-01-31 23:59:00'),
+        ('1002', 'Entrada', '2026-02-01 08:00:00'),
+        ('1001', 'Salida', '2026-02-28 21:00:00'),
+        ('1002', 'Entrada', '2026-03-01 07:00:00'),
+    ])
+    db.conn.commit()
+    yield db
+    db.cerrar()
+
+
+def test_iterar_accesos_por_periodo(db):
+    filas = list(db.iterar_accesos_con_cliente(tamaño_lote=1, desde='2026-02-01', hasta=date(2026, 2, 28)))
+    assert [(f[1], f[2], f[4], f[5]) for f in filas] == [
+        ('1002', 'Luis', 'Entrada', '2026-02-01 08:00:00'),
+        ('1001', 'Ana', 'Salida', '2026-02-28 21:00:00'),
+    ]
+    assert len(list(db.iterar_accesos_con_cliente())) == 4
+
+
+def test_iterar_clientes_igual_que_get_all(db):
+    assert list(db.iterar_clientes(tamaño_lote=1)) == db.get_all_clientes()
+
+
+def test_exportar_csv_desde_generador(db, tmp_path):
+    ruta = str(tmp_path / 'accesos.csv')
+    assert exportar_filas(ruta, ENCABEZADOS_ACCESOS, db.iterar_accesos_con_cliente()) == 4
+    with open(ruta, newline='', encoding='utf-8-sig') as archivo:
+        filas = list(csv.reader(archivo, delimiter=';'))
+    assert filas[0] == ENCABEZADOS_ACCESOS
+    assert filas[1][1:] == ['1001', 'Ana', 'Pérez', 'Entrada', '2026-01-31 23:59:00']
+    assert len(filas) == 5
+
+
+def test_exportar_xlsx_sigue_en_otra_hoja(monkeypatch, tmp_path):
+    monkeypatch.setattr(exportacion, 'FILAS_POR_HOJA', 3)
+    ruta = str(tmp_path / 'datos.xlsx')
+    assert exportar_filas(ruta, ['n'], ((i,) for i in range(5)), hoja='Accesos') == 5
+    libro = load_workbook(ruta, read_only=True)
+    hojas = {hoja.title: [fila[0] for fila in hoja.iter_rows(values_only=True)] for hoja in libro.worksheets}
+    libro.close()
+    assert hojas == {'Accesos': ['n', 0, 1], 'Accesos 2': ['n', 2, 3], 'Accesos 3': ['n', 4]}
+
+
+def test_exportar_vacio_deja_encabezados(tmp_path):
+    ruta = str(tmp_path / 'vacio.xlsx')
+    assert exportar_filas(ruta, ['a', 'b'], iter(())) == 0
+    libro = load_workbook(ruta, read_only=True)
+    assert list(libro.active.iter_rows(values_only=True)) == [('a', 'b')]
+    libro.close()
+
+
+def test_cancelar_no_deja_archivo(monkeypatch, tmp_path):
+    monkeypatch.setattr(exportacion, 'AVISO_CADA', 2)
+    ruta = tmp_path / 'datos.csv'
+    ruta.write_text('anterior')
+    avisos = []
+
+    def al_avanzar(escritas):
+        avisos.append(escritas)
+        return escritas < 4
+
+    with pytest.raises(ExportacionCancelada):
+        exportar_filas(str(ruta), ['n'], ((i,) for i in range(10)), al_avanzar=al_avanzar)
+    assert avisos == [2, 4]
+    # El archivo anterior queda intacto y el temporal se borra
+    assert ruta.read_text() == 'anterior'
+    assert os.listdir(tmp_path) == ['datos.csv']
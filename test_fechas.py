@@ -0,0 +1,57 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from database import Database, rango_fechas, rango_mes
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'))
+    db.insert_cliente('1001', 'Ana', 'Pérez')
+    yield db
+    db.cerrar()
+
+
+def test_rangos_son_semiabiertos():
+    assert rango_fechas('2025-03-31') == ('2025-03-31', '2025-04-01')
+    assert rango_fechas(date(2025, 1, 1), '2025-01-31 23:59:59') == ('2025-01-01', '2025-02-01')
+    assert rango_mes(2024, 12) == ('2024-12-01', '2025-01-01')
+
+
+def test_accesos_por_fecha_incluye_todo_el_ultimo_dia(db):
+    registros = [
+        ('1001', 'Entrada', datetime(2025, 3, 1, 0, 0, 0)),
+        ('1001', 'Entrada', datetime(2025, 3, 2, 23, 59, 59, 999999)),
+        ('1001', 'Entrada', datetime(2025, 3, 3, 0, 0, 0)),
+    ]
+    db.conn.executemany(
+        "INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora) VALUES (?, ?, ?)",
+        registros)
+    db.conn.commit()
+
+    assert len(db.get_accesos_por_fecha('2025-03-01', '2025-03-02')) == 2
+    assert len(db.get_accesos_por_fecha('2025-03-03')) == 1
+
+
+def test_ingresos_por_mes_respeta_limites_del_año(db):
+    for fecha, monto in [('2024-12-31', 10.0), ('2025-01-01', 20.0), ('2025-12-31', 30.0)]:
+        db.conn.execute(
+            "INSERT INTO pagos (cedula_cliente, monto, duracion_meses, fecha_pago, "
+            "fecha_vencimiento, metodo_pago, activo) VALUES ('1001', ?, 1, ?, ?, 'Efectivo', 0)",
+            (monto, fecha, fecha))
+    db.conn.commit()
+
+    assert db.get_ingresos_por_mes(2025) == [('01', 20.0, 1), ('12', 30.0, 1)]
+
+
+def test_estadisticas_cuentan_accesos_de_hoy(db):
+    ayer = datetime.now() - timedelta(days=1)
+    db.conn.execute(
+        "INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora) VALUES ('1001', 'Entrada', ?)",
+        (ayer,))
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+    db.registrar_acceso('1001', 'Entrada')
+
+    assert db.get_estadisticas_completas()['accesos_hoy'] == 1
+    assert db.get_estadisticas_accesos()['accesos_hoy'] == 1
@@ -0,0 +1,47 @@
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from graficos import GraficoBarras, GraficoDobleEje, GraficoTorta
+
+
+def figura():
+    fig = Figure()
+    return fig, FigureCanvasAgg(fig)
+
+
+def test_barras_reusan_artistas():
+    grafico = GraficoBarras(*figura(), 'Ingresos', '$', '#3498db')
+    grafico.actualizar(['Ene', 'Feb'], [100.0, 250.0])
+    barras = list(grafico.barras)
+    grafico.actualizar(['Feb', 'Mar'], [300.0, 0.0])
+    assert grafico.barras == barras
+    assert [barra.get_height() for barra in barras] == [300.0, 0.0]
+    assert [texto.get_text() for texto in grafico.valores] == ['$300', '$0']
+    assert grafico.ax.get_ylim()[1] > 300
+
+    grafico.actualizar(['Ene', 'Feb', 'Mar'], [1.0, 2.0, 3.0])
+    assert len(grafico.ax.patches) == 3
+
+
+def test_torta_oculta_categorias_vacias():
+    grafico = GraficoTorta(*figura(), 'Estado', ['Activos', 'Vencidos', 'Sin Pago'],
+                           ['#27ae60', '#e74c3c', '#95a5a6'])
+    grafico.actualizar([3, 1, 0])
+    assert [porcion.get_visible() for porcion in grafico.porciones] == [True, True, False]
+    assert [texto.get_text() for texto in grafico.porcentajes[:2]] == ['75.0%', '25.0%']
+    assert (grafico.porciones[0].theta1, grafico.porciones[0].theta2) == (90, 360)
+    grafico.actualizar([0, 0, 0])
+    assert not any(porcion.get_visible() for porcion in grafico.porciones)
+
+
+def test_doble_eje_no_suma_ejes():
+    fig, canvas = figura()
+    grafico = GraficoDobleEje(fig, canvas, 'Tendencia', ('Clientes', '#3498db', 'o', 8),
+                              ('Ingresos', '#e74c3c', 's', 6))
+    for i in range(5):
+        grafico.actualizar(['Ene', 'Feb'], [i, i + 1], [100 * i, 200 * i])
+    assert len(fig.axes) == 2
+    assert list(grafico.lineas[1].get_ydata()) == [400, 800]
+    assert grafico.ax2.get_ylim()[1] >= 800
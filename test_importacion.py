@@ -0,0 +1,212 @@
+import os
+
+import pytest
+
+from database import Database
+
+pd = pytest.importorskip('pandas')
+
+from importacion import (columnas_faltantes, importar_archivo, importar_clientes, leer_bloques,
+                        preparar_clientes, progreso_guardado, ruta_informe, ruta_progreso)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'))
+    db.insert_cliente('1001', 'Ana', 'Pérez')
+    yield db
+    db.cerrar()
+
+
+def test_preparar_clientes_normaliza_y_separa():
+    df = pd.DataFrame({
+        ' Cedula ': [2001.0, 2002.0, None, 2001.0, 1001.0],
+        'Nombre': [' Luis ', 'Eva', 'Sin', 'Luis', 'Ana'],
+        'apellido': ['Gómez', '', 'Cédula', 'Gómez', 'Pérez'],
+        'telefono': ['0414', None, '', '', ''],
+    })
+    validas, rechazadas, duplicadas = preparar_clientes(df, {'1001'})
+
+    assert validas.values.tolist() == [['2001', 'Luis', 'Gómez', '0414', '', '']]
+    assert rechazadas == 2
+    assert duplicadas == ['2001', '1001']
+
+
+def test_importar_clientes_en_un_lote(db):
+    df = pd.DataFrame({'cedula': ['3001', '3002', '1001', '3001', ''],
+                       'nombre': ['Eva', 'Luis', 'Ana', 'Eva', 'X'],
+                       'apellido': ['Ruiz', 'Gómez', 'Pérez', 'Ruiz', 'Y']})
+    assert columnas_faltantes(df) == []
+    assert columnas_faltantes(df[['cedula']]) == ['nombre', 'apellido']
+
+    consultas = []
+    db.conn.set_trace_callback(consultas.append)
+    resultado = importar_clientes(db, df)
+    db.conn.set_trace_callback(None)
+
+    assert resultado == {'insertados': 2, 'rechazados': 1, 'duplicados': ['1001', '3001'], 'omitidos': 0}
+    # Una sola transacción para todo el lote
+    assert sum(c.startswith('BEGIN') for c in consultas) == 1
+    assert sum(c == 'COMMIT' for c in consultas) == 1
+    assert db.get_cliente_by_cedula('3002')[1:4] == ('Luis', 'Gómez', '')
+    assert db.busqueda_fts and [c[0] for c in db.buscar_clientes({'texto': 'gomez'})] == ['3002']
+
+
+def test_lote_ignora_cedulas_registradas_despues_de_validar(db):
+    assert db.insertar_clientes_lote([('1001', 'Otra', 'Ana', '', '', ''),
+                                      ('4001', 'Nuevo', 'Cliente', '', '', '')]) == 1
+    assert db.get_cliente_by_cedula('1001')[1] == 'Ana'
+    assert [c[0] for c in db.buscar_clientes({'texto': 'nuevo'})] == ['4001']
+
+    # Si el lote falla, el trigger de FTS vuelve con el rollback
+    with pytest.raises(Exception):
+        db.insertar_clientes_lote([('5001', 'Fila', 'Incompleta')])
+    db.insert_cliente('5002', 'Zoe', 'Luna')
+    assert [c[0] for c in db.buscar_clientes({'texto': 'zoe'})] == ['5002']
+
+
+def escribir_archivo(ruta, filas):
+    encabezados = ['Cedula', 'Nombre', 'Apellido', 'Telefono']
+    if str(ruta).endswith('.csv'):
+        with open(ruta, 'w', encoding='utf-8') as f:
+            f.write(';'.join(encabezados) + '\n')
+            f.writelines(';'.join(map(str, fila)) + '\n' for fila in filas)
+    else:
+        openpyxl = pytest.importorskip('openpyxl')
+        libro = openpyxl.Workbook(write_only=True)
+        hoja = libro.create_sheet()
+        hoja.append(encabezados)
+        for fila in filas:
+            hoja.append(fila)
+        libro.save(ruta)
+    return str(ruta)
+
+
+def filas_de_prueba():
+    filas = [(5000 + i, f'Nombre{i}', f'Apellido{i}', '') for i in range(23)]
+    filas[4] = (1001, 'Ana', 'Pérez', '')        # ya registrada
+    filas[9] = (5003, 'Otra', 'Vez', '')         # repetida en el archivo
+    filas[15] = ('', 'Sin', 'Cédula', '')        # rechazada
+    return filas
+
+
+@pytest.mark.parametrize('extension', ['csv', 'xlsx'])
+def test_leer_bloques_por_partes(tmp_path, extension):
+    ruta = escribir_archivo(tmp_path / f'clientes.{extension}', filas_de_prueba())
+    bloques = list(leer_bloques(ruta, tamaño=10))
+    assert [len(b) for b, _, _ in bloques] == [10, 10, 3]
+    assert [leidas for _, leidas, _ in bloques] == [10, 20, 23]
+    assert bloques[-1][2] == 1.0
+    # Continuar desde la fila 20 solo lee las 3 últimas
+    assert [str(c) for c in list(leer_bloques(ruta, tamaño=10, saltar=20))[0][0].iloc[:, 0]] == \
+        ['5020', '5021', '5022']
+
+
+@pytest.mark.parametrize('extension', ['csv', 'xlsx'])
+def test_importar_archivo_continua_desde_el_punto_de_control(db, tmp_path, extension):
+    ruta = escribir_archivo(tmp_path / f'clientes.{extension}', filas_de_prueba())
+    avances = []
+
+    def detener_tras_el_primer_bloque(fraccion, progreso):
+        avances.append(progreso['filas'])
+        return False
+
+    parcial = importar_archivo(db, ruta, tamaño_bloque=10, al_avanzar=detener_tras_el_primer_bloque)
+    assert not parcial['completo'] and avances == [10]
+    assert progreso_guardado(ruta)['filas'] == 10
+    assert db.contar_clientes() == 1 + 8
+
+    def fallar(fraccion, progreso):
+        raise RuntimeError('se cortó la luz')
+
+    with pytest.raises(RuntimeError):
+        importar_archivo(db, ruta, tamaño_bloque=10, al_avanzar=fallar)
+    assert progreso_guardado(ruta)['filas'] == 20
+
+    final = importar_archivo(db, ruta, tamaño_bloque=10)
+    assert final['completo'] and final['reanudado_desde'] == 20
+    assert (final['insertados'], final['duplicados'], final['rechazados']) == (20, 2, 1)
+    assert final['ejemplos_duplicados'] == ['1001', '5003']
+    assert db.contar_clientes() == 21
+    assert not os.path.exists(ruta_progreso(ruta))
+
+
+def test_continuar_csv_con_campos_de_varias_lineas(db, tmp_path):
+    ruta = tmp_path / 'clientes.csv'
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write('cedula;nombre;apellido;direccion\n')
+        for i in range(6):
+            f.write(f'{6000 + i};Nombre{i};Apellido{i};"Calle {i}\nPiso {i}\nApto {i}"\n')
+    ruta = str(ruta)
+
+    parcial = importar_archivo(db, ruta, tamaño_bloque=2, al_avanzar=lambda fraccion, progreso: False)
+    assert not parcial['completo'] and progreso_guardado(ruta)['filas'] == 2
+    # Continuar salta 2 registros, no 2 líneas del archivo
+    assert [list(b['cedula']) for b, _, _ in leer_bloques(ruta, tamaño=2, saltar=3)] == [['6003'], ['6004', '6005']]
+
+    final = importar_archivo(db, ruta, tamaño_bloque=2)
+    assert final['completo'] and (final['insertados'], final['rechazados'], final['duplicados']) == (6, 0, 0)
+    assert db.contar_clientes() == 1 + 6
+    assert db.get_cliente_by_cedula('6004')[5] == 'Calle 4\nPiso 4\nApto 4'
+
+
+def test_importar_archivo_exige_columnas(db, tmp_path):
+    ruta = tmp_path / 'malo.csv'
+    ruta.write_text('cedula,nombre\n1,Ana\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        importar_archivo(db, str(ruta))
+
+
+def test_sincronizar_simula_y_aplica_solo_los_cambios(db, tmp_path):
+    db.insert_cliente('1002', 'Luis', 'Gómez', '0414-1', '', 'Calle 1')
+    db.insert_cliente('1003', 'Eva', 'Ruiz', '0414-2')
+    # El archivo no trae dirección: esa columna no se toca
+    ruta = tmp_path / 'crm.csv'
+    ruta.write_text('cedula,nombre,apellido,telefono\n'
+                    '1001,Ana,Pérez,\n'            # sin cambios
+                    '1002,Luis,Gómez,0424-9\n'     # cambia el teléfono
+                    '1003,Eva María,Ruiz,0414-2\n'  # cambia el nombre
+                    '1003,Eva,Ruiz,\n'             # repetida en el archivo
+                    '2001,Nuevo,Cliente,0412\n', encoding='utf-8')
+    ruta = str(ruta)
+
+    simulado = importar_archivo(db, ruta, actualizar=True, simular=True)
+    assert simulado['simulado'] and not os.path.exists(ruta_progreso(ruta))
+    assert (simulado['insertados'], simulado['actualizados'], simulado['sin_cambios'],
+            simulado['duplicados']) == (1, 2, 1, 1)
+    assert db.get_cliente_by_cedula('1002')[3] == '0414-1' and db.get_cliente_by_cedula('2001') is None
+    informe = pd.read_csv(ruta_informe(ruta), dtype=str, keep_default_na=False)
+    assert informe.values.tolist() == [['2001', '(nuevo)', '', 'Nuevo Cliente'],
+                                       ['1002', 'telefono', '0414-1', '0424-9'],
+                                       ['1003', 'nombre', 'Eva', 'Eva María']]
+
+    enviadas = []
+    upsert = db.upsert_clientes_lote
+    db.upsert_clientes_lote = lambda filas, campos: upsert(enviadas.extend(filas) or enviadas, campos)
+    aplicado = importar_archivo(db, ruta, actualizar=True)
+    del db.upsert_clientes_lote
+    assert (aplicado['insertados'], aplicado['actualizados'], aplicado['sin_cambios']) == (1, 2, 1)
+    # Solo se envían a la base de datos la fila nueva y las dos con cambios
+    assert sorted(f[0] for f in enviadas) == ['1002', '1003', '2001']
+    assert db.get_cliente_by_cedula('1002')[3:6] == ('0424-9', '', 'Calle 1')
+    assert [c[0] for c in db.buscar_clientes({'texto': 'eva mar'})] == ['1003']
+
+    # Repetir la sincronización no cambia nada
+    otra = importar_archivo(db, ruta, actualizar=True)
+    assert (otra['insertados'], otra['actualizados'], otra['sin_cambios']) == (0, 0, 4)
+
+
+def test_upsert_no_escribe_filas_iguales(db):
+    assert db.upsert_clientes_lote([('1001', 'Ana', 'Pérez'), ('1002', 'Luis', 'Gómez')],
+                                   ['nombre', 'apellido']) == (1, 0)
+    assert db.upsert_clientes_lote([('1001', 'Ana', 'Pérez'), ('1002', 'Luis', 'Gomez')],
+                                   ['nombre', 'apellido']) == (0, 1)
+    with pytest.raises(ValueError):
+        db.upsert_clientes_lote([], ['nombre', 'apellido', 'foto_path'])
+
+
+def test_upsert_invalida_cache_de_miembros(db):
+    db.insert_cliente('1', 'Ana', 'Viejo')
+    assert db.registrar_acceso_validado('1')[2]['nombre_completo'] == 'Ana Viejo'
+    assert db.upsert_clientes_lote([('1', 'Ana', 'Nuevo')], ['nombre', 'apellido']) == (0, 1)
+    assert db.registrar_acceso_validado('1')[2]['nombre_completo'] == 'Ana Nuevo'
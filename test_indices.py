@@ -0,0 +1,143 @@
+import re
+from datetime import date
+
+import pytest
+
+from database import Database, MIGRACIONES
+
+# Fragmentos de SQL que todavía recorren la tabla completa a propósito
+ESCANEOS_PERMITIDOS = [
+    "LIKE '%",                       # comodín inicial: ningún índice sirve
+    "SELECT COUNT(*) FROM clientes",  # conteo total recorre el índice más pequeño
+    "SELECT COUNT(*) FROM pagos",
+    "SELECT COUNT(*) FROM accesos",
+    "FROM clientes ORDER BY nombre",  # listado completo en orden del índice
+    "GROUP BY hora",                 # hora pico agrupa el resumen diario (24 filas por día)
+    ".'clientes_fts_",               # lecturas internas de FTS5 (configuración)
+    "FROM pagos p LEFT JOIN clientes c",  # historial completo de pagos, en orden del índice
+    "FROM meses m",                  # meses del período: filas constantes, no una tabla
+]
+
+# Recorridos de resultados intermedios (VALUES, subconsultas ya agregadas)
+SCAN_INTERMEDIO = re.compile(r'^SCAN (\d+ CONSTANT ROWS|\(subquery-\d+\))')
+
+# Un recorrido por índice solo es aceptable si la consulta corta con LIMIT
+SCAN_POR_INDICE = re.compile(r'^SCAN \w+ USING (COVERING )?INDEX')
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'))
+    for i in range(20):
+        db.insert_cliente(f"{1000 + i}", f"Nombre{i}", f"Apellido{i}", f"600{i}")
+        db.insert_pago(f"{1000 + i}", 50.0, 1, "Efectivo")
+        db.registrar_acceso(f"{1000 + i}", "Entrada")
+    yield db
+    db.cerrar()
+
+
+def llamadas(db):
+    """Invoca cada método de Database que ejecuta SQL"""
+    hoy = date.today().isoformat()
+    return {
+        'get_cliente_by_cedula': lambda: db.get_cliente_by_cedula('1001'),
+        'actualizar_cliente': lambda: db.actualizar_cliente('1001', 'N', 'A', '', '', '', ''),
+        'buscar_clientes': lambda: db.buscar_clientes({'nombre': 'Nom'}, 'Activos'),
+        'get_historial_completo_cliente': lambda: db.get_historial_completo_cliente('1001'),
+        'insert_pago': lambda: db.insert_pago('1002', 50.0, 1, 'Tarjeta'),
+        'get_pagos_by_cliente': lambda: db.get_pagos_by_cliente('1001'),
+        'get_pago_activo': lambda: db.get_pago_activo('1001'),
+        'iterar_pagos_con_cliente': lambda: list(db.iterar_pagos_con_cliente()),
+        'registrar_acceso': lambda: db.registrar_acceso('1001', 'Salida'),
+        'get_accesos_recientes': lambda: db.get_accesos_recientes(20),
+        'get_estadisticas_completas': db.get_estadisticas_completas,
+        'estadisticas': lambda: db.estadisticas(max_edad=0),
+        'get_clientes_proximos_vencer': lambda: db.get_clientes_proximos_vencer(30),
+        'get_accesos_por_fecha': lambda: db.get_accesos_por_fecha(hoy),
+        'get_estadisticas_accesos': db.get_estadisticas_accesos,
+        'contar_entradas': lambda: db.contar_entradas(hoy),
+        'get_ultimo_acceso_cliente': lambda: db.get_ultimo_acceso_cliente('1001'),
+        'get_all_clientes': db.get_all_clientes,
+        'get_clientes_vencidos': db.get_clientes_vencidos,
+        'get_ingresos_por_mes': db.get_ingresos_por_mes,
+        'contar_clientes': db.contar_clientes,
+        'contar_pagos': db.contar_pagos,
+        'contar_accesos': db.contar_accesos,
+        'pagina_clientes': lambda: db.pagina_clientes(('Nombre1', 'Apellido1', '1001'), 5),
+        'clave_cliente_en': lambda: db.clave_cliente_en(10),
+        'pagina_pagos': lambda: db.pagina_pagos((hoy, 5), 5),
+        'clave_pago_en': lambda: db.clave_pago_en(10),
+        'pagina_accesos': lambda: db.pagina_accesos((hoy, 5), 5),
+        'clave_acceso_en': lambda: db.clave_acceso_en(10),
+        'reporte_pagos_mensuales': lambda: db.reporte_pagos_mensuales('2025-11-15', hoy),
+        'reporte_accesos_diarios': lambda: db.reporte_accesos_diarios('2025-11-15', hoy),
+        'reporte_ingresos_metodo': lambda: db.reporte_ingresos_metodo('2025-11-15', hoy),
+        'reporte_tendencia': lambda: db.reporte_tendencia('2025-11-15', hoy),
+        'eliminar_cliente': lambda: db.eliminar_cliente('1019'),
+    }
+
+
+def test_migraciones_actualizan_user_version(db):
+    version = db.conn.execute("PRAGMA user_version").fetchone()[0]
+    assert version == len(MIGRACIONES)
+
+    indices = {fila[0] for fila in db.conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {'idx_pagos_cliente_activo', 'idx_pagos_vencimiento_activo',
+            'idx_accesos_fecha_hora'} <= indices
+
+
+def test_migraciones_son_idempotentes(db):
+    db.aplicar_migraciones()
+    reabierta = Database(db.ruta_db)
+    assert reabierta.conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRACIONES)
+    reabierta.conn.close()
+
+
+def test_consultas_no_recorren_tablas_completas(db):
+    escaneos = []
+    for metodo, llamada in llamadas(db).items():
+        sentencias = []
+        for conn in (db.conn, db.lectura()):
+            conn.set_trace_callback(sentencias.append)
+        try:
+            llamada()
+        finally:
+            for conn in (db.conn, db.lectura()):
+                conn.set_trace_callback(None)
+
+        for sql in sentencias:
+            sql = ' '.join(sql.split())
+            if not sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE', 'WITH')):
+                continue
+            plan = db.conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+            for fila in plan:
+                detalle = fila[3]
+                if not detalle.startswith('SCAN '):
+                    continue
+                if any(fragmento in sql for fragmento in ESCANEOS_PERMITIDOS):
+                    continue
+                if SCAN_POR_INDICE.match(detalle) and ' LIMIT ' in sql.upper():
+                    continue
+                if 'VIRTUAL TABLE INDEX' in detalle:  # búsqueda en el índice FTS5
+                    continue
+                if SCAN_INTERMEDIO.match(detalle):
+                    continue
+                escaneos.append(f"{metodo}: {detalle} <- {sql}")
+
+    assert not escaneos, "\n".join(escaneos)
+
+
+def test_historial_de_pagos_en_una_sola_consulta(db):
+    sentencias = []
+    db.lectura().set_trace_callback(sentencias.append)
+    try:
+        pagos = list(db.iterar_pagos_con_cliente(tamaño_lote=7))
+    finally:
+        db.lectura().set_trace_callback(None)
+
+    assert len(sentencias) == 1
+    assert len(pagos) == 20
+    assert {(p[1], p[2]) for p in pagos} == {(f"{1000 + i}", f"Nombre{i}") for i in range(20)}
+    fechas = [p[6] for p in pagos]
+    assert fechas == sorted(fechas, reverse=True)
@@ -0,0 +1,80 @@
+import pytest
+
+from database import Database
+from lista_virtual import ProveedorLista, ProveedorPaginado, VentanaPaginada
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'))
+    cursor = db.conn.cursor()
+    # Nombres repetidos para que el desempate por cédula importe
+    cursor.executemany(
+        "INSERT INTO clientes (cedula, nombre, apellido) VALUES (?, ?, ?)",
+        [(f"{5000 - i}", f"Nombre{i % 7}", "Apellido") for i in range(250)])
+    cursor.executemany(
+        "INSERT INTO pagos (cedula_cliente, monto, duracion_meses, fecha_pago, fecha_vencimiento, "
+        "metodo_pago, activo) VALUES (?, 50.0, 1, ?, ?, 'Efectivo', 0)",
+        [(f"{5000 - i % 250}", f"2025-01-{1 + i % 28:02d}", "2025-02-01") for i in range(300)])
+    db.conn.commit()
+    yield db
+    db.cerrar()
+
+
+def proveedor_clientes(db):
+    return ProveedorPaginado(db.contar_clientes, db.pagina_clientes, db.clave_cliente_en,
+                             clave=lambda f: (f[1], f[2], f[0]))
+
+
+def recorrer(ventana, total, saltar=False):
+    filas = []
+    numero = 0
+    while len(filas) < total:
+        if saltar:
+            ventana.paginas.clear()
+        pagina = ventana.leer(numero)
+        ventana.guardar(numero, pagina, numero)
+        filas.extend(pagina)
+        numero += 1
+    return filas
+
+
+def test_paginas_por_clave_recorren_el_orden_completo(db):
+    esperado = db.get_all_clientes()
+    esperado.sort(key=lambda f: (f[1], f[2], f[0]))
+    ventana = VentanaPaginada(proveedor_clientes(db), tamaño_pagina=40)
+
+    assert recorrer(ventana, db.contar_clientes()) == esperado
+    # Sin la página anterior en memoria se salta con clave_cliente_en
+    assert recorrer(ventana, db.contar_clientes(), saltar=True) == esperado
+
+
+def test_pagos_y_accesos_paginados_en_orden_descendente(db):
+    proveedor = ProveedorPaginado(db.contar_pagos, db.pagina_pagos, db.clave_pago_en,
+                                  clave=lambda f: (f[6], f[0]))
+    pagos = recorrer(VentanaPaginada(proveedor, tamaño_pagina=64), db.contar_pagos())
+    assert [(p[6], p[0]) for p in pagos] == sorted(((p[6], p[0]) for p in pagos), reverse=True)
+    assert len({p[0] for p in pagos}) == 300
+
+    # Misma fecha_hora en todos: el orden lo desempata el id
+    db.conn.executemany(
+        "INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora) VALUES ('5000', 'Entrada', ?)",
+        [('2025-03-01 10:00:00',)] * 5)
+    db.conn.commit()
+    accesos = db.pagina_accesos(limite=3)
+    accesos += db.pagina_accesos((accesos[-1][3], accesos[-1][0]), limite=3)
+    assert [a[0] for a in accesos] == [5, 4, 3, 2, 1]
+    assert db.clave_acceso_en(4) == (accesos[4][3], 1)
+
+
+def test_ventana_solo_conserva_paginas_cercanas():
+    ventana = VentanaPaginada(ProveedorLista(list(range(1000))), tamaño_pagina=10, paginas_en_memoria=3)
+    ventana.total = 1000
+
+    assert ventana.faltantes(55, 20) == [4, 5, 6, 7, 8]
+    for numero in (4, 5, 6, 7, 8):
+        ventana.guardar(numero, ventana.leer(numero), actual=5)
+    assert sorted(ventana.paginas) == [4, 5, 6]
+    assert ventana.filas(58, 4) == [58, 59, 60, 61]
+    assert ventana.filas(68, 4) == [68, 69, None, None]
+    assert ventana.faltantes(995, 20, prefetch=0) == [99]
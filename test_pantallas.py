@@ -0,0 +1,79 @@
+import pytest
+
+from pantallas import Pantallas
+
+
+class MarcoFalso:
+    """Sustituye a tk.Frame: solo registra si está a la vista"""
+
+    def __init__(self):
+        self.visible = False
+        self.destruido = False
+
+    def pack(self, **opciones):
+        self.visible = True
+
+    def pack_forget(self):
+        self.visible = False
+
+    def destroy(self):
+        self.destruido = True
+
+
+class PantallaFalsa:
+    def __init__(self, marco):
+        self.marco = marco
+        self.refrescos = 0
+
+    def refrescar(self):
+        self.refrescos += 1
+
+
+@pytest.fixture
+def pantallas():
+    pantallas = Pantallas(root=None, crear_marco=MarcoFalso)
+    pantallas.construidas = []
+
+    def construir(nombre):
+        def fabrica(marco):
+            pantallas.construidas.append(nombre)
+            return PantallaFalsa(marco)
+        return fabrica
+
+    for nombre in ('menu', 'reportes'):
+        pantallas.registrar(nombre, construir(nombre))
+    return pantallas
+
+
+def test_cada_pantalla_se_construye_una_vez(pantallas):
+    menu = pantallas.mostrar('menu')
+    reportes = pantallas.mostrar('reportes')
+    assert not menu.marco.visible and reportes.marco.visible
+    assert pantallas.mostrar('menu') is menu
+    assert pantallas.mostrar('reportes') is reportes
+
+    assert pantallas.construidas == ['menu', 'reportes']
+    # Al volver solo se refrescan los datos
+    assert (menu.refrescos, reportes.refrescos) == (1, 1)
+    assert reportes.marco.visible and not menu.marco.visible
+    assert pantallas.es_pantalla(menu.marco)
+
+
+def test_pantalla_fallida_se_reintenta(pantallas):
+    intentos = []
+
+    def fallar(marco):
+        intentos.append(marco)
+        if len(intentos) == 1:
+            raise RuntimeError("sin datos")
+        return PantallaFalsa(marco)
+
+    pantallas.registrar('pagos', fallar)
+    pantallas.mostrar('menu')
+    with pytest.raises(RuntimeError):
+        pantallas.mostrar('pagos')
+    assert intentos[0].destruido and not pantallas.es_pantalla(intentos[0])
+    assert pantallas.actual is None
+
+    assert pantallas.mostrar('pagos').marco is intentos[1]
+    assert len(intentos) == 2
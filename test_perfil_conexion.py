@@ -0,0 +1,52 @@
+import json
+
+from database import Database, cargar_perfil_conexion
+
+
+def pragma(db, nombre):
+    return db.conn.execute(f"PRAGMA {nombre}").fetchone()[0]
+
+
+def test_perfil_predeterminado_activa_wal(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'), perfil=cargar_perfil_conexion(str(tmp_path / 'no.json')))
+    assert pragma(db, 'journal_mode') == 'wal'
+    assert pragma(db, 'synchronous') == 1  # NORMAL
+    assert pragma(db, 'temp_store') == 2   # MEMORY
+    assert pragma(db, 'foreign_keys') == 1
+    db.cerrar()
+
+
+def test_perfil_se_lee_de_config_y_valida_valores(tmp_path):
+    ruta_config = tmp_path / 'config.json'
+    ruta_config.write_text(json.dumps({'base_datos': {
+        'journal_mode': 'DELETE', 'synchronous': 'FULL; DROP TABLE clientes', 'cache_size_kb': 4096}}))
+
+    db = Database(str(tmp_path / 'gimnasio.db'), perfil=cargar_perfil_conexion(str(ruta_config)))
+    assert pragma(db, 'journal_mode') == 'delete'
+    assert pragma(db, 'synchronous') == 1  # valor inválido: se usa NORMAL
+    assert pragma(db, 'cache_size') == -4096
+    db.cerrar()
+
+
+def test_eliminar_cliente_con_claves_foraneas(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'))
+    db.insert_cliente('1001', 'Ana', 'Pérez')
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+    db.registrar_acceso('1001')
+
+    assert db.eliminar_cliente('1001')
+    assert db.conn.execute("SELECT COUNT(*) FROM pagos").fetchone()[0] == 0
+    assert db.conn.execute("SELECT COUNT(*) FROM accesos").fetchone()[0] == 0
+    db.cerrar()
+
+
+def test_backup_y_restauracion_con_wal(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'))
+    db.insert_cliente('1001', 'Ana', 'Pérez')
+    ruta_backup = str(tmp_path / 'backup.db')
+    assert db.crear_backup(ruta_backup)
+
+    db.insert_cliente('1002', 'Luis', 'Gómez')
+    assert db.restaurar_backup(ruta_backup)
+    assert [c[0] for c in db.get_all_clientes()] == ['1001']
+    db.cerrar()
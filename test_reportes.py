@@ -0,0 +1,182 @@
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from database import Database, meses_entre
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'))
+    for cedula in ('1001', '1002', '1003'):
+        db.insert_cliente(cedula, 'Nombre', 'Apellido')
+    cursor = db.conn.cursor()
+    cursor.executemany(
+        "INSERT INTO pagos (cedula_cliente, monto, duracion_meses, fecha_pago, fecha_vencimiento, "
+        "metodo_pago, activo) VALUES (?, ?, 1, ?, ?, ?, 0)", [
+            ('1001', 50.0, '2026-01-10', '2026-02-09', 'Efectivo'),
+            ('1002', 30.0, '2026-01-31', '2026-03-02', 'Tarjeta'),
+            ('1001', 50.0, '2026-02-09', '2026-03-11', 'Efectivo'),
+            ('1003', 20.0, '2025-12-31', '2026-01-30', 'Efectivo'),
+        ])
+    cursor.executemany(
+        "INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora) VALUES (?, ?, ?)", [
+            ('1001', 'Entrada', '2026-02-03 07:10:00'),
+            ('1002', 'Entrada', '2026-02-03 18:20:00'),
+            ('1003', 'Entrada', '2026-02-03 18:40:00'),
+            ('1001', 'Salida', '2026-02-03 08:30:00'),
+            ('1002', 'Entrada', '2026-02-04 06:00:00'),
+            ('1002', 'Entrada', '2026-03-01 06:00:00'),
+        ])
+    cursor.execute("UPDATE clientes SET fecha_registro = '2026-01-15' WHERE cedula = '1002'")
+    db.conn.commit()
+    yield db
+    db.cerrar()
+
+
+def consultas(db, llamada):
+    sentencias = []
+    db.lectura().set_trace_callback(sentencias.append)
+    try:
+        resultado = llamada()
+    finally:
+        db.lectura().set_trace_callback(None)
+    return resultado, len(sentencias)
+
+
+def test_meses_entre_recorta_al_periodo():
+    assert meses_entre('2025-12-15', '2026-02-10') == [
+        ('2025-12', '2025-12-15', '2026-01-01'),
+        ('2026-01', '2026-01-01', '2026-02-01'),
+        ('2026-02', '2026-02-01', '2026-02-11'),
+    ]
+    assert meses_entre('2026-03-01', '2026-02-01') == []
+
+
+def test_reportes_del_periodo(db):
+    assert db.reporte('pagos_mensuales', '2026-01-01', '2026-03-31') == [
+        ('2026-01', 2, 80.0, 1), ('2026-02', 1, 50.0, 0), ('2026-03', 0, 0, 0)]
+    assert db.reporte('accesos_diarios', '2026-02-01', '2026-02-28') == [
+        ('2026-02-04', 1, 0, 1, '06:00'), ('2026-02-03', 3, 1, 4, '18:00')]
+    metodos = db.reporte('ingresos_metodo', '2026-01-01', '2026-02-28')
+    assert [fila[:3] for fila in metodos] == [('Efectivo', 2, 100.0), ('Tarjeta', 1, 30.0)]
+    assert round(metodos[0][3], 1) == 76.9
+    # Vigentes al 31/01: 1001 (vence 09/02) y 1002 (pagó ese día); al 28/02: 1001 y 1002
+    assert db.reporte('tendencia', '2026-01-01', '2026-02-28') == [
+        ('2026-01', 2, 80.0), ('2026-02', 2, 50.0)]
+
+
+def test_reporte_usa_la_cache_hasta_que_hay_pagos(db):
+    primero, leidas = consultas(db, lambda: db.reporte('ingresos_metodo', '2025-01-01', date.today()))
+    assert leidas == 1
+    segundo, leidas = consultas(db, lambda: db.reporte('ingresos_metodo', '2025-01-01', date.today()))
+    assert (segundo, leidas) == (primero, 0)
+
+    # Un acceso no afecta a un reporte de pagos
+    db.insert_pago('1003', 40.0, 1, 'Transferencia')
+    db.registrar_acceso('1003', 'Entrada')
+    db.reporte('accesos_diarios', '2026-01-01', date.today())
+    tercero, leidas = consultas(db, lambda: db.reporte('ingresos_metodo', '2025-01-01', date.today()))
+    assert leidas == 1
+    assert ('Transferencia', 1, 40.0) in [fila[:3] for fila in tercero]
+    _, leidas = consultas(db, lambda: db.reporte('ingresos_metodo', '2025-01-01', date.today()))
+    assert leidas == 0
+
+
+def test_reporte_ve_pagos_de_otra_instancia(db):
+    primero = db.reporte('ingresos_metodo', '2025-01-01', date.today())
+    otra = Database(db.ruta_db)
+    try:
+        otra.insert_pago('1003', 40.0, 1, 'Transferencia')
+    finally:
+        otra.cerrar()
+    segundo = db.reporte('ingresos_metodo', '2025-01-01', date.today())
+    assert ('Transferencia', 1, 40.0) in [fila[:3] for fila in segundo]
+    assert segundo != primero
+
+
+def test_escritor_de_accesos_invalida_reportes(db):
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+    hoy = date.today()
+    assert db.reporte('accesos_diarios', hoy, hoy) == []
+    db.iniciar_escritor_accesos(max_eventos=1, intervalo=0.05)
+    db.registrar_acceso('1001', 'Entrada')
+    assert db.escritor_accesos.esperar_vaciado()
+    assert [fila[1] for fila in db.reporte('accesos_diarios', hoy, hoy)] == [1]
+
+
+def test_no_guarda_un_calculo_invalidado(db, monkeypatch):
+    calcular = db.reporte_ingresos_metodo
+
+    def con_pago_en_medio(desde, hasta):
+        filas = calcular(desde, hasta)
+        db.insert_pago('1002', 10.0, 1, 'Tarjeta')
+        return filas
+
+    monkeypatch.setattr(db, 'reporte_ingresos_metodo', con_pago_en_medio)
+    hasta = date.today() + timedelta(days=1)
+    viejo = db.reporte('ingresos_metodo', '2025-01-01', hasta)
+    monkeypatch.setattr(db, 'reporte_ingresos_metodo', calcular)
+    assert db.reporte('ingresos_metodo', '2025-01-01', hasta) != viejo
+
+
+def test_estadisticas_en_una_consulta(db):
+    estadisticas, leidas = consultas(db, db.get_estadisticas_completas)
+    assert leidas == 1
+    assert (estadisticas['total_clientes'], estadisticas['clientes_activos']) == (3, 0)
+
+
+def test_instantanea_de_estadisticas(db):
+    primera, leidas = consultas(db, db.estadisticas)
+    assert leidas == 1
+    segunda, leidas = consultas(db, db.estadisticas)
+    assert (segunda, leidas) == (primera, 0)
+    # Una instantánea vieja se recalcula aunque no haya escrituras
+    _, leidas = consultas(db, lambda: db.estadisticas(max_edad=0))
+    assert leidas == 1
+
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+    tercera, leidas = consultas(db, db.estadisticas)
+    assert leidas == 1
+    assert tercera['clientes_activos'] == 1
+    assert tercera['ingresos_mes_actual'] == primera['ingresos_mes_actual'] + 50.0
+    db.registrar_acceso('1001', 'Entrada')
+    assert db.estadisticas()['accesos_hoy'] == primera['accesos_hoy'] + 1
+
+
+def test_cambios_por_tabla(db):
+    versiones, cambiadas = db.cambios()
+    assert cambiadas == {'clientes', 'pagos', 'accesos'}
+    assert db.cambios(versiones) == (versiones, set())
+
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+    versiones, cambiadas = db.cambios(versiones)
+    assert cambiadas == {'pagos'}
+    assert db.registrar_acceso('1001', 'Entrada')[0]
+    assert db.cambios(versiones)[1] == {'accesos'}
+
+
+def test_editar_cliente_cambia_clientes(db):
+    versiones, _ = db.cambios()
+    assert db.actualizar_cliente('1001', 'Ana', 'Pérez', '', '', '', '')
+    assert db.cambios(versiones)[1] == {'clientes'}
+
+    # Un UPDATE que falla no deja una transacción abierta en la conexión de escritura
+    db.conn.execute("CREATE TRIGGER rechazar BEFORE UPDATE ON clientes WHEN NEW.nombre = 'X' "
+                    "BEGIN SELECT RAISE(ABORT, 'rechazado'); END")
+    assert not db.actualizar_cliente('1001', 'X', 'Pérez', '', '', '', '')
+    assert not db.conn.in_transaction
+
+
+def test_cambios_de_otra_conexion(db):
+    versiones, _ = db.cambios()
+    assert db.estadisticas()['total_clientes'] == 3
+    otra = sqlite3.connect(db.ruta_db)
+    otra.execute("INSERT INTO clientes (cedula, nombre, apellido) VALUES ('1004', 'Otra', 'Caja')")
+    otra.commit()
+    otra.close()
+
+    # No se sabe qué tablas tocó: cambian todas y se descartan las cachés
+    assert db.cambios(versiones)[1] == {'clientes', 'pagos', 'accesos'}
+    assert db.estadisticas()['total_clientes'] == 4
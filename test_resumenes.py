@@ -0,0 +1,115 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'gimnasio.db'))
+    for cedula in ('1001', '1002'):
+        db.insert_cliente(cedula, 'Nombre', 'Apellido')
+    yield db
+    db.cerrar()
+
+
+def resumenes(db):
+    accesos = db.conn.execute(
+        "SELECT * FROM resumen_accesos_hora WHERE cantidad != 0 ORDER BY 1, 2, 3").fetchall()
+    ingresos = db.conn.execute(
+        "SELECT dia, metodo_pago, ROUND(total, 2), cantidad FROM resumen_ingresos_dia "
+        "WHERE cantidad != 0 ORDER BY 1, 2").fetchall()
+    return accesos, ingresos
+
+
+def agregar_accesos(db, filas):
+    db.conn.executemany(
+        "INSERT INTO accesos (cedula_cliente, tipo_movimiento, fecha_hora) VALUES (?, ?, ?)", filas)
+    db.conn.commit()
+
+
+def test_triggers_mantienen_resumenes(db):
+    agregar_accesos(db, [
+        ('1001', 'Entrada', '2026-03-02 08:15:00'),
+        ('1002', 'Entrada', '2026-03-02 08:45:00'),
+        ('1001', 'Salida', '2026-03-02 09:30:00'),
+        ('1002', 'Entrada', datetime(2026, 3, 3, 18, 5)),
+    ])
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+    db.insert_pago('1002', 30.0, 1, 'Efectivo')
+    db.insert_pago('1002', 20.0, 1, 'Tarjeta')
+    hoy = date.today().isoformat()
+
+    accesos, ingresos = resumenes(db)
+    assert accesos == [('2026-03-02', 8, 'Entrada', 2), ('2026-03-02', 9, 'Salida', 1),
+                       ('2026-03-03', 18, 'Entrada', 1)]
+    assert ingresos == [(hoy, 'Efectivo', 80.0, 2), (hoy, 'Tarjeta', 20.0, 1)]
+
+    # Los cambios y borrados restan lo que sumaron
+    db.conn.execute("UPDATE accesos SET fecha_hora = '2026-03-04 07:00:00' WHERE fecha_hora LIKE '2026-03-03%'")
+    db.conn.execute("UPDATE pagos SET metodo_pago = 'Transferencia' WHERE metodo_pago = 'Tarjeta'")
+    db.conn.commit()
+    db.eliminar_cliente('1001')
+
+    accesos, ingresos = resumenes(db)
+    assert accesos == [('2026-03-02', 8, 'Entrada', 1), ('2026-03-04', 7, 'Entrada', 1)]
+    assert ingresos == [(hoy, 'Efectivo', 30.0, 1), (hoy, 'Transferencia', 20.0, 1)]
+
+    antes = resumenes(db)
+    db.reconstruir_resumenes()
+    assert resumenes(db) == antes
+
+
+def test_escritor_de_accesos_actualiza_resumen(db):
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+    db.iniciar_escritor_accesos(max_eventos=2, intervalo=0.05)
+    for _ in range(3):
+        assert db.registrar_acceso('1001', 'Entrada')[0]
+    assert db.escritor_accesos.esperar_vaciado()
+
+    assert db.contar_entradas(date.today()) == 3
+    assert db.get_estadisticas_accesos()['accesos_hoy'] == 3
+
+
+def test_estadisticas_desde_resumenes(db):
+    hoy = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+    agregar_accesos(db, [
+        ('1001', 'Entrada', hoy),
+        ('1002', 'Entrada', hoy.replace(minute=30)),
+        ('1001', 'Entrada', hoy.replace(hour=18)),
+        ('1001', 'Salida', hoy.replace(hour=18, minute=5)),
+        ('1001', 'Salida', hoy.replace(hour=18, minute=6)),
+        ('1002', 'Entrada', hoy - timedelta(days=400)),
+    ])
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+
+    estadisticas = db.get_estadisticas_accesos()
+    assert estadisticas['accesos_hoy'] == 3
+    # Solo cuentan las entradas para la hora pico
+    assert estadisticas['hora_pico'] == '10'
+    assert db.get_estadisticas_completas()['ingresos_mes_actual'] == 50.0
+    assert db.get_ingresos_por_mes(date.today().year) == [(f"{date.today().month:02d}", 50.0, 1)]
+
+
+def test_migracion_carga_el_historial(tmp_path):
+    ruta = str(tmp_path / 'gimnasio.db')
+    db = Database(ruta)
+    db.insert_cliente('1001', 'Ana', 'Pérez')
+    db.insert_pago('1001', 50.0, 1, 'Efectivo')
+    agregar_accesos(db, [('1001', 'Entrada', '2026-01-05 07:10:00')] * 3)
+    esperado = resumenes(db)
+    # Base de antes de los resúmenes: sin sus tablas ni triggers
+    for (trigger,) in db.conn.execute("SELECT name FROM sqlite_master WHERE name LIKE 'resumen_%' "
+                                      "AND type = 'trigger'").fetchall():
+        db.conn.execute(f"DROP TRIGGER {trigger}")
+    for tabla in ('resumen_accesos_hora', 'resumen_ingresos_dia'):
+        db.conn.execute(f"DROP TABLE {tabla}")
+    db.conn.execute("PRAGMA user_version = 4")
+    db.conn.commit()
+    db.cerrar()
+
+    db = Database(ruta)
+    assert resumenes(db) == esperado
+    assert esperado[0] == [('2026-01-05', 7, 'Entrada', 3)]
+    db.cerrar()
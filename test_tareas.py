@@ -0,0 +1,127 @@
+import threading
+import time
+
+from tareas import EjecutorTareas
+
+
+class RaizFalsa:
+    """Sustituye a tk.Tk: guarda los after() y los corre al procesar()"""
+
+    def __init__(self):
+        self.programados = []
+        self.hilo = threading.current_thread()
+
+    def after(self, ms, funcion):
+        assert threading.current_thread() is self.hilo
+        self.programados.append(funcion)
+        return len(self.programados)
+
+    def after_cancel(self, id_after):
+        pass
+
+    def procesar(self, hasta, timeout=5):
+        limite = time.monotonic() + timeout
+        while not hasta() and time.monotonic() < limite:
+            programados, self.programados = self.programados, []
+            for funcion in programados:
+                funcion()
+            time.sleep(0.005)
+        return hasta()
+
+
+def test_entrega_resultado_en_el_hilo_principal():
+    raiz = RaizFalsa()
+    ejecutor = EjecutorTareas(raiz)
+    recibidos = []
+
+    ejecutor.ejecutar('suma', lambda a, b: (a + b, threading.current_thread()), 2, 3,
+                      al_terminar=lambda r: recibidos.append((r, threading.current_thread())))
+
+    assert raiz.procesar(lambda: recibidos)
+    (valor, hilo_trabajo), hilo_entrega = recibidos[0]
+    assert valor == 5
+    assert hilo_trabajo is not raiz.hilo and hilo_entrega is raiz.hilo
+    assert ejecutor.pendientes() == 0
+    ejecutor.cerrar()
+
+
+def test_solicitud_nueva_descarta_la_anterior():
+    raiz = RaizFalsa()
+    ejecutor = EjecutorTareas(raiz)
+    liberar = threading.Event()
+    recibidos = []
+
+    def lenta():
+        liberar.wait(5)
+        return 'vieja'
+
+    vieja = ejecutor.ejecutar('busqueda', lenta, al_terminar=recibidos.append)
+    ejecutor.ejecutar('busqueda', lambda: 'nueva', al_terminar=recibidos.append)
+    liberar.set()
+
+    assert raiz.procesar(lambda: recibidos)
+    vieja.futuro.result(5)
+    raiz.procesar(lambda: False, timeout=0.05)
+    assert vieja.cancelada and recibidos == ['nueva']
+    ejecutor.cerrar()
+
+
+def test_errores_y_cancelacion():
+    raiz = RaizFalsa()
+    ejecutor = EjecutorTareas(raiz)
+    errores, recibidos = [], []
+
+    ejecutor.ejecutar('falla', lambda: 1 / 0, al_fallar=errores.append)
+    assert raiz.procesar(lambda: errores)
+    assert isinstance(errores[0], ZeroDivisionError)
+
+    liberar = threading.Event()
+    ejecutor.ejecutar('cancelada', lambda: liberar.wait(5), al_terminar=recibidos.append)
+    ejecutor.cancelar_todas()
+    liberar.set()
+    raiz.procesar(lambda: False, timeout=0.05)
+    assert recibidos == []
+    ejecutor.cerrar()
+
+
+def test_cancelar_por_prefijo():
+    raiz = RaizFalsa()
+    ejecutor = EjecutorTareas(raiz)
+    recibidos = []
+    liberar = threading.Event()
+
+    for clave in ('main.vista', 'main.busqueda', 'reportes.dashboard'):
+        ejecutor.ejecutar(clave, lambda clave=clave: liberar.wait(5) and clave, al_terminar=recibidos.append)
+    ejecutor.cancelar_todas('main.')
+    liberar.set()
+    assert raiz.procesar(lambda: recibidos)
+    raiz.procesar(lambda: False, timeout=0.05)
+    assert recibidos == ['reportes.dashboard']
+    ejecutor.cerrar()
+
+
+def test_avisos_de_avance_y_cancelacion():
+    raiz = RaizFalsa()
+    ejecutor = EjecutorTareas(raiz)
+    avances, respuestas, recibidos = [], [], []
+    seguir = threading.Event()
+
+    def larga(al_avanzar):
+        respuestas.append(al_avanzar(1, 'primero'))
+        seguir.wait(5)
+        respuestas.append(al_avanzar(2, 'segundo'))
+        return 'fin'
+
+    ejecutor.ejecutar('carga', larga, al_terminar=recibidos.append,
+                      al_avanzar=lambda n, texto: avances.append((n, texto, threading.current_thread())))
+    assert raiz.procesar(lambda: avances)
+    assert avances == [(1, 'primero', raiz.hilo)]
+
+    ejecutor.cancelar('carga')
+    seguir.set()
+    raiz.procesar(lambda: len(respuestas) == 2)
+    raiz.procesar(lambda: False, timeout=0.05)
+    # La función se entera de la cancelación y no se entrega nada más
+    assert respuestas == [True, False]
+    assert len(avances) == 1 and recibidos == []
+    ejecutor.cerrar()